@@ -0,0 +1,170 @@
+"""
+Background Processing Jobs
+Runs the feedback pipeline on a worker thread and publishes its progress to a shared status file
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+
+# Job states; running and saving are the active ones
+STATUS_RUNNING = 'running'
+STATUS_SAVING = 'saving'
+STATUS_COMPLETE = 'complete'
+STATUS_CANCELLED = 'cancelled'
+STATUS_FAILED = 'failed'
+ACTIVE_STATUSES = (STATUS_RUNNING, STATUS_SAVING)
+
+
+class ProgressStore:
+    """Job state shared between the worker thread and every dashboard session
+
+    The state is a small JSON document replaced atomically, so readers in
+    other sessions or processes never see a partial write.
+    """
+
+    def __init__(self, path="output/job_status.json"):
+        self.path = path
+
+    def write(self, state: Dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    def read(self) -> Optional[Dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+class ProcessingJob:
+    """Loads, processes and saves feedback on a daemon thread
+
+    Progress (items done, tickets, throughput and ETA) is published to the
+    store at most every update_every seconds and on every status change.
+    A cancelled job saves what it has finished, so an incremental run can
+    pick up the rest.
+    """
+
+    def __init__(self, system, store: ProgressStore, limit=None, max_workers=None, incremental=None, update_every=1.0):
+        self.system = system
+        self.store = store
+        self.limit = limit
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self.update_every = update_every
+        self.id = uuid.uuid4().hex[:8]
+        self.state = {
+            'job_id': self.id,
+            'status': STATUS_RUNNING,
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'done': 0,
+            'total': 0,
+            'tickets': 0,
+            'failed': 0,
+            'current': None,
+            'items_per_minute': 0.0,
+            'eta_seconds': None,
+            'error': None
+        }
+        self._start_time = None
+        self._last_publish = 0.0
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"feedback-job-{self.id}", daemon=True)
+
+    def start(self):
+        self._start_time = time.time()
+        self._publish(force=True)
+        self._thread.start()
+        return self
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def cancel(self):
+        """Start no new items; those in progress finish and are saved"""
+        self._cancel.set()
+
+    def _publish(self, force=False):
+        now = time.time()
+        if force or now - self._last_publish >= self.update_every:
+            self._last_publish = now
+            self.store.write(self.state)
+
+    def _set_status(self, status: str, error: str = None):
+        self.state['status'] = status
+        if error:
+            self.state['error'] = error
+        if status not in ACTIVE_STATUSES:
+            self.state['finished_at'] = datetime.now().isoformat()
+            self.state['eta_seconds'] = 0 if status == STATUS_COMPLETE else None
+        self._publish(force=True)
+
+    def _on_progress(self, done, total, feedback, ticket):
+        """process_all_feedback progress callback"""
+        elapsed = max(time.time() - self._start_time, 1e-6)
+        rate = done / elapsed
+        self.state.update({
+            'done': done,
+            'total': total,
+            'current': feedback['source_id'],
+            'items_per_minute': round(rate * 60, 2),
+            'eta_seconds': round((total - done) / rate, 1) if rate else None
+        })
+        self.state['tickets' if ticket else 'failed'] += 1
+        self._publish(force=done == total)
+
+    def _run(self):
+        try:
+            if not self.system.load_data(self.limit):
+                raise RuntimeError("Failed to load feedback data")
+            self.state['total'] = self.system.total_feedback
+            self._publish(force=True)
+
+            # Cancelling stops new items from starting; in-flight items are
+            # still journaled, ticketed and saved before the run returns
+            self.system.process_all_feedback(
+                limit=self.limit,
+                max_workers=self.max_workers,
+                progress_callback=self._on_progress,
+                incremental=self.incremental,
+                should_stop=self._cancel.is_set
+            )
+            stopped = self._cancel.is_set() and self.state['done'] < self.state['total']
+            final_status = STATUS_CANCELLED if stopped else STATUS_COMPLETE
+
+            self._set_status(STATUS_SAVING)
+            self.system.save_results(merge=self.incremental)
+            self._set_status(final_status)
+        except Exception as e:
+            self._set_status(STATUS_FAILED, error=str(e))
+
+
+_jobs_lock = threading.Lock()
+_current_job = None
+
+
+def start_job(system, store: ProgressStore, **options) -> ProcessingJob:
+    """Start a background processing job; only one runs at a time per process"""
+    global _current_job
+    with _jobs_lock:
+        if _current_job is not None and _current_job.is_running:
+            raise RuntimeError(f"Job {_current_job.id} is still running")
+        _current_job = ProcessingJob(system, store, **options).start()
+        return _current_job
+
+
+def current_job() -> Optional[ProcessingJob]:
+    """The most recently started job in this process (kept across Streamlit reruns)"""
+    return _current_job
@@ -0,0 +1,89 @@
+"""
+Concurrent Processing Benchmark
+Wall time of the full agent pipeline with 1 vs N workers, against the local fake OpenAI server
+
+Workers overlap the LLM round trips, but CrewAI/LangChain orchestration
+(prompt building, serializing the agent chain for callbacks, parsing) is
+CPU work that holds the GIL. The share of each item's sequential wall time
+spent on that CPU, times the worker count, is how busy the GIL gets; the
+closer that is to 100%, the longer workers queue for it and the further
+the speedup falls below the worker count. With realistic LLM latencies
+the share is a few percent and the speedup approaches the worker count.
+
+Usage:
+    python benchmark_concurrency.py [items] [workers] [latency_seconds]
+"""
+
+import os
+import sys
+import time
+from itertools import cycle, islice
+
+# Quiet, uncached runs so every item makes its LLM calls
+os.environ.setdefault("FEEDBACK_VERBOSE", "0")
+os.environ["FEEDBACK_CACHE_ENABLED"] = "0"
+os.environ["OPENAI_API_KEY"] = "benchmark-stub"
+
+from fake_openai_server import start_subprocess, stats
+from feedback_analysis_system import FeedbackAnalysisSystem
+
+
+def benchmark_items(system, count):
+    """count feedback items cycled from the input files, each with a unique source_id"""
+    items = list(system.iter_feedback())
+    return [
+        dict(feedback, source_id=f"{feedback['source_id']}-{idx}")
+        for idx, feedback in enumerate(islice(cycle(items), count))
+    ]
+
+
+def time_run(system, items, workers, base_url):
+    """(seconds, CPU seconds, tickets, LLM requests) for one pass over items"""
+    requests_before = stats(base_url)['requests']
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    tickets = sum(1 for _, ticket in system.iter_processed(items, max_workers=workers) if ticket)
+    cpu = time.process_time() - cpu_start
+    elapsed = time.perf_counter() - start
+    return elapsed, cpu, tickets, stats(base_url)['requests'] - requests_before
+
+
+def main():
+    """Main entry point"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    server, base_url = start_subprocess('--latency', latency)
+    os.environ["OPENAI_API_BASE"] = os.environ["OPENAI_BASE_URL"] = base_url
+    try:
+        system = FeedbackAnalysisSystem()
+        system.load_data()
+        items = benchmark_items(system, count)
+
+        # Warm up imports and the main thread's pipeline outside the timings
+        list(system.iter_processed(items[:1], max_workers=1))
+
+        results = {
+            label: time_run(system, items, worker_count, base_url)
+            for label, worker_count in (("Sequential (1 worker)", 1), (f"Concurrent ({workers} workers)", workers))
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("="*60)
+    print(f"CONCURRENCY BENCHMARK ({count} items, {latency * 1000:.0f} ms per LLM call)")
+    print("="*60)
+    for label, (elapsed, cpu, tickets, requests) in results.items():
+        print(f"{label:<26} {elapsed:7.2f} s   {count / elapsed:6.2f} items/s   "
+              f"{cpu / count * 1000:5.0f} ms CPU/item   {tickets} tickets, {requests} LLM calls")
+    (sequential, cpu, _, _), (concurrent, _, _, _) = results.values()
+    cpu_share = cpu / sequential
+    print(f"Speedup: {sequential / concurrent:.2f}x (ideal {workers}x); orchestration CPU is "
+          f"{cpu_share:.0%} of each item, so {workers} workers keep the GIL {min(1, cpu_share * workers):.0%} busy")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+HTTP Connection Reuse Benchmark
+Per-call latency of a fresh client per call vs the shared pooled client, against a local TLS stub
+"""
+
+import datetime
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from http_client import build_http_client
+
+
+def write_self_signed_cert(directory):
+    """Create a localhost certificate and key; return their paths"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    return cert_path, key_path
+
+
+def free_port():
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_calls(url, calls, make_client, reuse):
+    """Per-call latencies in ms, with one shared client or a new client per call"""
+    payload = {"model": "benchmark", "messages": [{"role": "user", "content": "Say hello"}]}
+    latencies = []
+    client = make_client() if reuse else None
+    for _ in range(calls):
+        if not reuse:
+            client = make_client()
+        start = time.perf_counter()
+        client.post(url, json=payload).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not reuse:
+            client.close()
+    if reuse:
+        client.close()
+    return latencies
+
+
+def main():
+    """Main entry point"""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = write_self_signed_cert(directory)
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "fake_openai_server.py", "--port", str(port), "--latency", "0",
+             "--certfile", cert_path, "--keyfile", key_path],
+            stdout=subprocess.DEVNULL
+        )
+        url = f"https://localhost:{port}/v1/chat/completions"
+        try:
+            for _ in range(50):
+                try:
+                    httpx.get(f"https://localhost:{port}/stats", verify=cert_path)
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+
+            fresh = time_calls(url, calls, lambda: httpx.Client(verify=cert_path), reuse=False)
+            pooled = time_calls(url, calls, lambda: build_http_client(verify=cert_path), reuse=True)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print("="*60)
+    print(f"HTTP CONNECTION REUSE BENCHMARK ({calls} calls, local TLS stub)")
+    print("="*60)
+    for label, latencies in (("New client per call", fresh), ("Shared pooled client", pooled)):
+        print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms   "
+              f"p50 {statistics.median(latencies):7.2f} ms")
+    saved = statistics.mean(fresh) - statistics.mean(pooled)
+    print(f"Saved per call: {saved:.2f} ms ({saved / statistics.mean(fresh) * 100:.0f}%)")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Pipeline Orchestration Microbenchmark
+Per-item time of prebuilt, templated pipelines vs building tasks and crews for every item
+
+The LLM is the local fake OpenAI server with no added latency, so agent,
+task and crew orchestration (prompt rendering, executor setup, output
+parsing) is measured along with a loopback HTTP round trip per call.
+
+Usage:
+    python benchmark_pipeline.py [items]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+# Quiet, uncached runs so only orchestration is measured
+os.environ.setdefault("FEEDBACK_VERBOSE", "0")
+os.environ["FEEDBACK_CACHE_ENABLED"] = "0"
+os.environ["OPENAI_API_KEY"] = "benchmark-stub"
+
+from fake_openai_server import start_subprocess, stats
+from feedback_analysis_system import FeedbackAnalysisSystem
+
+
+class PerItemPipeline:
+    """Pipeline whose stages are built from scratch on every lookup
+
+    Reproduces the construction cost of the original per-item code: agents
+    are created once, but each item builds fresh tasks and crews for the
+    stages it runs.
+    """
+
+    def __init__(self, system, agents):
+        self.system = system
+        self.agents = agents
+
+    def __getitem__(self, key):
+        return self.system._build_stage(key, self.agents)
+
+
+def time_items(system, items, iterations):
+    """Per-item wall times in ms over iterations items"""
+    latencies = []
+    for idx in range(iterations):
+        start = time.perf_counter()
+        system.process_feedback_item(items[idx % len(items)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    """Main entry point"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    server, base_url = start_subprocess('--latency', 0)
+    os.environ["OPENAI_API_BASE"] = os.environ["OPENAI_BASE_URL"] = base_url
+    try:
+        system = FeedbackAnalysisSystem()
+        system.load_data()
+        items = list(system.iter_feedback())
+
+        # First item builds the prebuilt pipeline; time it separately
+        start = time.perf_counter()
+        system.process_feedback_item(items[0])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        requests_before = stats(base_url)['requests']
+        prebuilt = time_items(system, items, iterations)
+        calls_per_item = (stats(base_url)['requests'] - requests_before) / iterations
+
+        agents = {}
+        def per_item_pipeline(tier=None):
+            if tier not in agents:
+                agents[tier] = system._create_agents(system._tier_models(tier))
+            return PerItemPipeline(system, agents[tier])
+        system._get_pipeline = per_item_pipeline
+        per_item = time_items(system, items, iterations)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("="*60)
+    print(f"PIPELINE ORCHESTRATION BENCHMARK ({iterations} items, fake LLM server, "
+          f"{calls_per_item:.1f} calls/item)")
+    print("="*60)
+    print(f"Pipeline build (first item): {build_ms:.2f} ms")
+    for label, latencies in (("Prebuilt pipelines", prebuilt), ("Crews built per item", per_item)):
+        print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms   "
+              f"p50 {statistics.median(latencies):7.2f} ms")
+    saved = statistics.mean(per_item) - statistics.mean(prebuilt)
+    print(f"Saved per item: {saved:.2f} ms ({saved / statistics.mean(per_item) * 100:.0f}%)")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Crash-Safe Checkpoint Journal
+Append-only JSONL record of completed tickets and log entries, fsync'd in batches
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Tuple
+
+
+class CheckpointJournal:
+    """Append-only journal that lets an interrupted run resume where it stopped
+
+    Each line is one JSON record: {"type": "ticket" | "log", "data": {...}}.
+    Ticket records also carry the content hashes of the items they cover so
+    the incremental manifest can be rebuilt on resume. Records are flushed on
+    every write and fsync'd every fsync_every records (and on close), so at
+    most one batch is lost if the machine itself goes down.
+    """
+
+    def __init__(self, path="output/checkpoint.jsonl", fsync_every=20):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self._unsynced = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def exists(self) -> bool:
+        """True if a journal from an earlier run is on disk"""
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while the journal is accepting records"""
+        return self._file is not None
+
+    def open(self, resume=False):
+        """Open for appending; without resume any previous journal is discarded
+
+        On resume a torn final line (left by a crash mid-write) is cut off
+        first, so the next record starts on a line of its own instead of
+        being glued onto the unreadable fragment.
+        """
+        with self._lock:
+            if self._file is None:
+                if resume:
+                    self._truncate_torn_line()
+                self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _truncate_torn_line(self, chunk_size=4096):
+        """Cut the file back to just after its last newline"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - chunk_size)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                f.truncate(position)
+
+    def append(self, record_type: str, data: Dict, hashes: Dict = None):
+        """Write one record; no-op if the journal is not open"""
+        record = {'type': record_type, 'data': data}
+        if hashes:
+            record['hashes'] = hashes
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync()
+
+    def _sync(self):
+        """fsync pending records (caller holds the lock)"""
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def iter_records(self):
+        """Yield records from disk in write order, ignoring a torn final line"""
+        if not os.path.exists(self.path):
+            return
+
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def load(self, include_tickets=True) -> Tuple[List[Dict], List[Dict], Dict]:
+        """Read (tickets, logs, hashes) back from disk
+
+        A later ticket for the same source_id replaces an earlier one. Pass
+        include_tickets=False when tickets were already streamed elsewhere.
+        """
+        tickets = {}
+        logs = []
+        hashes = {}
+        for record in self.iter_records():
+            if record.get('type') == 'ticket':
+                if include_tickets:
+                    tickets[record['data']['source_id']] = record['data']
+                hashes.update(record.get('hashes', {}))
+            elif record.get('type') == 'log':
+                logs.append(record['data'])
+
+        return list(tickets.values()), logs, hashes
+
+    def close(self):
+        """fsync and close the journal file"""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Close and delete the journal once its results are safely saved"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def check_torn_line_recovery() -> bool:
+    """True if a record appended after a crash mid-write survives the next resume"""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = CheckpointJournal(os.path.join(directory, "checkpoint.jsonl"))
+        journal.open()
+        journal.append('log', {'action': 'before_crash'})
+        journal.close()
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "log", "data": {"act')
+
+        journal.open(resume=True)
+        journal.append('log', {'action': 'after_resume'})
+        journal.close()
+        _, logs, _ = journal.load()
+    return [log['action'] for log in logs] == ['before_crash', 'after_resume']
+
+
+if __name__ == "__main__":
+    print(f"{'✅' if check_torn_line_recovery() else '❌'} Record written after a torn line survives resume")
@@ -0,0 +1,252 @@
+"""
+Columnar Storage Helpers
+Optional Parquet and Arrow IPC (Feather) reading and writing alongside CSV
+"""
+
+import io
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Output format -> file extension
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather'
+}
+
+
+def detect_format(path: str) -> str:
+    """File format from the path's extension (anything unknown is read as CSV)"""
+    extension = os.path.splitext(path)[1].lower()
+    for fmt, fmt_extension in FORMAT_EXTENSIONS.items():
+        if extension == fmt_extension:
+            return fmt
+    return 'csv'
+
+
+def with_format(path: str, fmt: str) -> str:
+    """Swap path's extension for the one used by fmt"""
+    return os.path.splitext(path)[0] + FORMAT_EXTENSIONS[fmt]
+
+
+def require_pyarrow(fmt: str):
+    """Raise a helpful ImportError when a columnar format is used without pyarrow"""
+    if fmt != 'csv' and not HAS_PYARROW:
+        raise ImportError(f"{fmt} storage requires pyarrow: pip install pyarrow")
+
+
+def arrow_schema(columns: List[str], dtypes: Optional[Dict[str, str]] = None):
+    """Arrow schema for columns; dtypes maps a column to 'int', 'float' or 'bool' (default string)"""
+    arrow_types = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'str': pa.string()}
+    dtypes = dtypes or {}
+    return pa.schema([(column, arrow_types[dtypes.get(column, 'str')]) for column in columns])
+
+
+def _existing_columns(path: str, columns: Optional[List[str]]) -> Optional[List[str]]:
+    """Restrict a column projection to the columns present in an Arrow file"""
+    if columns is None:
+        return None
+    if detect_format(path) == 'parquet':
+        names = pq.read_schema(path).names
+    else:
+        names = pa.ipc.open_file(pa.memory_map(path)).schema.names
+    return [column for column in columns if column in names]
+
+
+def read_table(path: str, columns: Optional[List[str]] = None, filters=None, dtype=None) -> pd.DataFrame:
+    """Read a CSV, Parquet or Feather file into a DataFrame
+
+    columns projects the read to just those columns (missing ones are
+    ignored), which skips the large text columns entirely for Parquet and
+    Feather. filters is a list of (column, op, value) tuples; Parquet uses
+    it to prune row groups, other formats apply it after reading. dtype is
+    passed to read_csv only.
+    """
+    fmt = detect_format(path)
+    require_pyarrow(fmt)
+
+    if fmt == 'parquet':
+        table = pq.read_table(path, columns=_existing_columns(path, columns), filters=filters)
+        return table.to_pandas()
+
+    if fmt == 'feather':
+        df = feather.read_table(path, columns=_existing_columns(path, columns), memory_map=True).to_pandas()
+    else:
+        usecols = (lambda column: column in columns) if columns is not None else None
+        df = pd.read_csv(path, usecols=usecols, dtype=dtype)
+
+    for column, op, value in filters or []:
+        if op in ('=', '=='):
+            df = df[df[column] == value]
+        elif op == 'in':
+            df = df[df[column].isin(value)]
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return df
+
+
+def iter_table_chunks(path: str, chunksize: int, columns: Optional[List[str]] = None, dtype=None):
+    """Yield DataFrames of at most chunksize rows without loading the whole file"""
+    fmt = detect_format(path)
+    require_pyarrow(fmt)
+
+    if fmt == 'parquet':
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=_existing_columns(path, columns)):
+            yield batch.to_pandas()
+    elif fmt == 'feather':
+        table = feather.read_table(path, columns=_existing_columns(path, columns), memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+    else:
+        usecols = (lambda column: column in columns) if columns is not None else None
+        yield from pd.read_csv(path, usecols=usecols, dtype=dtype, keep_default_na=dtype is None, chunksize=chunksize)
+
+
+def count_rows(path: str, chunksize=1000, limit: Optional[int] = None) -> int:
+    """Row count, capped at limit; read from file metadata for Parquet and Feather
+
+    With a limit a CSV is only read until limit rows have been seen.
+    """
+    fmt = detect_format(path)
+    require_pyarrow(fmt)
+
+    if fmt == 'parquet':
+        rows = pq.ParquetFile(path).metadata.num_rows
+    elif fmt == 'feather':
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        rows = sum(reader.get_batch(idx).num_rows for idx in range(reader.num_record_batches))
+    else:
+        rows = 0
+        for chunk in pd.read_csv(path, usecols=[0], chunksize=chunksize):
+            rows += len(chunk)
+            if limit is not None and rows >= limit:
+                break
+    return rows if limit is None else min(rows, limit)
+
+
+def csv_row_offsets(path: str) -> List[int]:
+    """Byte offset of every CSV record, plus the end of the last one
+
+    Records may span lines inside quoted fields; a record ends on the first
+    line break after which its quote count is even. Blank lines between
+    records are skipped, as read_csv does.
+    """
+    offsets = []
+    with open(path, 'rb') as f:
+        offset = len(f.readline())
+        start = offset
+        in_quotes = False
+        for line in f:
+            if not in_quotes:
+                start = offset
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            offset += len(line)
+            if not in_quotes and (offset - start > len(line) or line.strip()):
+                offsets.append(start)
+    offsets.append(offset)
+    return offsets
+
+
+def csv_row_bytes(path: str, offsets: List[int], positions) -> bytes:
+    """The CSV header followed by the raw records at positions (see csv_row_offsets)"""
+    with open(path, 'rb') as f:
+        parts = [f.read(offsets[0])]
+        for position in positions:
+            f.seek(offsets[position])
+            parts.append(f.read(offsets[position + 1] - offsets[position]))
+    return b''.join(parts)
+
+
+def read_rows(path: str, positions, csv_offsets: Optional[List[int]] = None) -> pd.DataFrame:
+    """Rows at the given ascending positions, without scanning the rest of the file
+
+    CSV needs the file's csv_row_offsets; Parquet reads only the row groups
+    holding the rows and Feather takes them from a memory map.
+    """
+    fmt = detect_format(path)
+    require_pyarrow(fmt)
+    positions = np.asarray(positions, dtype=np.int64)
+
+    if fmt == 'parquet':
+        parquet_file = pq.ParquetFile(path)
+        tables = []
+        group_start = 0
+        for group in range(parquet_file.num_row_groups):
+            group_end = group_start + parquet_file.metadata.row_group(group).num_rows
+            first, last = np.searchsorted(positions, [group_start, group_end])
+            if last > first:
+                tables.append(parquet_file.read_row_group(group).take(positions[first:last] - group_start))
+            group_start = group_end
+        if not tables:
+            return parquet_file.schema_arrow.empty_table().to_pandas()
+        return pa.concat_tables(tables).to_pandas()
+    if fmt == 'feather':
+        return feather.read_table(path, memory_map=True).take(positions).to_pandas()
+    return pd.read_csv(io.BytesIO(csv_row_bytes(path, csv_offsets, positions)))
+
+
+def _stringify_mixed(df: pd.DataFrame) -> pd.DataFrame:
+    """Arrow needs one type per column; render non-string values in object columns as text"""
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].map(lambda value: value if value is None or isinstance(value, str) or pd.isna(value) else str(value))
+    return df
+
+
+def _append_csv(df: pd.DataFrame, path: str) -> bool:
+    """Append df's rows under an existing CSV header; False if the header lacks some of df's columns"""
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return False
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    if not set(df.columns) <= set(columns):
+        return False
+
+    with open(path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        ends_with_newline = f.read(1) == b'\n'
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        if not ends_with_newline:
+            f.write('\n')
+        df.reindex(columns=columns).to_csv(f, header=False, index=False)
+    return True
+
+
+def write_table(df: pd.DataFrame, path: str, append=False):
+    """Write df to path in the format given by its extension
+
+    With append the existing file's rows are kept ahead of df. A CSV whose
+    header already has all of df's columns is appended to in place, without
+    reading its rows; otherwise (new columns, or Parquet/Feather, which
+    cannot be appended to) the existing rows are re-read, as strings for CSV
+    so numbers are not coerced to floats, and the whole file is rewritten.
+    """
+    fmt = detect_format(path)
+    require_pyarrow(fmt)
+
+    if append and fmt == 'csv' and _append_csv(df, path):
+        return
+
+    if append and os.path.exists(path):
+        existing_df = read_table(path, dtype=str)
+        df = pd.concat([existing_df, df], ignore_index=True)
+
+    if fmt == 'parquet':
+        _stringify_mixed(df).to_parquet(path, index=False)
+    elif fmt == 'feather':
+        _stringify_mixed(df).reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
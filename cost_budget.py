@@ -0,0 +1,163 @@
+"""
+Token and Cost Budget
+Per-run and per-item token/cost accounting with budget checks and tokenizer-based estimates
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, Tuple
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+
+# USD per 1K tokens (prompt, completion); longest matching prefix wins
+MODEL_PRICES = {
+    'gpt-4-turbo': (0.01, 0.03),
+    'gpt-4-0125-preview': (0.01, 0.03),
+    'gpt-4-1106-preview': (0.01, 0.03),
+    'gpt-4-32k': (0.06, 0.12),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4o': (0.0025, 0.01),
+    'gpt-4': (0.03, 0.06),
+    'gpt-3.5-turbo': (0.0005, 0.0015)
+}
+# Unknown models are priced like gpt-4-turbo so budgets err on the safe side
+DEFAULT_PRICE = (0.01, 0.03)
+
+# Tokens CrewAI adds around each task prompt (agent persona, ReAct format instructions)
+CREW_PROMPT_OVERHEAD = 250
+
+BUDGET_OK = 'ok'
+BUDGET_DEGRADED = 'degraded'
+BUDGET_EXHAUSTED = 'exhausted'
+
+
+@lru_cache(maxsize=None)
+def _encoder(model: str):
+    """tiktoken encoder for model, or None when tiktoken or its encoding files are unavailable"""
+    if not HAS_TIKTOKEN:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        # Encoding files are downloaded on first use; offline hosts fall back to the estimate
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Token count of text with the model's tokenizer (~4 characters per token without tiktoken)"""
+    text = str(text or '')
+    encoder = _encoder(model)
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+class CostBudget:
+    """Tracks token use and cost across a run and per item (per worker thread)
+
+    A limit of 0 means unlimited. Once run spend reaches degrade_at of a run
+    limit the state is 'degraded' (callers should cut optional work); at the
+    limit it is 'exhausted' (callers should stop starting new items).
+    """
+
+    def __init__(self, model: str, run_usd=0.0, item_usd=0.0, run_tokens=0, item_tokens=0,
+                 degrade_at=0.8, price_override: Tuple[float, float] = None):
+        self.model = model
+        self.run_usd = run_usd
+        self.item_usd = item_usd
+        self.run_tokens = run_tokens
+        self.item_tokens = item_tokens
+        self.degrade_at = degrade_at
+        self.price_override = price_override
+        self.stats = {'prompt_tokens': 0, 'completion_tokens': 0, 'cost_usd': 0.0, 'degraded_items': 0, 'skipped_items': 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return any((self.run_usd, self.item_usd, self.run_tokens, self.item_tokens))
+
+    def price(self, model: str = None) -> Tuple[float, float]:
+        """(prompt, completion) USD per 1K tokens for model"""
+        model = model or self.model
+        if self.price_override and model == self.model:
+            return self.price_override
+        matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+        return MODEL_PRICES[max(matches, key=len)] if matches else DEFAULT_PRICE
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, model: str = None) -> float:
+        prompt_price, completion_price = self.price(model)
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+    def begin_item(self):
+        """Reset the calling thread's per-item spend"""
+        self._local.tokens = 0
+        self._local.cost = 0.0
+
+    def record(self, prompt_tokens: int, completion_tokens: int, model: str = None):
+        """Account one LLM call (token-usage listener)"""
+        cost = self.cost(prompt_tokens, completion_tokens, model)
+        self._local.tokens = getattr(self._local, 'tokens', 0) + prompt_tokens + completion_tokens
+        self._local.cost = getattr(self._local, 'cost', 0.0) + cost
+        with self._lock:
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+            self.stats['cost_usd'] += cost
+
+    def count(self, event: str):
+        """Increment the degraded_items or skipped_items counter"""
+        with self._lock:
+            self.stats[event] += 1
+
+    def item_stats(self) -> Dict:
+        """Tokens and cost spent so far on this thread's current item"""
+        return {
+            'tokens': getattr(self._local, 'tokens', 0),
+            'cost_usd': round(getattr(self._local, 'cost', 0.0), 6)
+        }
+
+    def run_state(self) -> str:
+        """ok, degraded or exhausted against the run limits"""
+        with self._lock:
+            fractions = []
+            if self.run_usd:
+                fractions.append(self.stats['cost_usd'] / self.run_usd)
+            if self.run_tokens:
+                fractions.append((self.stats['prompt_tokens'] + self.stats['completion_tokens']) / self.run_tokens)
+        spent = max(fractions, default=0)
+        if spent >= 1:
+            return BUDGET_EXHAUSTED
+        if spent >= self.degrade_at:
+            return BUDGET_DEGRADED
+        return BUDGET_OK
+
+    def item_fits(self, prompt_tokens: int, completion_tokens: int, model: str = None) -> bool:
+        """True if the current item stays within its limits after a call of this size"""
+        if self.item_tokens and getattr(self._local, 'tokens', 0) + prompt_tokens + completion_tokens > self.item_tokens:
+            return False
+        if self.item_usd and getattr(self._local, 'cost', 0.0) + self.cost(prompt_tokens, completion_tokens, model) > self.item_usd:
+            return False
+        return True
+
+    def summary(self) -> str:
+        stats = self.stats
+        limits = ", ".join(
+            f"{name} {value}" for name, value in (
+                ('run $', self.run_usd), ('item $', self.item_usd),
+                ('run tokens', self.run_tokens), ('item tokens', self.item_tokens)
+            ) if value
+        ) or "no limits"
+        return (
+            f"{stats['prompt_tokens']}+{stats['completion_tokens']} tokens, ${stats['cost_usd']:.4f} "
+            f"({limits}); {stats['degraded_items']} items degraded, {stats['skipped_items']} skipped"
+        )
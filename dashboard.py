@@ -7,7 +7,82 @@ import pandas as pd
 import os
 from datetime import datetime
 import json
+from background_jobs import (
+    ACTIVE_STATUSES, STATUS_CANCELLED, STATUS_FAILED, STATUS_RUNNING, STATUS_SAVING,
+    ProgressStore, current_job, start_job
+)
+from columnar_io import with_format
+from dashboard_data import CsvLogTail, TableCache, TicketIndex
+from ticket_store import TicketStore
 from feedback_analysis_system import FeedbackAnalysisSystem
+from local_classifier import LocalClassifier, DEFAULT_CRITICAL_KEYWORDS, DEFAULT_HIGH_KEYWORDS
+
+# Output files follow FEEDBACK_OUTPUT_FORMAT (csv, parquet or feather)
+OUTPUT_FORMAT = os.getenv("FEEDBACK_OUTPUT_FORMAT", "csv").lower()
+TICKETS_PATH = with_format("output/generated_tickets.csv", OUTPUT_FORMAT)
+METRICS_PATH = with_format("output/metrics.csv", OUTPUT_FORMAT)
+LOGS_PATH = with_format("output/processing_log.csv", OUTPUT_FORMAT)
+
+# Ticket store shared with FeedbackAnalysisSystem; when it exists the dashboard reads from it
+DB_ENABLED = os.getenv("FEEDBACK_DB_ENABLED", "1") != "0"
+DB_PATH = os.getenv("FEEDBACK_DB_PATH", "output/feedback.sqlite")
+
+# Background processing status, shared by every session
+JOB_STORE = ProgressStore(os.getenv("FEEDBACK_JOB_STATUS_PATH", "output/job_status.json"))
+JOB_POLL_SECONDS = 2
+live_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+# Ticket list columns; the large text columns are only read for the selected ticket
+TICKET_LIST_COLUMNS = [
+    'source_id', 'source_type', 'created_at', 'category', 'priority',
+    'quality_score', 'approval_status', 'report_count'
+]
+TICKET_PAGE_SIZES = [25, 50, 100, 250]
+LOG_DISPLAY_LIMIT = 1000
+
+
+@st.cache_resource
+def data_cache() -> TableCache:
+    """Tables shared by every session, reloaded only when their file changes"""
+    return TableCache()
+
+
+def ticket_index() -> TicketIndex:
+    """Index over the tickets file, rebuilt when the file changes"""
+    return data_cache().get(
+        TICKETS_PATH, ('ticket_index', tuple(TICKET_LIST_COLUMNS)),
+        lambda path: TicketIndex(path, TICKET_LIST_COLUMNS)
+    )
+
+
+@st.cache_resource
+def ticket_store() -> TicketStore:
+    """Connection to the ticket store shared by every session"""
+    return TicketStore(DB_PATH)
+
+
+def store_available() -> bool:
+    return DB_ENABLED and os.path.exists(DB_PATH)
+
+
+def ticket_browser():
+    """Ticket store if there is one, else the index over the tickets file (None without tickets)"""
+    if store_available():
+        return ticket_store()
+    if os.path.exists(TICKETS_PATH):
+        return ticket_index()
+    return None
+
+
+def choice_index(value, choices) -> int:
+    """selectbox index of value in [''] + choices"""
+    return choices.index(value) + 1 if value in choices else 0
+
+
+@st.cache_resource
+def log_tail(path: str) -> CsvLogTail:
+    """Processing log reader that only parses rows appended since the last rerun"""
+    return CsvLogTail(path)
 
 # Page configuration
 st.set_page_config(
@@ -90,28 +165,56 @@ process_limit = st.sidebar.number_input(
     help="Limit the number of feedback items to process (0 for all)"
 )
 
+max_workers = st.sidebar.number_input(
+    "Max parallel workers",
+    min_value=1,
+    max_value=32,
+    value=int(os.getenv("FEEDBACK_MAX_WORKERS", "1")),
+    help="Number of feedback items processed concurrently"
+)
+
+incremental_mode = st.sidebar.checkbox(
+    "Incremental processing",
+    value=os.getenv("FEEDBACK_INCREMENTAL", "0") == "1",
+    help="Skip feedback that was already ticketed and is unchanged; merge new tickets into existing outputs"
+)
+
 classification_confidence = st.sidebar.slider(
     "Classification Confidence Threshold",
     min_value=0,
     max_value=100,
-    value=70,
-    help="Minimum confidence score for classifications"
+    value=int(os.getenv("FEEDBACK_ESCALATION_CONFIDENCE", "70")),
+    help="Items classified below this confidence are analyzed with the stronger model (when FEEDBACK_FAST_MODEL or per-agent models are set)"
 )
 
 # Priority settings
 st.sidebar.subheader("Priority Rules")
 critical_keywords = st.sidebar.text_area(
     "Critical Keywords",
-    value="crash, data loss, can't login, critical, urgent",
+    value=DEFAULT_CRITICAL_KEYWORDS,
     help="Comma-separated keywords that trigger Critical priority"
 )
 
 high_keywords = st.sidebar.text_area(
     "High Keywords",
-    value="bug, error, broken, not working, fails",
+    value=DEFAULT_HIGH_KEYWORDS,
     help="Comma-separated keywords that trigger High priority"
 )
 
+use_prefilter = st.sidebar.checkbox(
+    "Local pre-classifier",
+    value=os.getenv("FEEDBACK_PREFILTER", "0") == "1",
+    help="Handle obvious spam, praise and crash reports with keyword rules before calling the LLM"
+)
+
+prefilter_threshold = st.sidebar.slider(
+    "Pre-classifier Confidence Threshold",
+    min_value=0,
+    max_value=100,
+    value=int(os.getenv("FEEDBACK_PREFILTER_THRESHOLD", "90")),
+    help="Items below this local confidence go to the LLM classifier"
+)
+
 # Main content area
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📊 Dashboard",
@@ -129,8 +232,8 @@ with tab1:
     
     # Load data to show stats
     try:
-        reviews_df = pd.read_csv("data/app_store_reviews.csv")
-        emails_df = pd.read_csv("data/support_emails.csv")
+        reviews_df = data_cache().load_table("data/app_store_reviews.csv")
+        emails_df = data_cache().load_table("data/support_emails.csv")
         
         with col1:
             st.metric("📱 App Reviews", len(reviews_df))
@@ -140,11 +243,8 @@ with tab1:
             total_feedback = len(reviews_df) + len(emails_df)
             st.metric("📝 Total Feedback", total_feedback)
         with col4:
-            if os.path.exists("output/generated_tickets.csv"):
-                tickets_df = pd.read_csv("output/generated_tickets.csv")
-                st.metric("🎫 Tickets Generated", len(tickets_df))
-            else:
-                st.metric("🎫 Tickets Generated", 0)
+            browser = ticket_browser()
+            st.metric("🎫 Tickets Generated", len(browser) if browser is not None else 0)
         
         st.divider()
         
@@ -175,119 +275,190 @@ with tab2:
     6. 💾 Save results to CSV files
     """)
     
-    if st.button("▶️ Start Processing", type="primary", use_container_width=True):
+    job = current_job()
+    job_running = job is not None and job.is_running
+    
+    if st.button("▶️ Start Processing", type="primary", use_container_width=True, disabled=job_running):
         if not api_key:
             st.error("❌ Cannot process: OpenAI API key not configured")
         else:
             with st.spinner("🔄 Initializing multi-agent system..."):
                 try:
                     st.session_state.system = FeedbackAnalysisSystem()
+                    # The sidebar keywords drive both the pre-filter and the
+                    # rules that pick each item's rate-limiter lane
+                    keyword_rules = LocalClassifier(critical_keywords, high_keywords, prefilter_threshold)
+                    st.session_state.system.priority_rules = keyword_rules
+                    st.session_state.system.prefilter = keyword_rules if use_prefilter else None
+                    st.session_state.system.escalation_confidence = classification_confidence
                     st.success("✅ System initialized")
                 except Exception as e:
                     st.error(f"❌ Initialization error: {e}")
                     st.stop()
             
-            # Load data
-            with st.spinner("📂 Loading feedback data..."):
-                if st.session_state.system.load_data():
-                    total_items = len(st.session_state.system.all_feedback)
-                    items_to_process = process_limit if process_limit > 0 else total_items
-                    st.success(f"✅ Loaded {total_items} feedback items")
-                    st.info(f"📊 Will process {items_to_process} items")
-                else:
-                    st.error("❌ Failed to load data")
-                    st.stop()
-            
-            # Process feedback
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            feedback_to_process = (st.session_state.system.all_feedback[:process_limit] 
-                                  if process_limit > 0 
-                                  else st.session_state.system.all_feedback)
-            
-            for idx, feedback in enumerate(feedback_to_process, 1):
-                status_text.text(f"Processing {idx}/{len(feedback_to_process)}: {feedback['source_id']}")
-                progress_bar.progress(idx / len(feedback_to_process))
-                
-                ticket = st.session_state.system.process_feedback_item(feedback)
-                
-                if ticket:
-                    st.session_state.system.generated_tickets.append(ticket)
-                
-            progress_bar.progress(100)
-            status_text.text("✅ Processing complete!")
-            
-            # Save results
-            with st.spinner("💾 Saving results..."):
-                st.session_state.system.save_results()
-            
-            st.session_state.processing_complete = True
-            
-            st.balloons()
-            st.success(f"🎉 Successfully processed {len(st.session_state.system.generated_tickets)} feedback items!")
+            # Processing runs on a background thread so the UI (and the other
+            # tabs) stay responsive and reruns do not interrupt it
+            try:
+                job = start_job(
+                    st.session_state.system,
+                    JOB_STORE,
+                    limit=process_limit if process_limit > 0 else None,
+                    max_workers=max_workers,
+                    incremental=incremental_mode
+                )
+                st.session_state.processing_complete = False
+                st.info(f"🔄 Started job {job.id} in the background; other tabs stay usable while it runs")
+            except RuntimeError as e:
+                st.warning(f"⚠️ {e}")
+    
+    def render_job_progress():
+        """Live progress of the background job, read from the shared status file"""
+        state = JOB_STORE.read()
+        if not state:
+            st.info("ℹ️ No processing job has run yet.")
+            return
+        
+        job = current_job()
+        status = state['status']
+        if status in ACTIVE_STATUSES and (job is None or job.id != state['job_id'] or not job.is_running):
+            st.warning(
+                f"⚠️ Job {state['job_id']} stopped unexpectedly (the dashboard was restarted?). "
+                "Set FEEDBACK_RESUME=1 to continue it from the checkpoint journal."
+            )
+            return
+        
+        done, total = state['done'], state['total']
+        st.progress(done / total if total else 0.0)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Processed", f"{done}/{total}")
+        with col2:
+            st.metric("Throughput", f"{state['items_per_minute']:.1f} items/min")
+        with col3:
+            eta = state['eta_seconds']
+            st.metric("ETA", f"{int(eta // 60)}m {int(eta % 60)}s" if eta is not None else "—")
+        with col4:
+            st.metric("Tickets Generated", state['tickets'])
+        
+        if status == STATUS_RUNNING:
+            st.text(f"Processing {state['current'] or '...'} (job {state['job_id']})")
+            if job is not None and st.button("⏹️ Stop after items in progress"):
+                job.cancel()
+        elif status == STATUS_SAVING:
+            st.text("💾 Saving results...")
+        elif status == STATUS_FAILED:
+            st.error(f"❌ Processing failed: {state['error']}")
+        elif status == STATUS_CANCELLED:
+            st.warning(f"⏹️ Job stopped after {done} items; finished tickets were saved")
+        else:
+            if st.session_state.get('celebrated_job') != state['job_id']:
+                st.session_state.celebrated_job = state['job_id']
+                st.session_state.processing_complete = True
+                st.balloons()
+            st.success(f"🎉 Successfully processed {state['tickets']} feedback items!")
             
             # Show summary
             st.subheader("📊 Processing Summary")
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total Processed", len(feedback_to_process))
+                st.metric("Total Processed", done)
             with col2:
-                st.metric("Tickets Generated", len(st.session_state.system.generated_tickets))
+                st.metric("Tickets Generated", state['tickets'])
             with col3:
-                success_rate = len(st.session_state.system.generated_tickets) / len(feedback_to_process) * 100
+                success_rate = state['tickets'] / done * 100 if done else 0
                 st.metric("Success Rate", f"{success_rate:.1f}%")
+    
+    # Refresh the progress panel on its own every couple of seconds when
+    # this Streamlit version supports fragments; otherwise on demand
+    if live_fragment:
+        live_fragment(run_every=JOB_POLL_SECONDS)(render_job_progress)()
+    else:
+        st.button("🔄 Refresh progress")
+        render_job_progress()
 
 # Tab 3: Generated Tickets
 with tab3:
     st.header("🎫 Generated Tickets")
     
-    if os.path.exists("output/generated_tickets.csv"):
-        tickets_df = pd.read_csv("output/generated_tickets.csv")
-        st.session_state.tickets_df = tickets_df
+    browser = ticket_browser()
+    if browser is not None and len(browser):
+        st.success(f"✅ {len(browser)} tickets generated")
         
-        st.success(f"✅ {len(tickets_df)} tickets generated")
+        # Filter options; filtering happens server-side, only the current page is sent to the browser
+        filter_columns = st.columns(3)
+        selections = {}
+        for filter_column, (column, label) in zip(filter_columns, [
+            ('source_type', "Filter by Source Type"),
+            ('category', "Filter by Category"),
+            ('priority', "Filter by Priority")
+        ]):
+            options = browser.options(column)
+            with filter_column:
+                selected = st.multiselect(label, options=options, default=options, key=f"ticket_filter_{column}")
+            # Everything selected needs no mask
+            selections[column] = None if len(selected) == len(options) else selected
         
-        # Filter options
-        col1, col2 = st.columns(2)
-        with col1:
-            source_filter = st.multiselect(
-                "Filter by Source Type",
-                options=tickets_df['source_type'].unique(),
-                default=tickets_df['source_type'].unique()
-            )
+        matching = browser.count(selections)
         
-        # Apply filters
-        filtered_df = tickets_df[tickets_df['source_type'].isin(source_filter)]
+        # Pagination
+        col1, col2, col3 = st.columns([1, 1, 2])
+        with col1:
+            page_size = st.selectbox("Tickets per page", options=TICKET_PAGE_SIZES, index=1)
+        page_count = max(1, -(-matching // page_size))
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        with col3:
+            st.caption(f"{matching} matching tickets, page {page} of {page_count}")
         
         # Display tickets
-        st.dataframe(filtered_df, use_container_width=True, height=400)
+        page_df = browser.page(selections, page, page_size)
+        st.session_state.tickets_df = page_df
+        st.dataframe(page_df, use_container_width=True, height=400)
         
-        # Download button
-        csv = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Tickets CSV",
-            data=csv,
-            file_name=f"tickets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+        # Download button; the CSV is only built when asked for, for the current filters
+        export_key = (browser.path, len(browser), tuple(sorted(
+            (column, tuple(values)) for column, values in selections.items() if values is not None
+        )))
+        if st.button(f"📦 Prepare CSV export ({matching} tickets)"):
+            st.session_state.ticket_export = (export_key, browser.export_csv(selections))
+        export = st.session_state.get('ticket_export')
+        if export and export[0] == export_key:
+            st.download_button(
+                label="📥 Download Tickets CSV",
+                data=export[1],
+                file_name=f"tickets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
         
         # Show individual tickets
         st.subheader("📋 Ticket Details")
-        selected_ticket = st.selectbox(
-            "Select ticket to view",
-            options=filtered_df['source_id'].tolist()
-        )
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_ticket = st.selectbox(
+                "Select ticket from this page",
+                options=page_df['source_id'].tolist()
+            )
+        with col2:
+            lookup_id = st.text_input("…or look up a source ID")
+        if lookup_id.strip():
+            selected_ticket = lookup_id.strip()
         
         if selected_ticket:
-            ticket_data = filtered_df[filtered_df['source_id'] == selected_ticket].iloc[0]
-            
-            st.markdown(f"**Source ID:** {ticket_data['source_id']}")
-            st.markdown(f"**Source Type:** {ticket_data['source_type']}")
-            st.markdown(f"**Created At:** {ticket_data['created_at']}")
+            ticket_data = browser.get(selected_ticket)
             
-            st.text_area("Original Content", ticket_data['original_content'], height=100, key="view_original_content")
-            st.text_area("Processing Result", ticket_data['processing_result'], height=300, key="view_processing_result")
+            if ticket_data is None:
+                st.warning(f"⚠️ No ticket for source ID {selected_ticket}")
+            else:
+                st.markdown(f"**Source ID:** {ticket_data['source_id']}")
+                st.markdown(f"**Source Type:** {ticket_data['source_type']}")
+                st.markdown(f"**Created At:** {ticket_data['created_at']}")
+                if 'category' in ticket_data:
+                    st.markdown(f"**Category / Priority:** {ticket_data['category']} / {ticket_data['priority']}")
+                    st.markdown(f"**Quality Score:** {ticket_data['quality_score']} ({ticket_data['approval_status']})")
+                
+                st.text_area("Original Content", ticket_data['original_content'], height=100, key="view_original_content")
+                st.text_area("Processing Result", ticket_data['processing_result'], height=300, key="view_processing_result")
     else:
         st.info("ℹ️ No tickets generated yet. Go to 'Process Feedback' tab to start processing.")
 
@@ -295,9 +466,12 @@ with tab3:
 with tab4:
     st.header("📈 Analytics & Metrics")
     
-    if os.path.exists("output/metrics.csv"):
-        metrics_df = pd.read_csv("output/metrics.csv")
-        
+    # Run history from the ticket store, else the metrics file
+    metrics_df = ticket_store().run_metrics() if store_available() else None
+    if (metrics_df is None or metrics_df.empty) and os.path.exists(METRICS_PATH):
+        metrics_df = data_cache().load_table(METRICS_PATH)
+    
+    if metrics_df is not None and not metrics_df.empty:
         st.subheader("Overall Metrics")
         latest_metrics = metrics_df.iloc[-1]
         
@@ -321,10 +495,18 @@ with tab4:
     else:
         st.info("ℹ️ No metrics available yet.")
     
-    # Processing logs
-    if os.path.exists("output/processing_log.csv"):
+    # Processing logs; the store filters in SQL and returns the most recent entries
+    log_actions = ticket_store().log_actions() if store_available() else []
+    if log_actions:
+        st.subheader("📜 Processing Logs")
+        log_action_filter = st.multiselect("Filter by Action", options=log_actions, default=log_actions)
+        if log_action_filter:
+            st.caption(f"Most recent {LOG_DISPLAY_LIMIT} matching entries")
+            filtered_logs = ticket_store().logs(actions=log_action_filter, limit=LOG_DISPLAY_LIMIT)
+            st.dataframe(filtered_logs, use_container_width=True, height=300)
+    elif os.path.exists(LOGS_PATH):
         st.subheader("📜 Processing Logs")
-        logs_df = pd.read_csv("output/processing_log.csv")
+        logs_df = log_tail(LOGS_PATH).read()
         
         # Filter logs
         log_action_filter = st.multiselect(
@@ -344,61 +526,104 @@ with tab5:
     Use this section to manually review and edit generated tickets before they are finalized.
     """)
     
-    if st.session_state.tickets_df is not None:
-        tickets_df = st.session_state.tickets_df
+    browser = ticket_browser()
+    if browser is not None and len(browser):
+        editable = store_available()
+        if not editable:
+            st.info("ℹ️ Edits are saved to the ticket store; enable it (FEEDBACK_DB_ENABLED=1) and process feedback to edit tickets.")
         
-        # Select ticket to edit
-        ticket_to_edit = st.selectbox(
-            "Select ticket to review",
-            options=tickets_df['source_id'].tolist(),
-            key="edit_ticket_selector"
-        )
+        # Select ticket to edit: one from the page shown in Generated Tickets, or any by ID
+        page_df = st.session_state.tickets_df
+        col1, col2 = st.columns(2)
+        with col1:
+            ticket_to_edit = st.selectbox(
+                "Select ticket to review",
+                options=page_df['source_id'].tolist() if page_df is not None else [],
+                key="edit_ticket_selector"
+            )
+        with col2:
+            edit_lookup_id = st.text_input("…or enter a source ID", key="edit_ticket_lookup")
+        if edit_lookup_id.strip():
+            ticket_to_edit = edit_lookup_id.strip()
         
-        if ticket_to_edit:
-            ticket_data = tickets_df[tickets_df['source_id'] == ticket_to_edit].iloc[0]
-            
+        ticket_data = browser.get(ticket_to_edit) if ticket_to_edit else None
+        if ticket_to_edit and ticket_data is None:
+            st.warning(f"⚠️ No ticket for source ID {ticket_to_edit}")
+        
+        if ticket_data is not None:
             st.subheader("Edit Ticket")
+            # Widget keys include the ticket so switching tickets reloads the form
+            key = str(ticket_to_edit)
             
             col1, col2 = st.columns(2)
             
             with col1:
-                new_source_id = st.text_input("Source ID", value=ticket_data['source_id'])
+                st.text_input("Source ID", value=ticket_data['source_id'], disabled=True, key=f"edit_source_id_{key}")
                 new_source_type = st.selectbox(
                     "Source Type",
                     options=['app_review', 'support_email'],
-                    index=0 if ticket_data['source_type'] == 'app_review' else 1
+                    index=0 if ticket_data['source_type'] == 'app_review' else 1,
+                    key=f"edit_source_type_{key}"
+                )
+                new_category = st.selectbox(
+                    "Category",
+                    options=[''] + FeedbackAnalysisSystem.CATEGORIES,
+                    index=choice_index(ticket_data.get('category'), FeedbackAnalysisSystem.CATEGORIES),
+                    key=f"edit_category_{key}"
                 )
             
             with col2:
-                new_created_at = st.text_input("Created At", value=ticket_data['created_at'])
+                new_created_at = st.text_input("Created At", value=ticket_data['created_at'], key=f"edit_created_at_{key}")
+                new_priority = st.selectbox(
+                    "Priority",
+                    options=[''] + FeedbackAnalysisSystem.PRIORITIES,
+                    index=choice_index(ticket_data.get('priority'), FeedbackAnalysisSystem.PRIORITIES),
+                    key=f"edit_priority_{key}"
+                )
             
             new_original_content = st.text_area(
                 "Original Content",
                 value=ticket_data['original_content'],
                 height=150,
-                key="edit_original_content"
+                key=f"edit_original_content_{key}"
             )
             
             new_processing_result = st.text_area(
                 "Processing Result",
                 value=ticket_data['processing_result'],
                 height=300,
-                key="edit_processing_result"
+                key=f"edit_processing_result_{key}"
             )
             
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                if st.button("💾 Save Changes", type="primary"):
-                    st.success("✅ Changes saved (feature in development)")
+                if st.button("💾 Save Changes", type="primary", disabled=not editable):
+                    ticket_store().update_ticket(ticket_to_edit, {
+                        'source_type': new_source_type,
+                        'category': new_category,
+                        'priority': new_priority,
+                        'created_at': new_created_at,
+                        'original_content': new_original_content,
+                        'processing_result': new_processing_result
+                    })
+                    st.success("✅ Changes saved")
             
             with col2:
-                if st.button("✅ Approve Ticket"):
+                if st.button("✅ Approve Ticket", disabled=not editable):
+                    ticket_store().approve_ticket(ticket_to_edit)
                     st.success("✅ Ticket approved")
             
             with col3:
-                if st.button("🗑️ Delete Ticket", type="secondary"):
-                    st.warning("⚠️ Ticket deleted (feature in development)")
+                if st.button("🗑️ Delete Ticket", type="secondary", disabled=not editable):
+                    ticket_store().delete_ticket(ticket_to_edit)
+                    st.warning(f"⚠️ Ticket {ticket_to_edit} deleted")
+            
+            if editable:
+                history_df = ticket_store().reviews(ticket_to_edit)
+                if not history_df.empty:
+                    st.subheader("Review History")
+                    st.dataframe(history_df, use_container_width=True)
     else:
         st.info("ℹ️ No tickets available for review. Process feedback first.")
 
@@ -0,0 +1,201 @@
+"""
+Dashboard Data Cache
+Tables reloaded only when their file's mtime/size changes, an indexed ticket browser and incremental tailing of the processing log
+"""
+
+import io
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from columnar_io import count_rows, csv_row_bytes, csv_row_offsets, detect_format, read_rows, read_table
+
+
+def file_signature(path: str) -> Tuple[int, int]:
+    """(mtime in ns, size) of path; raises FileNotFoundError if it does not exist"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TableCache:
+    """Values derived from files, recomputed only when the file's signature changes
+
+    Meant to be shared by every dashboard session (e.g. via
+    st.cache_resource). Returned DataFrames are shared too, so callers must
+    treat them as read-only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, key, loader: Callable):
+        """loader(path), cached under (path, key) until the file changes"""
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._entries.get((path, key))
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        value = loader(path)
+        with self._lock:
+            self._entries[(path, key)] = (signature, value)
+        return value
+
+    def load_table(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """read_table(path, columns), cached"""
+        return self.get(
+            path,
+            ('table', tuple(columns) if columns else None),
+            lambda file_path: read_table(file_path, columns=columns)
+        )
+
+    def count_rows(self, path: str) -> int:
+        """count_rows(path), cached"""
+        return self.get(path, ('rows',), count_rows)
+
+
+class TicketIndex:
+    """Ticket list held in memory with a source_id index, for paging, filtering and lookups
+
+    Only the list columns are loaded. Filters run here on categorical
+    columns, so the browser only receives one page; full tickets are read by
+    row position (a seek into the CSV, one Parquet row group or a Feather
+    memory map) rather than by scanning the file. Used when the ticket store
+    is disabled; it offers the same browsing methods as TicketStore.
+    """
+
+    FILTER_COLUMNS = ('source_type', 'category', 'priority')
+
+    def __init__(self, path: str, columns: List[str]):
+        self.path = path
+        self.df = read_table(path, columns=columns).reset_index(drop=True)
+        self._keys = {
+            column: self.df[column].fillna('').astype(str).astype('category')
+            for column in self.FILTER_COLUMNS if column in self.df.columns
+        }
+        ids = self.df['source_id'].astype(str)
+        self._positions = pd.Series(self.df.index, index=ids)[~ids.duplicated(keep='last').values]
+
+        self._offsets = None
+        if detect_format(path) == 'csv':
+            offsets = csv_row_offsets(path)
+            # Fall back to filtered reads if the record scan disagrees with read_csv
+            self._offsets = offsets if len(offsets) == len(self.df) + 1 else None
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def options(self, column: str) -> List[str]:
+        """Distinct values of a filter column ('' for missing)"""
+        if column not in self._keys:
+            return []
+        return sorted(self._keys[column].cat.categories)
+
+    def _matching(self, selections: Dict[str, Optional[List[str]]]) -> np.ndarray:
+        """Row positions matching every selection; a selection of None means no filter"""
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, values in (selections or {}).items():
+            if values is not None and column in self._keys:
+                mask &= self._keys[column].isin(values).values
+        return np.flatnonzero(mask)
+
+    def count(self, selections: Dict = None) -> int:
+        return len(self._matching(selections))
+
+    def page(self, selections: Dict, page: int, page_size: int) -> pd.DataFrame:
+        """List columns of one page (1-based) of the matching tickets"""
+        start = (page - 1) * page_size
+        return self.df.iloc[self._matching(selections)[start:start + page_size]]
+
+    def get(self, source_id: str) -> Optional[pd.Series]:
+        """The full ticket for source_id, or None"""
+        position = self._positions.get(str(source_id))
+        if position is None:
+            return None
+        return self._read([position]).iloc[0]
+
+    def _read(self, positions) -> pd.DataFrame:
+        if detect_format(self.path) == 'csv' and self._offsets is None:
+            ids = self.df['source_id'].iloc[positions].tolist()
+            return read_table(self.path, filters=[('source_id', 'in', ids)])
+        return read_rows(self.path, positions, csv_offsets=self._offsets)
+
+    def export_csv(self, selections: Dict = None) -> bytes:
+        """Full matching tickets as CSV; CSV sources are copied record by record without parsing"""
+        positions = self._matching(selections)
+        if self._offsets is not None:
+            return csv_row_bytes(self.path, self._offsets, positions)
+        return self._read(positions).to_csv(index=False).encode('utf-8')
+
+
+class CsvLogTail:
+    """A CSV log parsed incrementally: only rows added since the last read are parsed
+
+    save_results appends rows in place (rewriting the file only when new
+    columns appear), so before reading just the new bytes the header and the
+    end of the already-parsed part are checked; if either changed (the file
+    was replaced or gained columns) it is read again in full. Parquet and Feather logs are always read in full.
+    """
+
+    CHECK_BYTES = 256
+
+    def __init__(self, path: str):
+        self.path = path
+        self._df = None
+        self._signature = None
+        self._header = b''
+        self._offset = 0
+        self._check = b''
+        self._lock = threading.Lock()
+
+    def read(self) -> pd.DataFrame:
+        """The whole log as a DataFrame (treat as read-only)"""
+        with self._lock:
+            signature = file_signature(self.path)
+            if signature == self._signature:
+                return self._df
+
+            if detect_format(self.path) != 'csv':
+                self._df = read_table(self.path)
+                self._signature = signature
+                return self._df
+
+            with open(self.path, 'rb') as f:
+                header = f.readline()
+                if self._can_append(f, header, signature[1]):
+                    # Only the bytes after the parsed part are read
+                    f.seek(self._offset)
+                    start = self._offset
+                else:
+                    self._df = None
+                    self._header = header
+                    self._check = b''
+                    start = self._offset = len(header)
+                data = f.read()
+
+            # Only parse complete lines; a partial last line is picked up next time
+            end = data.rfind(b'\n') + 1
+            new_rows = data[:end]
+            if new_rows.strip() or self._df is None:
+                new_df = pd.read_csv(io.BytesIO(header + new_rows))
+                self._df = new_df if self._df is None else pd.concat([self._df, new_df], ignore_index=True)
+
+            self._offset = start + end
+            self._check = (self._check + new_rows)[-self.CHECK_BYTES:]
+            self._signature = signature
+            return self._df
+
+    def _can_append(self, f, header: bytes, size: int) -> bool:
+        """True if the file still starts with everything parsed so far
+
+        Reads only the CHECK_BYTES just before the parsed offset, not the
+        whole file.
+        """
+        if self._df is None or header != self._header or size < self._offset:
+            return False
+        f.seek(self._offset - len(self._check))
+        return f.read(len(self._check)) == self._check
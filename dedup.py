@@ -0,0 +1,183 @@
+"""
+Near-Duplicate Feedback Clustering
+MinHash signatures with LSH banding so one ticket can cover many reports
+"""
+
+import os
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+
+STOPWORDS = set("""
+a an the and or to of in on for is it i my me this that be with was are have has
+at as by from so if not but you your we our will would can just all its im
+""".split())
+
+
+class FeedbackDeduplicator:
+    """Online leader clustering of feedback text using MinHash + LSH
+    
+    Each item is compared only against cluster representatives that share
+    at least one LSH band with it (one MinHash value per band, so pairs with
+    little overlap still meet). Candidates are confirmed exactly on their
+    hashed word sets: the shared words must cover threshold of the shorter
+    text (containment), so a short review can join the long support email
+    describing the same issue, and min_jaccard of both texts together, so a
+    long report that merely mentions a few of a short one's words stays
+    apart. Texts with fewer than min_shingles content words carry too little
+    signal to compare and always get their own cluster.
+    """
+    
+    _PRIME = (1 << 31) - 1
+    
+    def __init__(self, threshold=0.55, num_perm=64, bands=64, seed=42, min_shingles=4, min_jaccard=0.15):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.threshold = threshold
+        self.min_jaccard = min_jaccard
+        self.min_shingles = min_shingles
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, self._PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, self._PRIME, size=num_perm).astype(np.uint64)
+        
+        self._buckets = defaultdict(list)
+        self._hashes = {}
+        self._singletons = 0
+        self.representative_of = {}
+    
+    @staticmethod
+    def shingles(text: str) -> set:
+        """Content words of text (lowercased, stopwords and 1-char tokens removed)"""
+        return {
+            word for word in re.findall(r'[a-z0-9]+', str(text).lower())
+            if len(word) > 1 and word not in STOPWORDS
+        }
+    
+    @staticmethod
+    def hash_shingles(shingles: set) -> np.ndarray:
+        """Sorted, unique 32-bit hashes of the shingles"""
+        return np.unique(np.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingles], dtype=np.uint64))
+    
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """MinHash signature over num_perm universal hash permutations"""
+        if not len(hashes):
+            return np.full(self.num_perm, self._PRIME, dtype=np.uint64)
+        
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(self._PRIME)
+        return permuted.min(axis=1)
+    
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        """One hashable key per LSH band"""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+    
+    def similarity(self, hashes: np.ndarray, other: np.ndarray):
+        """(containment in the shorter text, Jaccard) of two hashed word sets"""
+        shared = len(np.intersect1d(hashes, other, assume_unique=True))
+        return shared / min(len(hashes), len(other)), shared / (len(hashes) + len(other) - shared)
+    
+    def add(self, source_id, text: str):
+        """Assign an item to a cluster and return its representative's source_id"""
+        hashes = self.hash_shingles(self.shingles(text))
+        if len(hashes) < self.min_shingles:
+            # Too short to compare: its own cluster, never used as a representative
+            self.representative_of[source_id] = source_id
+            self._singletons += 1
+            return source_id
+        
+        band_keys = self._band_keys(self.signature(hashes))
+        
+        best_id, best_score = None, 0.0
+        candidates = {rep_id for key in band_keys for rep_id in self._buckets.get(key, ())}
+        for rep_id in candidates:
+            containment, jaccard = self.similarity(hashes, self._hashes[rep_id])
+            if containment >= self.threshold and jaccard >= self.min_jaccard and containment > best_score:
+                best_id, best_score = rep_id, containment
+        
+        if best_id is not None:
+            self.representative_of[source_id] = best_id
+            return best_id
+        
+        # New cluster led by this item
+        self.representative_of[source_id] = source_id
+        self._hashes[source_id] = hashes
+        for key in band_keys:
+            self._buckets[key].append(source_id)
+        return source_id
+    
+    @property
+    def cluster_count(self) -> int:
+        """Number of distinct clusters seen so far"""
+        return len(self._hashes) + self._singletons
+    
+    def summary(self) -> Dict:
+        """Counts for logging"""
+        total = len(self.representative_of)
+        return {
+            'items': total,
+            'clusters': self.cluster_count,
+            'duplicates': total - self.cluster_count
+        }
+
+
+# Sample-data pairs that describe the same issue, and unrelated texts that share a few words
+SAMPLE_DUPLICATES = [('R008', 'E008'), ('R009', 'E009')]
+UNRELATED_CASES = [
+    "Please add dark mode",
+    "Dark mode would be great, but the app crashes on export",
+    "App crashes",
+    "Great app but crashes when syncing and I lost all my notes"
+]
+
+
+def evaluate(app_reviews_path="data/app_store_reviews.csv", support_emails_path="data/support_emails.csv", **options):
+    """Cluster the sample data and report whether known duplicates merge and other items stay apart"""
+    from feedback_analysis_system import iter_feedback_records
+    
+    deduplicator = FeedbackDeduplicator(**options)
+    for feedback in iter_feedback_records(app_reviews_path, support_emails_path):
+        deduplicator.add(feedback['source_id'], feedback['content'])
+    for idx, text in enumerate(UNRELATED_CASES):
+        deduplicator.add(f"unrelated-{idx}", text)
+    
+    clusters = defaultdict(list)
+    for source_id, representative in deduplicator.representative_of.items():
+        clusters[representative].append(source_id)
+    expected = {frozenset(pair) for pair in SAMPLE_DUPLICATES}
+    failures = [
+        f"{' + '.join(pair)} not merged" for pair in SAMPLE_DUPLICATES
+        if deduplicator.representative_of.get(pair[0]) != deduplicator.representative_of.get(pair[1])
+    ] + [
+        f"{' + '.join(members)} merged" for members in clusters.values()
+        if len(members) > 1 and frozenset(members) not in expected
+    ]
+    
+    print("="*60)
+    print("DEDUP CHECK (sample data)")
+    print("="*60)
+    for members in clusters.values():
+        print(f"{'✅' if len(members) == 1 or frozenset(members) in expected else '❌'} {', '.join(members)}")
+    print(f"Clusters: {deduplicator.cluster_count} for {len(deduplicator.representative_of)} items, "
+          f"{len(failures)} problem(s)")
+    print("="*60)
+    
+    return failures
+
+
+if __name__ == "__main__":
+    evaluate(
+        threshold=float(os.getenv("FEEDBACK_DEDUP_THRESHOLD", "0.55")),
+        min_jaccard=float(os.getenv("FEEDBACK_DEDUP_MIN_JACCARD", "0.15")),
+        min_shingles=int(os.getenv("FEEDBACK_DEDUP_MIN_WORDS", "4"))
+    )
@@ -0,0 +1,198 @@
+"""
+Fake OpenAI-Compatible Server
+Local chat-completions stub with injectable 429/5xx errors for exercising retries and rate limits
+
+Usage:
+    python fake_openai_server.py --port 8765 --fail-rate 0.3
+    OPENAI_API_BASE=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python feedback_analysis_system.py
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import socket
+import ssl
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers /v1/chat/completions with canned responses shaped like the real agents' output"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    options = None
+    counts = {'requests': 0, 'injected_errors': 0}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        """Request and injected-error counts, e.g. curl http://127.0.0.1:8765/stats"""
+        with self.lock:
+            self._send_json(200, dict(self.counts))
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with self.lock:
+            self.counts['requests'] += 1
+            request_number = self.counts['requests']
+            inject = (
+                (self.options.fail_every and request_number % self.options.fail_every == 0)
+                or random.random() < self.options.fail_rate
+            )
+            if inject:
+                self.counts['injected_errors'] += 1
+
+        time.sleep(self.options.latency)
+        if inject:
+            self._send_json(
+                self.options.fail_status,
+                {'error': {'message': 'Injected error', 'type': 'rate_limit_error', 'code': None}},
+                {'Retry-After': str(self.options.retry_after)} if self.options.fail_status == 429 else None
+            )
+            return
+
+        content = self._reply_content(body)
+        prompt_text = json.dumps(body.get('messages', []))
+        usage = {
+            'prompt_tokens': len(prompt_text) // 4,
+            'completion_tokens': len(content) // 4,
+            'total_tokens': (len(prompt_text) + len(content)) // 4
+        }
+
+        if body.get('stream'):
+            self._send_stream(body, content, usage)
+            return
+
+        self._send_json(200, {
+            'id': f"chatcmpl-{request_number}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': usage
+        })
+
+    def _send_stream(self, body, content, usage):
+        """Server-sent events version of the same reply"""
+        chunks = [
+            {'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': content}, 'finish_reason': None}]},
+            {'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}], 'usage': usage}
+        ]
+        data = "".join(
+            "data: " + json.dumps({'id': 'chatcmpl-stream', 'object': 'chat.completion.chunk',
+                                   'created': int(time.time()), 'model': body.get('model'), **chunk}) + "\n\n"
+            for chunk in chunks
+        ) + "data: [DONE]\n\n"
+        data = data.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _reply_content(body) -> str:
+        """Pick a canned answer by the kind of prompt"""
+        prompt = " ".join(str(message.get('content')) for message in body.get('messages', []))
+
+        if 'one JSON object per line' in prompt:
+            source_ids = re.findall(r'"source_id": "(\w+)"', prompt)
+            return json.dumps([
+                {'source_id': source_id, 'category': 'Bug', 'confidence': 85} for source_id in source_ids
+            ])
+
+        ticket = {
+            'ticket_title': 'Investigate reported issue',
+            'category': 'Bug',
+            'priority': 'High',
+            'description': 'User reported a problem.',
+            'technical_details': 'N/A',
+            'recommended_action': 'Reproduce and fix'
+        }
+        if body.get('response_format'):
+            return json.dumps({**ticket, 'confidence': 90})
+        if 'classify it into exactly ONE' in prompt and 'Review the generated ticket' not in prompt:
+            return "Thought: I now can give a great answer\nFinal Answer: Category: Bug, Confidence: 90"
+        if 'Review the generated ticket' in prompt:
+            review = {'Quality Score': 90, 'Issues Found': [], 'Approval Status': 'Approved'}
+            return "Thought: I now can give a great answer\nFinal Answer: " + json.dumps(review)
+        return "Thought: I now can give a great answer\nFinal Answer: " + json.dumps(ticket)
+
+
+def start_subprocess(*args):
+    """Run this server in a child process on a free port; return (process, base_url) once it answers
+    
+    args are extra command-line options, e.g. ('--latency', '0.2'). Used by
+    the benchmarks; terminate the process when done.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--port', str(port), *map(str, args)],
+        stdout=subprocess.DEVNULL
+    )
+    for _ in range(50):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=1).close()
+            return process, f"http://127.0.0.1:{port}/v1"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fake OpenAI server did not start")
+
+
+def stats(base_url: str) -> dict:
+    """Request and injected-error counts of a running server"""
+    with urllib.request.urlopen(base_url.rsplit('/v1', 1)[0] + "/stats", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat completions server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument('--fail-every', type=int, default=0, help="Inject an error on every Nth request")
+    parser.add_argument('--fail-status', type=int, default=429, help="Status code of injected errors")
+    parser.add_argument('--retry-after', type=float, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--certfile', help="Serve HTTPS with this certificate (PEM)")
+    parser.add_argument('--keyfile', help="Private key for --certfile")
+    options = parser.parse_args()
+
+    FakeOpenAIHandler.options = options
+    server = ThreadingHTTPServer(('127.0.0.1', options.port), FakeOpenAIHandler)
+    scheme = 'http'
+    if options.certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(options.certfile, options.keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+
+    print(f"Fake OpenAI server on {scheme}://127.0.0.1:{options.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
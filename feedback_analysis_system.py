@@ -5,11 +5,16 @@ Multi-Agent System using CrewAI
 
 import os
 import sys
-import httpx
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict
 import json
+import hashlib
+import re
+import threading
+from collections import Counter
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 # import ssl
 # import urllib3
@@ -20,71 +25,399 @@ truststore.inject_into_ssl()
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 
+from checkpoint import CheckpointJournal
+from dedup import FeedbackDeduplicator
+from columnar_io import HAS_PYARROW, FORMAT_EXTENSIONS, count_rows, iter_table_chunks, read_table, with_format, write_table
+from llm_cache import LLMResponseCache
+from ticket_writer import ArrowTicketWriter, StreamingTicketWriter
+from ticket_store import TicketStore
+from local_classifier import LocalClassifier, DEFAULT_CRITICAL_KEYWORDS, DEFAULT_HIGH_KEYWORDS
+from http_client import build_async_http_client, build_http_client
+from rate_limiter import LANE_BACKGROUND, LANE_CRITICAL, LANE_HIGH, LANE_NORMAL, RateLimitScheduler
+from instrumentation import StageMetrics, TokenUsageHandler
+from cost_budget import BUDGET_EXHAUSTED, BUDGET_OK, CREW_PROMPT_OVERHEAD, CostBudget, count_tokens
+
 # Load environment variables
 load_dotenv()
 
 
+# Input columns read from each source (other columns are never loaded)
+REVIEW_COLUMNS = ['review_id', 'review_text', 'platform', 'rating', 'user_name', 'date', 'app_version']
+EMAIL_COLUMNS = ['email_id', 'subject', 'body', 'sender_email', 'timestamp', 'priority']
+
+
+def iter_feedback_records(app_reviews_path, support_emails_path, chunksize=1000):
+    """Lazily yield feedback records from the review and email files, one chunk at a time
+    
+    Inputs may be CSV, Parquet or Feather (chosen by file extension).
+    Empty text cells become '' so content is always a string.
+    """
+    for chunk in iter_table_chunks(app_reviews_path, chunksize, columns=REVIEW_COLUMNS):
+        chunk['review_text'] = chunk['review_text'].fillna('').astype(str)
+        for row in chunk.itertuples(index=False):
+            yield {
+                'source_id': row.review_id,
+                'source_type': 'app_review',
+                'content': row.review_text,
+                'metadata': {
+                    'platform': row.platform,
+                    'rating': row.rating,
+                    'user_name': row.user_name,
+                    'date': row.date,
+                    'app_version': row.app_version
+                }
+            }
+    
+    for chunk in iter_table_chunks(support_emails_path, chunksize, columns=EMAIL_COLUMNS):
+        has_priority = 'priority' in chunk.columns
+        chunk[['subject', 'body']] = chunk[['subject', 'body']].fillna('').astype(str)
+        for row in chunk.itertuples(index=False):
+            yield {
+                'source_id': row.email_id,
+                'source_type': 'support_email',
+                'content': f"{row.subject} | {row.body}",
+                'metadata': {
+                    'subject': row.subject,
+                    'sender_email': row.sender_email,
+                    'timestamp': row.timestamp,
+                    'priority': row.priority if has_priority else ''
+                }
+            }
+
+
+class NonStreamingChatOpenAI(ChatOpenAI):
+    """ChatOpenAI that answers stream() with a single regular completion
+    
+    CrewAI agents always call stream(), and CrewAI's token counter has an
+    async per-token callback, so LangChain starts a new event loop for every
+    streamed chunk on the worker thread. That CPU work holds the GIL and
+    serializes concurrent workers. The agents only use the final text, so
+    one non-streamed call per step is enough, and it reports the API's real
+    token usage.
+    """
+    
+    def stream(self, input, config=None, *, stop=None, **kwargs):
+        yield self.invoke(input, config=config, stop=stop, **kwargs)
+
+
+class LazyStages(dict):
+    """Pipeline stages built on first lookup by build(key)"""
+    
+    def __init__(self, build):
+        super().__init__()
+        self._build = build
+    
+    def __missing__(self, key):
+        stage = self[key] = self._build(key)
+        return stage
+
+
 class FeedbackAnalysisSystem:
     """Main system orchestrating the multi-agent feedback analysis"""
     
+    # Classifier category -> analysis branch
+    ROUTING_BRANCHES = {
+        'Bug': 'bug',
+        'Feature Request': 'feature',
+        'Praise': 'general',
+        'Complaint': 'general',
+        'Spam': 'general'
+    }
+    
+    # Keys of the JSON ticket produced by the ticket creator
+    TICKET_FIELDS = [
+        'ticket_title', 'category', 'priority', 'description',
+        'technical_details', 'recommended_action'
+    ]
+    
+    # Normalized values of the parsed ticket columns
+    CATEGORIES = ['Bug', 'Feature Request', 'Praise', 'Complaint', 'Spam']
+    PRIORITIES = ['Critical', 'High', 'Medium', 'Low']
+    
+    # Columns of generated_tickets.csv (dedup columns are appended when enabled)
+    TICKET_COLUMNS = [
+        'source_id', 'source_type', 'created_at', 'category', 'priority',
+        'quality_score', 'approval_status', 'original_content', 'processing_result'
+    ]
+    
+    # Non-string ticket columns (typed in Parquet/Feather output)
+    TICKET_COLUMN_TYPES = {'quality_score': 'int', 'report_count': 'int'}
+    
+    # Per-agent fast-tier model overrides
+    AGENT_MODEL_ENV = {
+        'csv_reader_agent': 'FEEDBACK_MODEL_CSV_READER',
+        'classifier_agent': 'FEEDBACK_MODEL_CLASSIFIER',
+        'bug_analyzer_agent': 'FEEDBACK_MODEL_BUG_ANALYZER',
+        'feature_extractor_agent': 'FEEDBACK_MODEL_FEATURE_EXTRACTOR',
+        'ticket_creator_agent': 'FEEDBACK_MODEL_TICKET_CREATOR',
+        'quality_critic_agent': 'FEEDBACK_MODEL_QUALITY_CRITIC'
+    }
+    TIER_FAST = 'fast'
+    
     def __init__(self):
-        self.app_reviews_path = "data/app_store_reviews.csv"
-        self.support_emails_path = "data/support_emails.csv"
-        self.output_tickets_path = "output/generated_tickets.csv"
-        self.processing_log_path = "output/processing_log.csv"
-        self.metrics_path = "output/metrics.csv"
-        
-        # Data storage
-        self.reviews_data = None
-        self.emails_data = None
+        self.app_reviews_path = os.getenv("FEEDBACK_APP_REVIEWS_PATH", "data/app_store_reviews.csv")
+        self.support_emails_path = os.getenv("FEEDBACK_SUPPORT_EMAILS_PATH", "data/support_emails.csv")
+        
+        # Output format: csv (default), parquet or feather (the latter two need pyarrow)
+        self.output_format = os.getenv("FEEDBACK_OUTPUT_FORMAT", "csv").lower()
+        if self.output_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unknown FEEDBACK_OUTPUT_FORMAT: {self.output_format}")
+        if self.output_format != 'csv' and not HAS_PYARROW:
+            print(f"⚠️ pyarrow not installed; writing CSV instead of {self.output_format}")
+            self.output_format = 'csv'
+        self.output_tickets_path = with_format("output/generated_tickets.csv", self.output_format)
+        self.processing_log_path = with_format("output/processing_log.csv", self.output_format)
+        self.metrics_path = with_format("output/metrics.csv", self.output_format)
+        self.stage_metrics_path = with_format("output/stage_metrics.csv", self.output_format)
+        self.prometheus_path = os.getenv("FEEDBACK_PROMETHEUS_PATH", "output/stage_metrics.prom")
+        self.manifest_path = "output/processed_manifest.json"
+        self.checkpoint_path = os.getenv("FEEDBACK_CHECKPOINT_PATH", "output/checkpoint.jsonl")
+        
+        # Data storage (feedback is streamed from the CSVs in chunks;
+        # all_feedback is only used when a caller supplies items directly)
+        self.chunksize = int(os.getenv("FEEDBACK_CSV_CHUNKSIZE", "1000"))
+        self.reviews_count = 0
+        self.emails_count = 0
+        self.source_counts = Counter()
+        self.items_attempted = 0
         self.all_feedback = []
         self.generated_tickets = []
+        self.tickets_generated = 0
         self.processing_logs = []
+        self.branch_counts = Counter()
+        
+        # Incremental mode: source_id -> content hash of items already ticketed
+        self.incremental = os.getenv("FEEDBACK_INCREMENTAL", "0") == "1"
+        self.manifest = {}
+        self.skipped_unchanged = 0
+        
+        # Checkpoint journal: tickets and logs are appended as they complete so
+        # an interrupted run can resume (set FEEDBACK_CHECKPOINT_ENABLED=0 to disable)
+        self.journal = None
+        if os.getenv("FEEDBACK_CHECKPOINT_ENABLED", "1") != "0":
+            self.journal = CheckpointJournal(
+                path=self.checkpoint_path,
+                fsync_every=int(os.getenv("FEEDBACK_CHECKPOINT_FSYNC_EVERY", "20"))
+            )
+        self.resume = os.getenv("FEEDBACK_RESUME", "0") == "1"
+        self.resumed_count = 0
+        
+        # Streaming output: tickets are appended to generated_tickets.csv as they
+        # complete instead of being held in memory (FEEDBACK_STREAM_OUTPUT=0 to disable)
+        self.stream_output = os.getenv("FEEDBACK_STREAM_OUTPUT", "1") != "0"
+        self.output_flush_every = int(os.getenv("FEEDBACK_OUTPUT_FLUSH_EVERY", "50"))
+        self.ticket_writer = None
+        
+        # Fast path: one structured-output call per item, falling back to the
+        # multi-agent crew when confidence is below the threshold
+        self.fast_path = os.getenv("FEEDBACK_FAST_PATH", "0") == "1"
+        self.fast_path_min_confidence = int(os.getenv("FEEDBACK_FAST_PATH_MIN_CONFIDENCE", "80"))
+        
+        # Quality review policy: always review these priorities, sample the rest
+        # (deterministically by source_id) and skip these categories; with
+        # FEEDBACK_QA_ASYNC=1 reviews run after the ticket is emitted
+        self.qa_sample_rate = float(os.getenv("FEEDBACK_QA_SAMPLE_RATE", "1.0"))
+        self.qa_always_priorities = self._split_list(os.getenv("FEEDBACK_QA_ALWAYS_PRIORITIES", "Critical, High"))
+        self.qa_skip_categories = self._split_list(os.getenv("FEEDBACK_QA_SKIP_CATEGORIES", "Spam"))
+        self.qa_async = os.getenv("FEEDBACK_QA_ASYNC", "0") == "1"
+        self.qa_workers = int(os.getenv("FEEDBACK_QA_WORKERS", "2"))
+        self.qa_executor = None
+        self.qa_pending = []
+        self.qa_counts = Counter()
+        
+        # Local rule-based pre-classifier; set to None to always use the LLM
+        self.prefilter = None
+        if os.getenv("FEEDBACK_PREFILTER", "0") == "1":
+            self.prefilter = LocalClassifier(
+                critical_keywords=os.getenv("FEEDBACK_CRITICAL_KEYWORDS", DEFAULT_CRITICAL_KEYWORDS),
+                high_keywords=os.getenv("FEEDBACK_HIGH_KEYWORDS", DEFAULT_HIGH_KEYWORDS),
+                threshold=int(os.getenv("FEEDBACK_PREFILTER_THRESHOLD", "90"))
+            )
+        self.prefilter_counts = Counter()
+        
+        # Keyword rules used to pick an item's rate-limiter lane when the
+        # pre-filter is off
+        self.priority_rules = LocalClassifier(
+            critical_keywords=os.getenv("FEEDBACK_CRITICAL_KEYWORDS", DEFAULT_CRITICAL_KEYWORDS),
+            high_keywords=os.getenv("FEEDBACK_HIGH_KEYWORDS", DEFAULT_HIGH_KEYWORDS)
+        )
+        
+        # Near-duplicate clustering: one ticket per cluster of similar reports
+        self.dedup = os.getenv("FEEDBACK_DEDUP", "0") == "1"
+        self.dedup_threshold = float(os.getenv("FEEDBACK_DEDUP_THRESHOLD", "0.55"))
+        self.dedup_min_jaccard = float(os.getenv("FEEDBACK_DEDUP_MIN_JACCARD", "0.15"))
+        self.dedup_min_words = int(os.getenv("FEEDBACK_DEDUP_MIN_WORDS", "4"))
+        self.duplicates = {}
+        self.representative_of = {}
+        
+        # Batch classification: pack several items into one classifier prompt,
+        # sized by an approximate token budget
+        self.batch_classify = os.getenv("FEEDBACK_BATCH_CLASSIFY", "0") == "1"
+        self.batch_token_budget = int(os.getenv("FEEDBACK_BATCH_TOKEN_BUDGET", "3000"))
+        self.batch_max_items = int(os.getenv("FEEDBACK_BATCH_MAX_ITEMS", "20"))
+        
+        # Concurrency: pipelines in flight at once (1 = sequential)
+        self.max_workers = int(os.getenv("FEEDBACK_MAX_WORKERS", "1"))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        
+        # Agent/crew tracing; set FEEDBACK_VERBOSE=0 for quiet production runs
+        self.verbose = os.getenv("FEEDBACK_VERBOSE", "1") != "0"
         
         # Initialize LLM
         model = os.getenv("OPENAI_MODEL_NAME", "gpt-4-turbo-preview")
         print(f"Using model: {model}")
         
-        self.llm = ChatOpenAI(
+        self.model = model
+        self.temperature = 0.3
+        # Client-side rate limiting and retries shared by every LLM request;
+        # the OpenAI client's own retries are disabled so attempts are counted here
+        self.scheduler = RateLimitScheduler(
+            requests_per_minute=int(os.getenv("FEEDBACK_RATE_LIMIT_RPM", "0")),
+            tokens_per_minute=int(os.getenv("FEEDBACK_RATE_LIMIT_TPM", "0")),
+            max_retries=int(os.getenv("FEEDBACK_MAX_RETRIES", "5")),
+            base_delay=float(os.getenv("FEEDBACK_RETRY_BASE_DELAY", "1.0")),
+            max_delay=float(os.getenv("FEEDBACK_RETRY_MAX_DELAY", "60"))
+        )
+        
+        # One pooled keep-alive client (sync and async) shared by every LLM, so
+        # connections and TLS sessions are reused across calls and threads
+        self.http_client = build_http_client(self.scheduler, timeout=60)
+        self.http_async_client = build_async_http_client(self.scheduler, timeout=60)
+        
+        # Persistent response cache (set FEEDBACK_CACHE_ENABLED=0 to disable)
+        self.cache = None
+        if os.getenv("FEEDBACK_CACHE_ENABLED", "1") != "0":
+            self.cache = LLMResponseCache(
+                path=os.getenv("FEEDBACK_CACHE_PATH", "output/llm_cache.sqlite"),
+                ttl_seconds=int(os.getenv("FEEDBACK_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+                max_bytes=int(os.getenv("FEEDBACK_CACHE_MAX_MB", "256")) * 1024 * 1024
+            )
+        
+        # Embedded database of feedback, tickets, reviews, logs and metrics read by
+        # the dashboard and validator (set FEEDBACK_DB_ENABLED=0 to disable); closed
+        # by save_results and reopened by the next process_all_feedback call
+        self.store_path = None
+        if os.getenv("FEEDBACK_DB_ENABLED", "1") != "0":
+            self.store_path = os.getenv("FEEDBACK_DB_PATH", "output/feedback.sqlite")
+        self.store = TicketStore(self.store_path) if self.store_path else None
+        
+        # Per-task wall time, tokens, retries and cache status; FEEDBACK_OTEL=1
+        # also emits each task as an OpenTelemetry span
+        self.stage_metrics = StageMetrics(
+            scheduler=self.scheduler,
+            cache_enabled=self.cache is not None,
+            tracer=StageMetrics.otel_tracer() if os.getenv("FEEDBACK_OTEL", "0") == "1" else None
+        )
+        
+        # Token/cost budget per run and per item (0 = unlimited); near the run
+        # limit items skip the quality review and Medium/Low ones use a cheaper model
+        price_input = os.getenv("FEEDBACK_PRICE_INPUT_PER_1K")
+        price_output = os.getenv("FEEDBACK_PRICE_OUTPUT_PER_1K")
+        self.budget = CostBudget(
+            model,
+            run_usd=float(os.getenv("FEEDBACK_BUDGET_USD", "0")),
+            item_usd=float(os.getenv("FEEDBACK_ITEM_BUDGET_USD", "0")),
+            run_tokens=int(os.getenv("FEEDBACK_TOKEN_BUDGET", "0")),
+            item_tokens=int(os.getenv("FEEDBACK_ITEM_TOKEN_BUDGET", "0")),
+            degrade_at=float(os.getenv("FEEDBACK_BUDGET_DEGRADE_AT", "0.8")),
+            price_override=(float(price_input), float(price_output)) if price_input and price_output else None
+        )
+        self.fallback_model = os.getenv("FEEDBACK_BUDGET_FALLBACK_MODEL", "gpt-3.5-turbo")
+        self.completion_estimate = int(os.getenv("FEEDBACK_BUDGET_COMPLETION_TOKENS", "300"))
+        self.project_costs = os.getenv("FEEDBACK_PROJECT_COST", "0") == "1"
+        self.token_usage = TokenUsageHandler(self.stage_metrics.add_tokens, self.budget.record)
+        
+        # Tiered routing: agents run on their fast-tier model (FEEDBACK_MODEL_<AGENT>,
+        # else FEEDBACK_FAST_MODEL) and an item escalates to OPENAI_MODEL_NAME when
+        # its classification confidence is below the threshold
+        self.fast_model = os.getenv("FEEDBACK_FAST_MODEL", "")
+        self.agent_models = {
+            name: os.getenv(env) for name, env in self.AGENT_MODEL_ENV.items() if os.getenv(env)
+        }
+        self.escalation_confidence = int(os.getenv("FEEDBACK_ESCALATION_CONFIDENCE", "70"))
+        self.tier_counts = Counter()
+        
+        self.llm = self._make_llm(model)
+        self._llms = {model: self.llm}
+        
+        # Agents are not shared: Agent.execute_task rebuilds and mutates the
+        # agent's executor, so every worker thread creates its own agents (and
+        # crews) on first use in _get_pipeline
+        
+    def _make_llm(self, model: str) -> ChatOpenAI:
+        """Chat model on the shared HTTP client, reporting token usage"""
+        return NonStreamingChatOpenAI(
             model=model,
-            temperature=0.3,
-            timeout=60
+            temperature=self.temperature,
+            timeout=60,
+            max_retries=0,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+            callbacks=[self.token_usage]
         )
+    
+    def _llm_for(self, model: str = None) -> ChatOpenAI:
+        """Shared chat model for model (the default model when None)"""
+        model = model or self.model
+        with self._lock:
+            if model not in self._llms:
+                self._llms[model] = self._make_llm(model)
+            return self._llms[model]
+    
+    def _tier_models(self, tier: str = None) -> Dict[str, str]:
+        """Model per agent for a tier
         
-        # Initialize agents
-        self._setup_agents()
+        None is the strong tier (OPENAI_MODEL_NAME), TIER_FAST uses each
+        agent's fast-tier model, and any other value is a model name used by
+        every agent (e.g. the budget fallback model).
+        """
+        if tier is None:
+            return {name: self.model for name in self.AGENT_MODEL_ENV}
+        if tier == self.TIER_FAST:
+            return {name: self.agent_models.get(name) or self.fast_model or self.model for name in self.AGENT_MODEL_ENV}
+        return {name: tier for name in self.AGENT_MODEL_ENV}
+    
+    @property
+    def tiered_routing(self) -> bool:
+        """True when any agent has a fast-tier model other than OPENAI_MODEL_NAME"""
+        return any(model != self.model for model in self._tier_models(self.TIER_FAST).values())
+    
+    def _create_agents(self, models: Dict[str, str] = None) -> Dict[str, Agent]:
+        """Create one set of agents (each pipeline, and so each worker thread, owns its own set)
         
-    def _setup_agents(self):
-        """Initialize all agents with their roles and goals"""
+        models maps agent names to model names; missing agents use the default LLM.
+        """
+        llms = {name: self._llm_for((models or {}).get(name)) for name in self.AGENT_MODEL_ENV}
         
         # 1. CSV Reader Agent
-        self.csv_reader_agent = Agent(
+        csv_reader_agent = Agent(
             role="CSV Data Reader",
             goal="Read and parse feedback data from CSV files accurately",
             backstory="""You are an expert data parsing specialist. Your job is to 
             read CSV files containing user feedback from multiple sources and 
             prepare the data for analysis. You ensure data integrity and handle 
             various formats and edge cases.""",
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.llm
+            llm=llms['csv_reader_agent']
         )
         
         # 2. Feedback Classifier Agent
-        self.classifier_agent = Agent(
+        classifier_agent = Agent(
             role="Feedback Classifier",
             goal="Accurately categorize feedback into Bug, Feature Request, Praise, Complaint, or Spam",
             backstory="""You are an expert NLP classifier specializing in sentiment 
             analysis and intent detection. You can quickly identify the primary 
             purpose of user feedback and assign accurate categories. You look for 
             keywords, sentiment, and context to make precise classifications.""",
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.llm
+            llm=llms['classifier_agent']
         )
         
         # 3. Bug Analysis Agent
-        self.bug_analyzer_agent = Agent(
+        bug_analyzer_agent = Agent(
             role="Bug Analysis Specialist",
             goal="Extract technical details from bug reports including steps to reproduce, platform info, and severity",
             backstory="""You are a seasoned QA engineer with deep technical knowledge. 
@@ -92,90 +425,81 @@ class FeedbackAnalysisSystem:
             details, OS versions, app versions, reproduction steps, and assess severity 
             based on impact and frequency. You know how to identify critical issues 
             that need immediate attention.""",
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.llm
+            llm=llms['bug_analyzer_agent']
         )
         
         # 4. Feature Extractor Agent
-        self.feature_extractor_agent = Agent(
+        feature_extractor_agent = Agent(
             role="Feature Request Analyst",
             goal="Identify feature requests and estimate user impact and demand",
             backstory="""You are a product analyst skilled at understanding user needs. 
             You extract feature requests from feedback, understand the underlying user 
             need, estimate potential impact on user satisfaction, and identify patterns 
             in feature requests across multiple feedback items.""",
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.llm
+            llm=llms['feature_extractor_agent']
         )
         
         # 5. Ticket Creator Agent
-        self.ticket_creator_agent = Agent(
+        ticket_creator_agent = Agent(
             role="Ticket Creator",
             goal="Generate well-structured, actionable tickets with appropriate priority and metadata",
             backstory="""You are an expert project manager who creates clear, actionable 
             tickets for engineering teams. You write concise titles, detailed descriptions, 
             set appropriate priorities, and include all necessary metadata. Your tickets 
             follow best practices and are immediately actionable.""",
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.llm
+            llm=llms['ticket_creator_agent']
         )
         
         # 6. Quality Critic Agent
-        self.quality_critic_agent = Agent(
+        quality_critic_agent = Agent(
             role="Quality Assurance Reviewer",
             goal="Review generated tickets for completeness, accuracy, and quality",
             backstory="""You are a meticulous QA reviewer who ensures every ticket meets 
             quality standards. You check for completeness, accuracy of classification, 
             appropriate priority assignment, clear descriptions, and proper formatting. 
             You catch inconsistencies and suggest improvements.""",
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.llm
+            llm=llms['quality_critic_agent']
         )
+        
+        return {
+            'csv_reader_agent': csv_reader_agent,
+            'classifier_agent': classifier_agent,
+            'bug_analyzer_agent': bug_analyzer_agent,
+            'feature_extractor_agent': feature_extractor_agent,
+            'ticket_creator_agent': ticket_creator_agent,
+            'quality_critic_agent': quality_critic_agent
+        }
     
-    def load_data(self):
-        """Load feedback data from CSV files"""
+    def load_data(self, limit=None):
+        """Validate the feedback CSV files and count their rows
+        
+        Rows are not held in memory; iter_feedback streams them in chunks
+        when processing starts. With a limit, counting stops after limit
+        rows in total (the emails are not read at all if the reviews reach
+        it), since no more items than that will be processed.
+        """
         try:
-            self.reviews_data = pd.read_csv(self.app_reviews_path)
-            self.emails_data = pd.read_csv(self.support_emails_path)
-            
-            # Combine all feedback
-            for _, row in self.reviews_data.iterrows():
-                self.all_feedback.append({
-                    'source_id': row['review_id'],
-                    'source_type': 'app_review',
-                    'content': row['review_text'],
-                    'metadata': {
-                        'platform': row['platform'],
-                        'rating': row['rating'],
-                        'user_name': row['user_name'],
-                        'date': row['date'],
-                        'app_version': row['app_version']
-                    }
-                })
-            
-            for _, row in self.emails_data.iterrows():
-                self.all_feedback.append({
-                    'source_id': row['email_id'],
-                    'source_type': 'support_email',
-                    'content': f"{row['subject']} | {row['body']}",
-                    'metadata': {
-                        'subject': row['subject'],
-                        'sender_email': row['sender_email'],
-                        'timestamp': row['timestamp'],
-                        'priority': row.get('priority', '')
-                    }
-                })
+            limit = limit or None
+            self.reviews_count = self._count_rows(self.app_reviews_path, limit)
+            remaining = limit - self.reviews_count if limit is not None else None
+            self.emails_count = self._count_rows(self.support_emails_path, remaining) if remaining != 0 else 0
             
             log_entry = {
                 'timestamp': datetime.now().isoformat(),
                 'action': 'data_loaded',
-                'details': f"Loaded {len(self.reviews_data)} reviews and {len(self.emails_data)} emails"
+                'details': f"Loaded {self.reviews_count} reviews and {self.emails_count} emails" + (
+                    f" (counted up to the limit of {limit})" if limit is not None else ""
+                )
             }
-            self.processing_logs.append(log_entry)
+            self._log(log_entry)
             
             return True
             
@@ -185,35 +509,181 @@ class FeedbackAnalysisSystem:
                 'action': 'data_load_error',
                 'details': str(e)
             }
-            self.processing_logs.append(log_entry)
+            self._log(log_entry)
             return False
     
-    def process_feedback_item(self, feedback_item: Dict) -> Dict:
-        """Process a single feedback item through the agent pipeline"""
+    @property
+    def total_feedback(self) -> int:
+        """Number of feedback items available to process"""
+        if self.all_feedback:
+            return len(self.all_feedback)
+        return self.reviews_count + self.emails_count
+    
+    def _count_rows(self, path: str, limit=None) -> int:
+        """Count CSV rows (up to limit) without loading the file into memory"""
+        return count_rows(path, chunksize=self.chunksize, limit=limit)
+    
+    def iter_feedback(self):
+        """Lazily yield feedback records from both CSV sources, one chunk at a time"""
+        return iter_feedback_records(self.app_reviews_path, self.support_emails_path, self.chunksize)
+    
+    def feedback_source(self):
+        """Items to process: caller-supplied all_feedback, else the CSV stream"""
+        return self.all_feedback if self.all_feedback else self.iter_feedback()
+    
+    def _content_hash(self, feedback_item: Dict) -> str:
+        """Stable hash of an item's content and metadata"""
+        payload = json.dumps(
+            [feedback_item['source_type'], feedback_item['content'], feedback_item['metadata']],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def load_manifest(self):
+        """Load the processed-items manifest used by incremental runs"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {}
+        return self.manifest
+    
+    def save_manifest(self):
+        """Atomically write the processed-items manifest"""
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def is_unchanged(self, feedback_item: Dict) -> bool:
+        """True if the item was already ticketed with identical content"""
+        return self.manifest.get(feedback_item['source_id']) == self._content_hash(feedback_item)
+    
+    def filter_changed(self, feedback_items):
+        """Yield only items that are new or whose content changed since they were ticketed"""
+        for feedback in feedback_items:
+            if not self.is_unchanged(feedback):
+                yield feedback
+    
+    def _parse_classification(self, classification_text: str):
+        """Parse 'Category: X, Confidence: N' output from the classifier"""
+        text = classification_text or ''
         
-        source_id = feedback_item['source_id']
-        content = feedback_item['content']
-        metadata = feedback_item['metadata']
+        category = 'Complaint'
+        match = re.search(r'category\W*\s*(bug|feature request|feature|praise|complaint|spam)', text, re.IGNORECASE)
+        if not match:
+            match = re.search(r'\b(bug|feature request|praise|complaint|spam)\b', text, re.IGNORECASE)
+        if match:
+            label = match.group(1).lower()
+            category = 'Feature Request' if label.startswith('feature') else label.title()
+        
+        confidence = 0
+        match = re.search(r'confidence\W*\s*(\d{1,3})', text, re.IGNORECASE)
+        if match:
+            confidence = min(int(match.group(1)), 100)
         
-        # Task 1: Classify feedback
-        classify_task = Task(
-            description=f"""Analyze this feedback and classify it into exactly ONE category:
+        return category, confidence
+    
+    @staticmethod
+    def _extract_json(text) -> Dict:
+        """Parse the first JSON object in an LLM response (markdown fences and prose allowed)"""
+        text = str(text or '')
+        fenced = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+        candidates = [fenced.group(1)] if fenced else []
+        start, end = text.find('{'), text.rfind('}')
+        if start != -1 and end > start:
+            candidates.append(text[start:end + 1])
+        
+        for candidate in candidates:
+            try:
+                parsed = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(parsed, dict):
+                return parsed
+        return {}
+    
+    @staticmethod
+    def _get_field(data: Dict, *names):
+        """Look up a key ignoring case, spaces and underscores ('Quality Score' == 'quality_score')"""
+        normalized = {re.sub(r'[^a-z0-9]', '', str(key).lower()): value for key, value in data.items()}
+        for name in names:
+            value = normalized.get(re.sub(r'[^a-z0-9]', '', name.lower()))
+            if value not in (None, ''):
+                return value
+        return None
+    
+    @staticmethod
+    def _normalize_choice(value, choices: List[str]) -> str:
+        """Map free text onto one of choices by its first word ('feature' -> 'Feature Request')"""
+        text = str(value or '').lower()
+        for choice in choices:
+            if re.search(r'\b' + re.escape(choice.split()[0].lower()), text):
+                return choice
+        return ''
+    
+    def _parse_ticket_fields(self, ticket_text, review_text=None, default_category='') -> Dict:
+        """Extract the typed ticket columns from the ticket and quality review JSON
+        
+        Runs once when the ticket is created so consumers can filter on
+        columns instead of rescanning processing_result.
+        """
+        ticket_json = ticket_text if isinstance(ticket_text, dict) else self._extract_json(ticket_text)
+        review_json = review_text if isinstance(review_text, dict) else self._extract_json(review_text)
+        
+        quality_score = self._get_field(review_json, 'quality_score', 'score')
+        approval_status = str(self._get_field(review_json, 'approval_status', 'approval', 'status') or '').lower()
+        if re.search(r'revision|not approved|reject', approval_status):
+            approval_status = 'Needs Revision'
+        elif 'approved' in approval_status:
+            approval_status = 'Approved'
+        else:
+            approval_status = ''
+        
+        return {
+            'category': self._normalize_choice(self._get_field(ticket_json, 'category'), self.CATEGORIES) or default_category,
+            'priority': self._normalize_choice(self._get_field(ticket_json, 'priority'), self.PRIORITIES),
+            'quality_score': self._to_int(quality_score, default=None) if quality_score is not None else None,
+            'approval_status': approval_status
+        }
+    
+    @staticmethod
+    def _split_list(value: str) -> List[str]:
+        """Comma-separated env setting as a list of stripped, non-empty values"""
+        return [item.strip() for item in value.split(',') if item.strip()]
+    
+    @staticmethod
+    def _to_int(value, default=0) -> int:
+        """Coerce an LLM-provided number (e.g. 85, "85", "85%") to int"""
+        match = re.search(r'\d+', str(value)) if value is not None else None
+        return int(match.group()) if match else default
+    
+    def _build_classify_task(self, agents: Dict[str, Agent]) -> Task:
+        """Task 1: Classify feedback"""
+        return Task(
+            description="""Analyze this feedback and classify it into exactly ONE category:
             Bug, Feature Request, Praise, Complaint, or Spam.
             
             Feedback: {content}
             
             Provide your classification and confidence score (0-100).
             Format: Category: [category], Confidence: [score]""",
-            agent=self.classifier_agent,
+            agent=agents['classifier_agent'],
             expected_output="Classification category and confidence score"
         )
+    
+    def _build_analysis_task(self, branch: str, agents: Dict[str, Agent]) -> Task:
+        """Task 2: Analysis task for the routed branch (bug, feature or general)"""
         
         # Task 2a: Bug Analysis (for bugs only)
-        bug_analysis_task = Task(
-            description=f"""Analyze this BUG report and extract technical details:
+        if branch == 'bug':
+            return Task(
+                description="""Analyze this BUG report and extract technical details:
             
             Feedback: {content}
-            Metadata: {json.dumps(metadata)}
+            Metadata: {metadata}
+            Classification: {classification}
             
             Extract:
             - Device/platform information
@@ -224,17 +694,18 @@ class FeedbackAnalysisSystem:
             - Frequency of occurrence
             
             Provide structured output with all technical details.""",
-            agent=self.bug_analyzer_agent,
-            expected_output="Detailed bug analysis with technical information",
-            context=[classify_task]
-        )
+                agent=agents['bug_analyzer_agent'],
+                expected_output="Detailed bug analysis with technical information"
+            )
         
         # Task 2b: Feature Analysis (for feature requests only)
-        feature_analysis_task = Task(
-            description=f"""Analyze this FEATURE REQUEST and extract insights:
+        if branch == 'feature':
+            return Task(
+                description="""Analyze this FEATURE REQUEST and extract insights:
             
             Feedback: {content}
-            Metadata: {json.dumps(metadata)}
+            Metadata: {metadata}
+            Classification: {classification}
             
             Extract:
             - What feature is being requested (clear description)
@@ -245,17 +716,17 @@ class FeedbackAnalysisSystem:
             - Similar existing features or workarounds
             
             Provide structured output with impact analysis.""",
-            agent=self.feature_extractor_agent,
-            expected_output="Detailed feature request analysis with impact estimation",
-            context=[classify_task]
-        )
+                agent=agents['feature_extractor_agent'],
+                expected_output="Detailed feature request analysis with impact estimation"
+            )
         
         # Task 2c: General Analysis (for Praise, Complaint, Spam)
-        general_analysis_task = Task(
-            description=f"""Analyze this feedback for insights:
+        return Task(
+            description="""Analyze this feedback for insights:
             
             Feedback: {content}
-            Metadata: {json.dumps(metadata)}
+            Metadata: {metadata}
+            Classification: {classification}
             
             Extract:
             - Key themes or sentiments
@@ -264,17 +735,18 @@ class FeedbackAnalysisSystem:
             - If SPAM: Reason for spam classification
             
             Provide structured output.""",
-            agent=self.bug_analyzer_agent,
-            expected_output="General analysis with key insights",
-            context=[classify_task]
+            agent=agents['bug_analyzer_agent'],
+            expected_output="General analysis with key insights"
         )
-        
-        # Task 3: Create ticket
-        ticket_task = Task(
-            description=f"""Create a structured ticket for this feedback:
+    
+    def _build_ticket_task(self, agents: Dict[str, Agent], analysis_task: Task) -> Task:
+        """Task 3: Create ticket from the routed analysis"""
+        return Task(
+            description="""Create a structured ticket for this feedback:
             
             Source ID: {source_id}
-            Source Type: {feedback_item['source_type']}
+            Source Type: {source_type}
+            Classification: {classification}
             
             Generate:
             1. Ticket Title (clear and actionable)
@@ -286,14 +758,14 @@ class FeedbackAnalysisSystem:
             
             Format as JSON with these exact keys:
             ticket_title, category, priority, description, technical_details, recommended_action""",
-            agent=self.ticket_creator_agent,
+            agent=agents['ticket_creator_agent'],
             expected_output="JSON formatted ticket with all required fields",
-            context=[classify_task, bug_analysis_task, feature_analysis_task, general_analysis_task]
+            context=[analysis_task]
         )
-        
-        # Task 4: Quality review
-        review_task = Task(
-            description=f"""Review the generated ticket for quality:
+    
+    def _build_review_task(self, agents: Dict[str, Agent], ticket_task: Task = None) -> Task:
+        """Task 4: Quality review of the ticket task's output, or of the {ticket} input when run on its own"""
+        description = """Review the generated ticket for quality:
             
             Check:
             1. Is the classification accurate?
@@ -308,46 +780,790 @@ class FeedbackAnalysisSystem:
             - Suggestions for improvement (if any)
             - Approval Status (Approved/Needs Revision)
             
-            Format as JSON.""",
-            agent=self.quality_critic_agent,
+            Format as JSON."""
+        if ticket_task is None:
+            description += """
+            
+            Ticket:
+            {ticket}"""
+        
+        return Task(
+            description=description,
+            agent=agents['quality_critic_agent'],
             expected_output="Quality review with score and approval status",
-            context=[ticket_task]
+            context=[ticket_task] if ticket_task else None
         )
+    
+    def _make_stage(self, tasks: List[Task], stages: List[str]) -> Dict:
+        """Wrap templated tasks in a reusable crew plus the data needed to key the cache
         
-        # Create crew and execute
-        crew = Crew(
-            agents=[
-                self.classifier_agent,
-                self.bug_analyzer_agent,
-                self.feature_extractor_agent,  
-                self.ticket_creator_agent,
-                self.quality_critic_agent
-            ],
-            tasks=[classify_task, bug_analysis_task, feature_analysis_task, general_analysis_task, ticket_task, review_task],
-            process=Process.sequential,
-            verbose=True
+        stages names each task for the per-stage metrics; the crew's task
+        callback closes each task's measurement as it finishes. prompts keeps
+        each task's agent persona and template for cost estimates, and model
+        (the distinct agent models) keys the cache.
+        """
+        agents = []
+        for task in tasks:
+            if task.agent not in agents:
+                agents.append(task.agent)
+        
+        return {
+            'crew': Crew(
+                agents=agents,
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=self.verbose,
+                task_callback=self.stage_metrics.task_done
+            ),
+            'role': " | ".join(task.agent.role for task in tasks),
+            'template': "\n\n".join(task.description for task in tasks),
+            'stages': stages,
+            'model': " | ".join(dict.fromkeys(task.agent.llm.model_name for task in tasks)),
+            'models': [task.agent.llm.model_name for task in tasks],
+            'prompts': [
+                f"{task.agent.role}\n{task.agent.goal}\n{task.agent.backstory}\n\n{task.description}\n\n{task.expected_output}"
+                for task in tasks
+            ]
+        }
+    
+    def _build_stage(self, key: str, agents: Dict[str, Agent]) -> Dict:
+        """Build one pipeline stage from agents
+        
+        key is 'classify', a routed branch ('bug', 'feature' or 'general':
+        analysis, ticket and quality review), '<branch>_no_review' (without
+        the review, used when the budget runs low or the review is sampled)
+        or 'review' (stand-alone review of a finished ticket, for sampled or
+        asynchronous QA). Tasks are templates; per-item values are supplied
+        as kickoff inputs, so a stage is built once and reused for every item.
+        """
+        if key == 'classify':
+            return self._make_stage([self._build_classify_task(agents)], ['classification'])
+        if key == 'review':
+            return self._make_stage([self._build_review_task(agents)], ['quality_review'])
+        
+        branch = key[:-len('_no_review')] if key.endswith('_no_review') else key
+        if branch not in ('bug', 'feature', 'general'):
+            raise KeyError(key)
+        analysis_task = self._build_analysis_task(branch, agents)
+        ticket_task = self._build_ticket_task(agents, analysis_task)
+        if key != branch:
+            return self._make_stage([analysis_task, ticket_task], [f"{branch}_analysis", 'ticket_creation'])
+        return self._make_stage(
+            [analysis_task, ticket_task, self._build_review_task(agents, ticket_task)],
+            [f"{branch}_analysis", 'ticket_creation', 'quality_review']
+        )
+    
+    def _get_pipeline(self, tier: str = None) -> Dict[str, Dict]:
+        """Return this thread's pipeline (stage key -> stage) for a model tier
+        
+        Crews interpolate inputs into their tasks in place and agents rebuild
+        their executor on every task, so each worker thread keeps its own
+        pipeline, agents included, rather than sharing one. Stages are built
+        on first use: building one is CPU work that holds the GIL, and an
+        item only runs two of them. tier selects the agents' models (see
+        _tier_models).
+        """
+        pipelines = getattr(self._local, 'pipelines', None)
+        if pipelines is None:
+            pipelines = self._local.pipelines = {}
+        if tier not in pipelines:
+            agents = self._create_agents(self._tier_models(tier))
+            pipelines[tier] = LazyStages(lambda key: self._build_stage(key, agents))
+        return pipelines[tier]
+    
+    @staticmethod
+    def _render(template: str, inputs: Dict) -> str:
+        """Substitute {name} placeholders the same way crew inputs do"""
+        return re.sub(
+            r'\{(\w+)\}',
+            lambda match: str(inputs.get(match.group(1), match.group(0))),
+            template
         )
+    
+    def _cached_call(self, role: str, prompt: str, call, model: str = None) -> str:
+        """Return call() via the response cache, keyed on model, temperature, role and prompt"""
+        if self.cache is None:
+            self.stage_metrics.mark_executed()
+            return call()
+        
+        key = LLMResponseCache.make_key(model or self.model, self.temperature, role, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        self.stage_metrics.mark_executed()
+        result = call()
+        self.cache.put(key, result)
+        return result
+    
+    def _kickoff(self, stage: Dict, inputs: Dict) -> str:
+        """Run a pipeline stage, serving the result from the response cache when possible
+        
+        The cache key covers model, temperature, the agent roles and the
+        rendered task prompts, so any change to the prompt is a miss.
+        """
+        with self.stage_metrics.measure(stage['stages']):
+            return self._cached_call(
+                stage['role'],
+                self._render(stage['template'], inputs),
+                lambda: str(stage['crew'].kickoff(inputs=inputs)),
+                stage['model']
+            )
+    
+    def _kickoff_outputs(self, stage: Dict, inputs: Dict) -> List[str]:
+        """Run a multi-task stage and return every task's output, final one last
+        
+        The outputs are cached together (as a JSON list) so the ticket JSON
+        is available for parsing even when the run is served from cache.
+        """
+        def call():
+            final = str(stage['crew'].kickoff(inputs=inputs))
+            outputs = [task.output.raw_output if task.output else '' for task in stage['crew'].tasks]
+            outputs[-1] = final
+            return json.dumps(outputs)
+        
+        with self.stage_metrics.measure(stage['stages']):
+            raw = self._cached_call(
+                stage['role'] + " (all task outputs)",
+                self._render(stage['template'], inputs),
+                call,
+                stage['model']
+            )
+        return json.loads(raw)
+    
+    def _estimate_stage(self, stage: Dict, inputs: Dict):
+        """Tokenizer-based (prompt, completion) token estimate for one run of a stage
+        
+        Each task's prompt is its agent persona plus rendered template plus
+        CrewAI's scaffolding; later tasks also receive the previous output.
+        """
+        prompt_tokens = 0
+        for idx, template in enumerate(stage['prompts']):
+            prompt_tokens += count_tokens(self._render(template, inputs), stage['models'][idx]) + CREW_PROMPT_OVERHEAD
+            if idx:
+                prompt_tokens += self.completion_estimate
+        return prompt_tokens, self.completion_estimate * len(stage['prompts'])
+    
+    def _budget_route(self, feedback_item: Dict, branch: str, inputs: Dict, tier: str = None):
+        """Pick the branch stage and model tier that fit the token/cost budget
+        
+        Returns (stage key, tier, mode). When the run is near its limit, or
+        the full stage would push the item over its own limit, the quality
+        review is dropped; Medium/Low priority items also switch to the
+        fallback model if that is still not enough.
+        """
+        if not self.budget.enabled:
+            return branch, tier, 'full'
+        
+        pipeline = self._get_pipeline(tier)
+        run_ok = self.budget.run_state() == BUDGET_OK
+        if run_ok and self.budget.item_fits(*self._estimate_stage(pipeline[branch], inputs)):
+            return branch, tier, 'full'
+        
+        lite = f"{branch}_no_review"
+        low_priority = self._item_lane(feedback_item) == LANE_NORMAL
+        if self.fallback_model and low_priority and (
+            not run_ok or not self.budget.item_fits(*self._estimate_stage(pipeline[lite], inputs))
+        ):
+            return lite, self.fallback_model, 'no_review+fallback_model'
+        return lite, tier, 'no_review'
+    
+    def _qa_decision(self, source_id: str, category: str, priority: str = None):
+        """Whether a ticket gets the quality review, as (decision, reason)
+        
+        Skipped categories are never reviewed and always-reviewed priorities
+        always are; the rest are sampled deterministically by source_id, so
+        reruns review the same tickets. decision is None while it depends on
+        the ticket's priority and that is not known yet.
+        """
+        if category in self.qa_skip_categories:
+            return False, f"skip {category}"
+        if self.qa_sample_rate >= 1:
+            return True, 'all'
+        if priority is None:
+            return None, 'pending'
+        if priority in self.qa_always_priorities:
+            return True, f"always {priority}"
+        
+        bucket = int(hashlib.md5(str(source_id).encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF
+        if bucket < self.qa_sample_rate:
+            return True, 'sampled'
+        return False, 'not sampled'
+    
+    def _review_ticket(self, inputs: Dict, ticket_text: str, tier: str = None) -> str:
+        """Run the stand-alone quality review on a finished ticket"""
+        return self._kickoff(self._get_pipeline(tier)['review'], dict(inputs, ticket=ticket_text))
+    
+    def _submit_review(self, source_id: str, inputs: Dict, ticket_text: str, tier: str, reason: str):
+        """Queue a quality review to run in the background after the ticket is emitted"""
+        with self._lock:
+            if self.qa_executor is None:
+                self.qa_executor = ThreadPoolExecutor(max_workers=self.qa_workers, thread_name_prefix="qa-review")
+            self.qa_pending.append(
+                self.qa_executor.submit(self._background_review, source_id, inputs, ticket_text, tier, reason)
+            )
+    
+    def _background_review(self, source_id: str, inputs: Dict, ticket_text: str, tier: str, reason: str):
+        """Asynchronous review; its outcome is recorded as a qa_review log entry"""
+        self.scheduler.begin_item(LANE_BACKGROUND)
+        self.stage_metrics.begin_item(source_id)
+        self.budget.begin_item()
+        if self.budget.run_state() == BUDGET_EXHAUSTED:
+            self._count_qa('skipped', 'budget', new_ticket=False)
+            return
         
         try:
-            result = crew.kickoff()
-            
-            # Parse the result and create ticket
-            ticket = {
+            review_text = self._review_ticket(inputs, ticket_text, tier)
+            fields = self._parse_ticket_fields(ticket_text, review_text)
+            self._record_qa(source_id, reason, fields, 'async')
+        except Exception as e:
+            self._count_qa('failed', reason, new_ticket=False)
+            self._log({
+                'timestamp': datetime.now().isoformat(),
                 'source_id': source_id,
-                'source_type': feedback_item['source_type'],
-                'created_at': datetime.now().isoformat(),
-                'original_content': content[:200] + '...' if len(content) > 200 else content,
-                'processing_result': str(result)
-            }
+                'action': 'qa_review',
+                'status': 'failed',
+                'qa': reason,
+                'error': str(e)
+            })
+    
+    def wait_for_reviews(self):
+        """Block until every queued asynchronous review has finished"""
+        with self._lock:
+            pending, self.qa_pending = self.qa_pending, []
+        wait(pending)
+    
+    def _count_qa(self, outcome: str, reason: str, new_ticket=True):
+        """Tally a review outcome (deferred reviews count their ticket when queued)"""
+        with self._lock:
+            self.qa_counts['tickets'] += int(new_ticket)
+            self.qa_counts[outcome] += 1
+            self.qa_counts[f"{outcome}: {reason}"] += 1
+    
+    def _record_qa(self, source_id: str, reason: str, fields: Dict, mode: str):
+        """Count and log one completed quality review"""
+        self._count_qa('reviewed', reason, new_ticket=mode != 'async')
+        with self._lock:
+            self.qa_counts[fields['approval_status'] or 'Unparsed'] += 1
+            if fields['quality_score'] is not None:
+                self.qa_counts['scored'] += 1
+                self.qa_counts['score_total'] += fields['quality_score']
+        
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'source_id': source_id,
+            'action': 'qa_review',
+            'status': 'success',
+            'qa': reason,
+            'mode': mode,
+            'quality_score': fields['quality_score'],
+            'approval_status': fields['approval_status']
+        })
+    
+    def log_qa_summary(self):
+        """Record the review policy, how many tickets it reviewed and their outcomes"""
+        counts = self.qa_counts
+        tickets = counts['tickets']
+        reviewed = counts['reviewed']
+        reasons = ", ".join(
+            f"{key.split(': ', 1)[1]}={value}" for key, value in sorted(counts.items())
+            if key.startswith('skipped: ')
+        )
+        mean_score = counts['score_total'] / counts['scored'] if counts['scored'] else 0
+        
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'qa_summary',
+            'details': (
+                f"policy: sample {self.qa_sample_rate:.0%}, always {'/'.join(self.qa_always_priorities) or '-'}, "
+                f"skip {'/'.join(self.qa_skip_categories) or '-'}{', async' if self.qa_async else ''}; "
+                f"reviewed {reviewed} of {tickets} tickets ({reviewed / tickets * 100 if tickets else 0:.1f}%), "
+                f"skipped {counts['skipped']}" + (f" ({reasons})" if reasons else "") + f", failed {counts['failed']}; "
+                f"approved {counts['Approved']}, needs revision {counts['Needs Revision']}, mean score {mean_score:.1f}"
+            )
+        })
+    
+    def _stage_inputs(self, feedback_item: Dict) -> Dict:
+        """Kickoff inputs for an item's crews"""
+        return {
+            'source_id': feedback_item['source_id'],
+            'source_type': feedback_item['source_type'],
+            'content': feedback_item['content'],
+            'metadata': json.dumps(feedback_item['metadata'], default=str),
+            'classification': ''
+        }
+    
+    def project_cost(self, limit=None) -> Dict:
+        """Projected tokens and cost of processing the input, before any LLM call
+        
+        Every prompt an item would be sent (the fast path, or classify plus
+        the branch guessed by the keyword rules) is rendered and counted with
+        the model's tokenizer; completions are assumed to be
+        FEEDBACK_BUDGET_COMPLETION_TOKENS per task. Incremental, resume and
+        dedup skips are not taken into account, so this is an upper bound.
+        """
+        pipeline = self._get_pipeline()
+        items = prompt_tokens = completion_tokens = 0
+        
+        for feedback in islice(self.feedback_source(), limit or None):
+            items += 1
+            prediction = (self.prefilter or self.priority_rules).classify(feedback)
+            if self.prefilter and self.prefilter.is_confident(prediction):
+                if prediction['category'] in LocalClassifier.TERMINAL_CATEGORIES:
+                    continue
+                classified = True
+            else:
+                classified = False
+            
+            if self.fast_path:
+                prompt_tokens += count_tokens(self._build_fast_path_prompt(feedback), self.model)
+                completion_tokens += self.completion_estimate
+                continue
+            
+            inputs = self._stage_inputs(feedback)
+            stages = [pipeline[self.ROUTING_BRANCHES.get(prediction['category'], 'general')]]
+            if not classified:
+                stages.append(pipeline['classify'])
+            for stage in stages:
+                stage_prompt, stage_completion = self._estimate_stage(stage, inputs)
+                prompt_tokens += stage_prompt
+                completion_tokens += stage_completion
+        
+        return {
+            'items': items,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'cost_usd': round(self.budget.cost(prompt_tokens, completion_tokens), 4)
+        }
+    
+    def _build_fast_path_prompt(self, feedback_item: Dict) -> str:
+        """Single prompt that classifies the item and drafts its ticket"""
+        return f"""You triage user feedback for a mobile note-taking app.
+Classify the feedback into exactly ONE category (Bug, Feature Request, Praise,
+Complaint, Spam), assign a priority (Critical, High, Medium, Low) and write the
+ticket for it.
+
+Source ID: {feedback_item['source_id']}
+Source Type: {feedback_item['source_type']}
+Feedback: {feedback_item['content']}
+Metadata: {json.dumps(feedback_item['metadata'], default=str)}
+
+Respond with a single JSON object with these exact keys:
+ticket_title, category, priority, description, technical_details,
+recommended_action, confidence (0-100, how sure you are of the category and
+priority)."""
+    
+    def _fast_path_ticket(self, feedback_item: Dict):
+        """Run the single-call fast path; return the parsed ticket JSON or None"""
+        prompt = self._build_fast_path_prompt(feedback_item)
+        llm = self.llm.bind(response_format={"type": "json_object"})
+        with self.stage_metrics.measure(['fast_path']):
+            raw = self._cached_call(
+                "Fast Path Ticket Creator",
+                prompt,
+                lambda: llm.invoke(prompt).content
+            )
+        
+        try:
+            ticket_json = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        
+        if not isinstance(ticket_json, dict) or any(field not in ticket_json for field in self.TICKET_FIELDS):
+            return None
+        return ticket_json
+    
+    def _apply_prefilter(self, feedback_item: Dict) -> Dict:
+        """Run the local pre-classifier once per item and record its decision on the item
+        
+        Confident non-terminal predictions (e.g. clear crash reports) become
+        the item's classification so the LLM classify call is skipped.
+        """
+        if 'prefilter' in feedback_item:
+            return feedback_item['prefilter']
+        
+        prediction = self.prefilter.classify(feedback_item)
+        feedback_item['prefilter'] = prediction
+        
+        with self._lock:
+            self.prefilter_counts['seen'] += 1
+            if self.prefilter.is_confident(prediction):
+                self.prefilter_counts[prediction['category']] += 1
+        
+        if self.prefilter.is_confident(prediction) and prediction['category'] not in LocalClassifier.TERMINAL_CATEGORIES:
+            feedback_item.setdefault(
+                'classification',
+                f"Category: {prediction['category']}, Confidence: {prediction['confidence']}"
+            )
+        return prediction
+    
+    def prefiltered(self, feedback_items):
+        """Yield items after local pre-classification"""
+        for feedback in feedback_items:
+            self._apply_prefilter(feedback)
+            yield feedback
+    
+    def log_prefilter_summary(self):
+        """Record how many items the local pre-classifier handled without the LLM"""
+        seen = self.prefilter_counts['seen']
+        terminal = sum(self.prefilter_counts[category] for category in LocalClassifier.TERMINAL_CATEGORIES)
+        classified = sum(self.prefilter_counts.values()) - seen - terminal
+        skip_rate = (terminal / seen * 100) if seen else 0
+        
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'prefilter_summary',
+            'details': (
+                f"{seen} items checked, {terminal} ticketed locally ({skip_rate:.1f}%), "
+                f"{classified} classified locally, threshold {self.prefilter.threshold}"
+            )
+        })
+    
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count (~4 characters per token)"""
+        return len(text) // 4 + 1
+    
+    def _build_batch_classify_prompt(self, batch: List[Dict]) -> str:
+        """One classifier prompt covering every item in the batch"""
+        items = "\n".join(
+            json.dumps({'source_id': str(feedback['source_id']), 'feedback': feedback['content']}, ensure_ascii=False)
+            for feedback in batch
+        )
+        return f"""Classify each feedback item below into exactly ONE category:
+Bug, Feature Request, Praise, Complaint, or Spam.
+
+Items (one JSON object per line):
+{items}
+
+Respond with only a JSON array containing one object per item, with keys
+source_id (copied exactly), category and confidence (0-100)."""
+    
+    def _parse_batch_classifications(self, raw: str) -> Dict[str, str]:
+        """Map source_id -> 'Category: X, Confidence: N' from a batch response"""
+        match = re.search(r'\[.*\]', raw or '', re.DOTALL)
+        if not match:
+            return {}
+        
+        try:
+            entries = json.loads(match.group())
+        except ValueError:
+            return {}
+        
+        classifications = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or 'source_id' not in entry or 'category' not in entry:
+                continue
+            category, _ = self._parse_classification(f"Category: {entry['category']}")
+            confidence = self._to_int(entry.get('confidence'))
+            classifications[str(entry['source_id'])] = f"Category: {category}, Confidence: {confidence}"
+        return classifications
+    
+    def _classify_batch(self, batch: List[Dict]):
+        """Classify a batch with one LLM call; unmatched items are left for per-item classification"""
+        prompt = self._build_batch_classify_prompt(batch)
+        llm = self._llm_for(self._tier_models(self.TIER_FAST)['classifier_agent'])
+        try:
+            with self.stage_metrics.measure(['batch_classification']):
+                raw = self._cached_call(
+                    "Feedback Classifier (batch)",
+                    prompt,
+                    lambda: llm.invoke(prompt).content,
+                    llm.model_name
+                )
+            classifications = self._parse_batch_classifications(raw)
+        except Exception as e:
+            classifications = {}
+            self._log({
+                'timestamp': datetime.now().isoformat(),
+                'action': 'batch_classify_error',
+                'status': 'failed',
+                'error': str(e)
+            })
+        
+        matched = 0
+        for feedback in batch:
+            classification = classifications.get(str(feedback['source_id']))
+            if classification:
+                feedback['classification'] = classification
+                matched += 1
+        
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'batch_classified',
+            'details': f"{len(batch)} items in 1 call, {matched} matched, {len(batch) - matched} retried individually"
+        })
+    
+    def _handled_locally(self, feedback_item: Dict) -> bool:
+        """True if the pre-classifier will ticket this item without any LLM call"""
+        prediction = feedback_item.get('prefilter')
+        return bool(self.prefilter and prediction and self.prefilter.handles_locally(prediction))
+    
+    def batch_classified(self, feedback_items):
+        """Yield items, in input order, after classifying them in token-budgeted batches
+        
+        Items that are already classified upstream (e.g. by the local
+        pre-classifier) ride along with the current batch without joining it.
+        """
+        pending = []
+        batch = []
+        batch_tokens = 0
+        
+        for feedback in feedback_items:
+            if feedback.get('classification') or self._handled_locally(feedback):
+                if batch:
+                    pending.append(feedback)
+                else:
+                    yield feedback
+                continue
+            
+            tokens = self._estimate_tokens(feedback['content'])
+            if batch and (batch_tokens + tokens > self.batch_token_budget or len(batch) >= self.batch_max_items):
+                self._classify_batch(batch)
+                yield from pending
+                pending, batch, batch_tokens = [], [], 0
+            batch.append(feedback)
+            pending.append(feedback)
+            batch_tokens += tokens
+        
+        if batch:
+            self._classify_batch(batch)
+        yield from pending
+    
+    def _make_ticket(self, feedback_item: Dict, processing_result: str, fields: Dict = None) -> Dict:
+        """Build the output ticket row for a processed item
+        
+        fields are the parsed typed columns (category, priority,
+        quality_score, approval_status).
+        """
+        content = feedback_item['content']
+        ticket = {
+            'source_id': feedback_item['source_id'],
+            'source_type': feedback_item['source_type'],
+            'created_at': datetime.now().isoformat()
+        }
+        ticket.update(fields or self._parse_ticket_fields(processing_result))
+        ticket['original_content'] = content[:200] + '...' if len(content) > 200 else content
+        ticket['processing_result'] = processing_result
+        
+        if self.dedup:
+            duplicates = [source_id for source_id, _ in self.duplicates.get(feedback_item['source_id'], [])]
+            ticket['duplicate_source_ids'] = ";".join(str(source_id) for source_id in duplicates)
+            ticket['report_count'] = 1 + len(duplicates)
+        
+        return ticket
+    
+    def build_clusters(self, feedback_items, limit=None) -> int:
+        """Cluster near-duplicate feedback in one streaming pass; return the cluster count
+        
+        Only signatures of representatives and the member ids (with content
+        hashes, for the manifest) are kept, not the feedback itself. With a
+        limit the pass stops once limit clusters exist: only their
+        representatives will be processed, so later items are not read
+        (duplicates among them are picked up by the next run).
+        """
+        deduplicator = FeedbackDeduplicator(
+            threshold=self.dedup_threshold,
+            min_jaccard=self.dedup_min_jaccard,
+            min_shingles=self.dedup_min_words
+        )
+        self.duplicates = {}
+        
+        for feedback in feedback_items:
+            representative = deduplicator.add(feedback['source_id'], feedback['content'])
+            if representative != feedback['source_id']:
+                self.duplicates.setdefault(representative, []).append(
+                    (feedback['source_id'], self._content_hash(feedback))
+                )
+            elif limit and deduplicator.cluster_count >= limit:
+                break
+        
+        summary = deduplicator.summary()
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'dedup_clusters',
+            'details': (
+                f"{summary['items']} items in {summary['clusters']} clusters, "
+                f"{summary['duplicates']} duplicates folded into existing tickets"
+            )
+        })
+        self.representative_of = deduplicator.representative_of
+        return summary['clusters']
+    
+    def representatives(self, feedback_items):
+        """Yield only the representative item of each duplicate cluster"""
+        for feedback in feedback_items:
+            if self.representative_of.get(feedback['source_id'], feedback['source_id']) == feedback['source_id']:
+                yield feedback
+    
+    def _item_lane(self, feedback_item: Dict) -> int:
+        """Rate-limiter lane for an item: Critical-looking feedback is dispatched first"""
+        prediction = feedback_item.get('prefilter') or self.priority_rules.classify(feedback_item)
+        if prediction['priority'] == 'Critical':
+            return LANE_CRITICAL
+        if prediction['priority'] == 'High':
+            return LANE_HIGH
+        return LANE_NORMAL
+    
+    def process_feedback_item(self, feedback_item: Dict) -> Dict:
+        """Process a single feedback item through the routed agent pipeline
+        
+        The classifier runs first on its own; its parsed category selects a
+        single analyzer (bug, feature or general) so only that branch's task
+        runs and feeds the ticket creator. With the fast path enabled a single
+        structured-output call is tried first and the crew only runs when it
+        fails or reports low confidence.
+        """
+        
+        source_id = feedback_item['source_id']
+        self.scheduler.begin_item(self._item_lane(feedback_item))
+        self.stage_metrics.begin_item(source_id)
+        self.budget.begin_item()
+        
+        try:
+            if self.prefilter:
+                self._apply_prefilter(feedback_item)
+                if self._handled_locally(feedback_item):
+                    prediction = feedback_item['prefilter']
+                    ticket_json = self.prefilter.build_ticket(feedback_item, prediction)
+                    with self._lock:
+                        self.branch_counts['prefilter'] += 1
+                    
+                    self._log({
+                        'timestamp': datetime.now().isoformat(),
+                        'source_id': source_id,
+                        'action': 'processed',
+                        'status': 'success',
+                        'category': prediction['category'],
+                        'confidence': prediction['confidence'],
+                        'branch': 'prefilter',
+                        'llm_calls': 0
+                    })
+                    return self._make_ticket(
+                        feedback_item,
+                        json.dumps(ticket_json, indent=2),
+                        self._parse_ticket_fields(ticket_json)
+                    )
+            
+            if self.budget.run_state() == BUDGET_EXHAUSTED:
+                self.budget.count('skipped_items')
+                self._log({
+                    'timestamp': datetime.now().isoformat(),
+                    'source_id': source_id,
+                    'action': 'budget_skipped',
+                    'status': 'skipped',
+                    'details': self.budget.summary()
+                })
+                return None
+            
+            if self.fast_path:
+                ticket_json = self._fast_path_ticket(feedback_item)
+                confidence = self._to_int(ticket_json.get('confidence')) if ticket_json else 0
+                
+                if ticket_json and confidence >= self.fast_path_min_confidence:
+                    with self._lock:
+                        self.branch_counts['fast_path'] += 1
+                    
+                    self._log({
+                        'timestamp': datetime.now().isoformat(),
+                        'source_id': source_id,
+                        'action': 'processed',
+                        'status': 'success',
+                        'category': ticket_json.get('category'),
+                        'confidence': confidence,
+                        'branch': 'fast_path',
+                        'llm_calls': 1,
+                        **self.scheduler.item_stats(),
+                        **self.budget.item_stats()
+                    })
+                    return self._make_ticket(
+                        feedback_item,
+                        json.dumps(ticket_json, indent=2),
+                        self._parse_ticket_fields(ticket_json)
+                    )
+                
+                self._log({
+                    'timestamp': datetime.now().isoformat(),
+                    'source_id': source_id,
+                    'action': 'fast_path_fallback',
+                    'details': 'unparseable response' if not ticket_json else f"confidence {confidence}"
+                })
+            
+            tiered = self.tiered_routing
+            inputs = self._stage_inputs(feedback_item)
+            
+            # Stage 1: classification (skipped when the batch stage already classified the item)
+            classification = feedback_item.get('classification')
+            llm_calls = 2
+            if not classification:
+                classification = self._kickoff(self._get_pipeline(self.TIER_FAST if tiered else None)['classify'], inputs)
+                llm_calls += 1
+            category, confidence = self._parse_classification(classification)
+            branch = self.ROUTING_BRANCHES.get(category, 'general')
+            
+            # Tiered routing: confident items stay on the fast tier, the rest
+            # escalate to the strong model
+            tier = None
+            if tiered:
+                tier = self.TIER_FAST if confidence >= self.escalation_confidence else None
+                with self._lock:
+                    self.tier_counts['fast' if tier else 'escalated'] += 1
+            
+            # Stage 2: routed analysis, ticket and review (the review is
+            # dropped, or a cheaper model used, when the budget runs low)
+            inputs['classification'] = classification
+            stage_key, tier, budget_mode = self._budget_route(feedback_item, branch, inputs, tier)
+            if budget_mode != 'full':
+                self.budget.count('degraded_items')
+                review, qa_reason = False, 'budget'
+            else:
+                review, qa_reason = self._qa_decision(source_id, category)
+            
+            # The review only runs inside the crew when it is already decided
+            # and synchronous; otherwise it runs on its own once the ticket exists
+            if not (review and not self.qa_async):
+                stage_key = f"{branch}_no_review"
+            outputs = self._kickoff_outputs(self._get_pipeline(tier)[stage_key], inputs)
+            ticket_text = outputs[1]
+            review_text = outputs[2] if len(outputs) > 2 else None
+            with self._lock:
+                self.branch_counts[branch] += 1
+            
+            # Parse the ticket and review JSON into typed columns and create ticket
+            fields = self._parse_ticket_fields(ticket_text, review_text, default_category=category)
+            if review is None:
+                review, qa_reason = self._qa_decision(source_id, category, fields['priority'])
+            if review and review_text is None:
+                if self.qa_async:
+                    self._submit_review(source_id, inputs, ticket_text, tier, qa_reason)
+                else:
+                    review_text = self._review_ticket(inputs, ticket_text, tier)
+                    fields = self._parse_ticket_fields(ticket_text, review_text, default_category=category)
+            if review_text is not None:
+                llm_calls += 1
+                self._record_qa(source_id, qa_reason, fields, 'inline')
+            else:
+                fields['approval_status'] = 'Review Pending' if review else 'Not Reviewed'
+                self._count_qa('deferred' if review else 'skipped', qa_reason)
+            ticket = self._make_ticket(feedback_item, review_text or ticket_text, fields)
             
             # Log processing
             log_entry = {
                 'timestamp': datetime.now().isoformat(),
                 'source_id': source_id,
                 'action': 'processed',
-                'status': 'success'
+                'status': 'success',
+                'category': category,
+                'confidence': confidence,
+                'branch': branch,
+                'llm_calls': llm_calls,
+                'model_tier': tier or 'strong',
+                'budget_mode': budget_mode,
+                'qa': qa_reason,
+                **self.scheduler.item_stats(),
+                **self.budget.item_stats()
             }
-            self.processing_logs.append(log_entry)
+            self._log(log_entry)
             
             return ticket
             
@@ -358,53 +1574,359 @@ class FeedbackAnalysisSystem:
                 'source_id': source_id,
                 'action': 'processing_error',
                 'status': 'failed',
-                'error': str(e)
+                'error': str(e),
+                **self.scheduler.item_stats(),
+                **self.budget.item_stats()
             }
-            self.processing_logs.append(log_entry)
+            self._log(log_entry)
             
             return None
     
-    def process_all_feedback(self, limit=None):
-        """Process all feedback items"""
-        feedback_to_process = self.all_feedback[:limit] if limit else self.all_feedback
+    def _count_pending(self, limit=None):
+        """Count (pending, unchanged) items for an incremental run in one streaming pass"""
+        pending = skipped = 0
+        for feedback in self.feedback_source():
+            if self.is_unchanged(feedback):
+                skipped += 1
+                continue
+            pending += 1
+            if limit and pending >= limit:
+                break
+        return pending, skipped
+    
+    def _log(self, log_entry: Dict):
+        """Append a processing log entry (safe to call from worker threads)"""
+        with self._lock:
+            self.processing_logs.append(log_entry)
+        if self.journal:
+            self.journal.append('log', log_entry)
+    
+    def _ticket_columns(self) -> List[str]:
+        """Column order of generated_tickets.csv"""
+        columns = list(self.TICKET_COLUMNS)
+        if self.dedup:
+            columns += ['duplicate_source_ids', 'report_count']
+        return columns
+    
+    def open_ticket_writer(self, merge=False):
+        """Start streaming tickets to the output CSV (no-op if already open or disabled)"""
+        if not self.stream_output or (self.ticket_writer and self.ticket_writer.is_open):
+            return
+        writer_class = StreamingTicketWriter if self.output_format == 'csv' else ArrowTicketWriter
+        self.ticket_writer = writer_class(
+            self.output_tickets_path,
+            self._ticket_columns(),
+            merge=merge,
+            flush_every=self.output_flush_every,
+            chunksize=self.chunksize,
+            dtypes=self.TICKET_COLUMN_TYPES
+        )
+        self.ticket_writer.open()
+    
+    def _store_ticket(self, ticket: Dict):
+        """Send a ticket to the streaming writer, or keep it in memory for save_results"""
+        self.tickets_generated += 1
+        if self.ticket_writer and self.ticket_writer.is_open:
+            self.ticket_writer.write(ticket)
+        else:
+            self.generated_tickets.append(ticket)
+    
+    def open_checkpoint(self, resume=False) -> set:
+        """Open the checkpoint journal; on resume reload its tickets and logs
+        
+        Returns the source_ids that already have a ticket so they can be
+        skipped. Without resume any earlier journal is discarded. Entries held
+        in memory before this call (e.g. the data_loaded log) are written to
+        the journal so it holds the complete state of the run.
+        """
+        completed = set()
+        if not self.journal:
+            return completed
+        
+        pending_logs = list(self.processing_logs)
+        pending_tickets = list(self.generated_tickets)
+        if resume and self.journal.exists():
+            logs = []
+            for record in self.journal.iter_records():
+                if record.get('type') == 'log':
+                    logs.append(record['data'])
+                elif record.get('type') == 'ticket' and record['data']['source_id'] not in completed:
+                    ticket = record['data']
+                    completed.add(ticket['source_id'])
+                    self.source_counts[ticket['source_type']] += 1
+                    self.manifest.update(record.get('hashes', {}))
+                    self._store_ticket(ticket)
+            self.processing_logs = logs + pending_logs
+            self.resumed_count = len(completed)
+            self.items_attempted += len(completed)
+        
+        self.journal.open(resume=resume)
+        for log_entry in pending_logs:
+            self.journal.append('log', log_entry)
+        for ticket in pending_tickets:
+            self.journal.append('ticket', ticket)
+        
+        if resume:
+            self._log({
+                'timestamp': datetime.now().isoformat(),
+                'action': 'checkpoint_resume',
+                'details': f"Resumed with {len(completed)} tickets from {self.journal.path}"
+            })
+            print(f"♻️ Resuming: {len(completed)} items already completed")
+        
+        return completed
+    
+    def iter_processed(self, feedback_items, max_workers=None, should_stop=None):
+        """Run process_feedback_item over feedback_items, yielding (feedback, ticket)
+        
+        With max_workers > 1 up to that many pipelines run concurrently on a
+        thread pool. At most max_workers items are in flight at any time and
+        results are released strictly in input order, so output stays
+        deterministic regardless of completion order. should_stop, if given,
+        is checked before each item is started; once it returns True no new
+        items start, but those already in flight still finish and are yielded.
+        """
+        max_workers = max(1, max_workers or self.max_workers)
+        should_stop = should_stop or (lambda: False)
+        
+        if max_workers == 1:
+            for feedback in feedback_items:
+                if should_stop():
+                    return
+                yield feedback, self.process_feedback_item(feedback)
+            return
+        
+        items = iter(feedback_items)
+        in_flight = {}
+        completed = {}
+        next_submit = 0
+        next_release = 0
+        exhausted = False
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                while not exhausted and len(in_flight) < max_workers:
+                    if should_stop():
+                        exhausted = True
+                        break
+                    feedback = next(items, None)
+                    if feedback is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(self.process_feedback_item, feedback)
+                    in_flight[future] = (next_submit, feedback)
+                    next_submit += 1
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, feedback = in_flight.pop(future)
+                    completed[idx] = (feedback, future.result())
+                
+                while next_release in completed:
+                    yield completed.pop(next_release)
+                    next_release += 1
+    
+    def process_all_feedback(self, limit=None, max_workers=None, progress_callback=None, incremental=None, resume=None,
+                             should_stop=None):
+        """Process all feedback items
+        
+        progress_callback, if given, is called as (done, total, feedback, ticket)
+        after each item in input order. should_stop, if given, is polled before
+        each item starts; when it returns True the items already in flight are
+        finished and recorded and the run ends early. In incremental mode items whose
+        source_id and content hash are already in the manifest are skipped.
+        With resume, items already ticketed in the checkpoint journal are
+        skipped and limit counts them, so rerunning the interrupted call
+        finishes the same run. Returns the number of items processed.
+        """
+        incremental = self.incremental if incremental is None else incremental
+        resume = self.resume if resume is None else resume
+        if self.store_path and self.store is None:
+            self.store = TicketStore(self.store_path)
+        limit = limit or None
+        if incremental:
+            self.load_manifest()
+        self.open_ticket_writer(merge=incremental)
+        completed = self.open_checkpoint(resume=resume)
+        
+        feedback_to_process = self.feedback_source()
+        if incremental:
+            total, self.skipped_unchanged = self._count_pending(limit)
+            feedback_to_process = self.filter_changed(feedback_to_process)
+            self._log({
+                'timestamp': datetime.now().isoformat(),
+                'action': 'incremental_filter',
+                'details': f"Skipped {self.skipped_unchanged} unchanged items, {total} new or changed"
+            })
+        else:
+            total = min(limit, self.total_feedback) if limit else self.total_feedback
+        
+        if self.dedup:
+            source = self.feedback_source()
+            clusters = self.build_clusters(self.filter_changed(source) if incremental else source, limit)
+            feedback_to_process = self.representatives(feedback_to_process)
+            total = min(limit, clusters) if limit else clusters
+        
+        if completed:
+            feedback_to_process = (
+                feedback for feedback in feedback_to_process
+                if feedback['source_id'] not in completed
+            )
+            total = max(0, total - len(completed))
+            limit = max(0, limit - len(completed)) if limit is not None else None
+        
+        # islice stops reading the CSV stream as soon as the limit is reached
+        if limit is not None:
+            feedback_to_process = islice(feedback_to_process, limit)
+        if self.prefilter:
+            feedback_to_process = self.prefiltered(feedback_to_process)
+        if self.batch_classify:
+            feedback_to_process = self.batch_classified(feedback_to_process)
+        self.items_attempted += total
+        max_workers = max(1, max_workers or self.max_workers)
         
         print(f"\n{'='*60}")
-        print(f"Processing {len(feedback_to_process)} feedback items...")
+        print(f"Processing {total} feedback items ({max_workers} worker(s))...")
         print(f"{'='*60}\n")
         
-        for idx, feedback in enumerate(feedback_to_process, 1):
-            print(f"\n[{idx}/{len(feedback_to_process)}] Processing {feedback['source_id']}...")
-            
-            ticket = self.process_feedback_item(feedback)
+        processed = self.iter_processed(feedback_to_process, max_workers=max_workers, should_stop=should_stop)
+        done = 0
+        for idx, (feedback, ticket) in enumerate(processed, 1):
+            done = idx
+            print(f"\n[{idx}/{total}] Processed {feedback['source_id']}")
             
+            self.source_counts[feedback['source_type']] += 1
+            content_hash = self._content_hash(feedback)
+            if self.store is not None:
+                self.store.record_item(feedback, content_hash, ticket)
             if ticket:
-                self.generated_tickets.append(ticket)
+                self._store_ticket(ticket)
+                hashes = {feedback['source_id']: content_hash}
+                hashes.update(self.duplicates.get(feedback['source_id'], []))
+                self.manifest.update(hashes)
+                if self.journal:
+                    self.journal.append('ticket', ticket, hashes=hashes)
                 print(f"✅ Ticket created for {feedback['source_id']}")
             else:
                 print(f"❌ Failed to create ticket for {feedback['source_id']}")
+            
+            if progress_callback:
+                progress_callback(idx, total, feedback, ticket)
+        
+        if should_stop and should_stop() and done < total:
+            print(f"⏹️ Stopped after {done} of {total} items")
+            self._log({
+                'timestamp': datetime.now().isoformat(),
+                'action': 'processing_stopped',
+                'details': f"Stopped on request after {done} of {total} items"
+            })
+        
+        # Asynchronous reviews finish (and are journaled) before the run is summarized
+        self.wait_for_reviews()
+        
+        self.log_routing_summary()
+        if self.qa_counts:
+            self.log_qa_summary()
+        if self.prefilter:
+            self.log_prefilter_summary()
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'rate_limit_summary',
+            'details': self.scheduler.summary()
+        })
+        self.log_stage_summary()
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'budget_summary',
+            'details': self.budget.summary()
+        })
         
         print(f"\n{'='*60}")
-        print(f"Processing complete! {len(self.generated_tickets)} tickets generated.")
+        print(f"Processing complete! {self.tickets_generated} tickets generated.")
         print(f"{'='*60}\n")
+        
+        return total
+    
+    def log_cost_projection(self, limit=None) -> Dict:
+        """Print and log the projected cost of the run"""
+        projection = self.project_cost(limit)
+        details = (
+            f"~${projection['cost_usd']:.2f} for {projection['items']} items "
+            f"({projection['prompt_tokens']}+{projection['completion_tokens']} tokens, {self.model})"
+        )
+        print(f"💰 Projected cost: {details}")
+        if self.budget.run_usd and projection['cost_usd'] > self.budget.run_usd:
+            print(f"⚠️ Projection exceeds the ${self.budget.run_usd:.2f} budget; work will be cut back as it is reached")
+        
+        self._log({
+            'timestamp': datetime.now().isoformat(),
+            'action': 'cost_projection',
+            'details': details
+        })
+        return projection
     
-    def save_results(self):
-        """Save all results to CSV files"""
+    def log_routing_summary(self):
+        """Record how many items (and analyzer calls) went down each branch"""
+        log_entry = {
+            'timestamp': datetime.now().isoformat(),
+            'action': 'routing_summary',
+            'details': ", ".join(
+                f"{branch}={self.branch_counts[branch]}"
+                for branch in ['bug', 'feature', 'general'] + sorted(
+                    set(self.branch_counts) - {'bug', 'feature', 'general'}
+                )
+            ) + (
+                f"; fast tier={self.tier_counts['fast']}, escalated={self.tier_counts['escalated']} "
+                f"(threshold {self.escalation_confidence})"
+                if self.tier_counts else ""
+            )
+        }
+        self._log(log_entry)
+    
+    def save_results(self, merge=None):
+        """Save all results to CSV files
+        
+        With merge (the default in incremental mode) new tickets replace any
+        existing rows for the same source_id in generated_tickets.csv, and
+        logs and metrics are appended instead of overwritten. Tickets and
+        logs are read back from the checkpoint journal when one is open, and
+        the journal is removed once everything is written. With the ticket
+        store enabled the run's logs, metrics and quality reviews are also
+        recorded there (tickets are stored as each item completes).
+        """
+        merge = self.incremental if merge is None else merge
         try:
+            if self.journal and self.journal.is_open:
+                tickets, self.processing_logs, _ = self.journal.load(include_tickets=not self.ticket_writer)
+                if not self.ticket_writer:
+                    self.generated_tickets = tickets
+            
             # Save tickets
-            if self.generated_tickets:
+            if self.ticket_writer:
+                self.ticket_writer.close()
+                self.ticket_writer = None
+                print(f"✅ Saved tickets to {self.output_tickets_path}")
+            elif self.generated_tickets:
                 tickets_df = pd.DataFrame(self.generated_tickets)
-                tickets_df.to_csv(self.output_tickets_path, index=False)
+                if merge and os.path.exists(self.output_tickets_path):
+                    existing_df = read_table(self.output_tickets_path)
+                    existing_df = existing_df[~existing_df['source_id'].isin(tickets_df['source_id'])]
+                    tickets_df = pd.concat([existing_df, tickets_df], ignore_index=True)
+                write_table(tickets_df, self.output_tickets_path)
                 print(f"✅ Saved tickets to {self.output_tickets_path}")
             
             # Save processing logs
             if self.processing_logs:
                 logs_df = pd.DataFrame(self.processing_logs)
-                logs_df.to_csv(self.processing_log_path, index=False)
+                self._write_table(logs_df, self.processing_log_path, append=merge)
                 print(f"✅ Saved logs to {self.processing_log_path}")
             
             # Calculate and save metrics
-            total_processed = len(self.generated_tickets)
-            total_feedback = len(self.all_feedback)
+            total_processed = self.tickets_generated
+            total_feedback = self.items_attempted
             success_rate = (total_processed / total_feedback * 100) if total_feedback > 0 else 0
             
             metrics = {
@@ -412,33 +1934,98 @@ class FeedbackAnalysisSystem:
                 'total_feedback': [total_feedback],
                 'tickets_generated': [total_processed],
                 'success_rate': [f"{success_rate:.2f}%"],
-                'reviews_processed': [len(self.reviews_data)],
-                'emails_processed': [len(self.emails_data)]
+                'reviews_processed': [self.source_counts['app_review']],
+                'emails_processed': [self.source_counts['support_email']],
+                'skipped_unchanged': [self.skipped_unchanged],
+                'cache_hits': [self.cache.hits if self.cache else 0],
+                'cache_misses': [self.cache.misses if self.cache else 0]
             }
             
             metrics_df = pd.DataFrame(metrics)
-            metrics_df.to_csv(self.metrics_path, index=False)
+            self._write_table(metrics_df, self.metrics_path, append=merge)
             print(f"✅ Saved metrics to {self.metrics_path}")
+            self.save_stage_metrics(append=merge)
+            
+            if self.store is not None:
+                self.store.record_run(self.processing_logs, metrics_df.iloc[0].to_dict())
+                print(f"✅ Saved logs, metrics and reviews to {self.store.path}")
+            
+            # Record what has been ticketed for the next incremental run
+            if self.tickets_generated:
+                self.save_manifest()
+            
+            if self.journal:
+                self.journal.remove()
             
         except Exception as e:
             print(f"❌ Error saving results: {e}")
+        
+        finally:
+            if self.store is not None:
+                self.store.close()
+                self.store = None
     
-    def run(self, limit=None):
+    def log_stage_summary(self):
+        """Record per-stage latency percentiles and token use"""
+        for row in self.stage_metrics.summary():
+            self._log({
+                'timestamp': datetime.now().isoformat(),
+                'action': 'stage_summary',
+                'details': (
+                    f"{row['stage']}: {row['count']} tasks, p50 {row['p50_ms']:.0f} ms, "
+                    f"p95 {row['p95_ms']:.0f} ms, p99 {row['p99_ms']:.0f} ms, "
+                    f"{row['prompt_tokens']}+{row['completion_tokens']} tokens, "
+                    f"{row['retries']} retries, {row['cache_hits']} cache hits"
+                )
+            })
+    
+    def save_stage_metrics(self, append=False):
+        """Write the per-stage summary to stage_metrics and, if configured, Prometheus text"""
+        rows = self.stage_metrics.summary()
+        if not rows:
+            return
+        
+        timestamp = datetime.now().isoformat()
+        stage_df = pd.DataFrame([{'timestamp': timestamp, **row} for row in rows])
+        self._write_table(stage_df, self.stage_metrics_path, append=append)
+        print(f"✅ Saved stage metrics to {self.stage_metrics_path}")
+        
+        if self.prometheus_path:
+            os.makedirs(os.path.dirname(self.prometheus_path) or ".", exist_ok=True)
+            with open(self.prometheus_path, 'w') as f:
+                f.write(self.stage_metrics.to_prometheus())
+            print(f"✅ Saved Prometheus metrics to {self.prometheus_path}")
+    
+    def _write_table(self, df, path, append=False):
+        """Write df to path in the output format, appending to an existing file when requested"""
+        write_table(df, path, append=append)
+    
+    def run(self, limit=None, max_workers=None, incremental=None, resume=None):
         """Run the complete system"""
+        if incremental is not None:
+            self.incremental = incremental
+        if resume is not None:
+            self.resume = resume
+        
         print("\n" + "="*60)
         print("INTELLIGENT USER FEEDBACK ANALYSIS SYSTEM")
         print("="*60 + "\n")
         
         # Load data
         print("📂 Loading feedback data...")
-        if not self.load_data():
+        if not self.load_data(limit):
             print("❌ Failed to load data. Exiting.")
             return
         
-        print(f"✅ Loaded {len(self.all_feedback)} total feedback items\n")
+        counted = f" (counted up to the limit of {limit})" if limit else ""
+        print(f"✅ Loaded {self.total_feedback} total feedback items{counted}\n")
+        
+        # Projected cost (FEEDBACK_PROJECT_COST=1, or whenever a budget is set)
+        if self.project_costs or self.budget.enabled:
+            self.log_cost_projection(limit)
         
         # Process feedback
-        self.process_all_feedback(limit=limit)
+        self.process_all_feedback(limit=limit, max_workers=max_workers)
         
         # Save results
         print("\n💾 Saving results...")
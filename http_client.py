@@ -0,0 +1,55 @@
+"""
+Shared HTTP Client
+One pooled keep-alive httpx client (optionally HTTP/2) for all LLM traffic
+"""
+
+import os
+import warnings
+
+import httpx
+
+from rate_limiter import AsyncRateLimitedTransport, RateLimitedTransport, RateLimitScheduler
+
+try:
+    import h2  # noqa: F401  (httpx only needs it importable for HTTP/2)
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+def _pool_settings(http2=None, max_connections=None, max_keepalive_connections=None, keepalive_expiry=None):
+    """Resolve pool settings from arguments, falling back to FEEDBACK_HTTP_* env vars"""
+    if http2 is None:
+        http2 = os.getenv("FEEDBACK_HTTP2", "0") == "1"
+    if http2 and not HAS_HTTP2:
+        warnings.warn("HTTP/2 requested but the h2 package is not installed (pip install httpx[http2]); using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections or int(os.getenv("FEEDBACK_HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=max_keepalive_connections or int(os.getenv("FEEDBACK_HTTP_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=keepalive_expiry or float(os.getenv("FEEDBACK_HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+    return http2, limits
+
+
+def build_http_client(scheduler: RateLimitScheduler = None, timeout=60.0, verify=True, **pool_options) -> httpx.Client:
+    """Pooled keep-alive client; wrapped in the rate limiter when a scheduler is given
+
+    pool_options are http2, max_connections, max_keepalive_connections and
+    keepalive_expiry (each defaults to its FEEDBACK_HTTP_* env var).
+    """
+    http2, limits = _pool_settings(**pool_options)
+    transport = httpx.HTTPTransport(http2=http2, limits=limits, verify=verify)
+    if scheduler is not None:
+        transport = RateLimitedTransport(scheduler, transport)
+    return httpx.Client(transport=transport, timeout=timeout)
+
+
+def build_async_http_client(scheduler: RateLimitScheduler = None, timeout=60.0, verify=True, **pool_options) -> httpx.AsyncClient:
+    """Async version of build_http_client with the same pool settings"""
+    http2, limits = _pool_settings(**pool_options)
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, verify=verify)
+    if scheduler is not None:
+        transport = AsyncRateLimitedTransport(scheduler, transport)
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
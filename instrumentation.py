@@ -0,0 +1,233 @@
+"""
+Per-Stage Instrumentation
+Wall time, tokens, retries and cache status for every pipeline task, with percentile and Prometheus export
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+try:
+    from opentelemetry import trace
+    HAS_OTEL = True
+except ImportError:
+    HAS_OTEL = False
+
+
+# Order used when reporting stages
+STAGE_ORDER = [
+    'batch_classification', 'fast_path', 'classification', 'bug_analysis',
+    'feature_analysis', 'general_analysis', 'ticket_creation', 'quality_review'
+]
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """LangChain callback that reports each LLM call's token usage to its listeners
+
+    Listeners are called as listener(prompt_tokens, completion_tokens, model)
+    on the calling thread. Uses the usage reported by the API and falls back
+    to a four-characters-per-token estimate when a (streamed) response
+    carries none.
+    """
+
+    def __init__(self, *listeners):
+        self.listeners = list(listeners)
+        self._local = threading.local()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._local.prompt_chars = sum(len(str(message.content)) for batch in messages for message in batch)
+        self._remember_model(kwargs)
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._local.prompt_chars = sum(len(prompt) for prompt in prompts)
+        self._remember_model(kwargs)
+
+    def _remember_model(self, kwargs):
+        """Requested model, for responses that do not name one (e.g. inside CrewAI agents)"""
+        params = kwargs.get('invocation_params') or {}
+        self._local.model = params.get('model_name') or params.get('model')
+
+    def on_llm_end(self, response, **kwargs):
+        llm_output = response.llm_output or {}
+        usage = llm_output.get('token_usage') or {}
+        prompt_tokens = usage.get('prompt_tokens')
+        completion_tokens = usage.get('completion_tokens')
+        if prompt_tokens is None:
+            prompt_tokens = getattr(self._local, 'prompt_chars', 0) // 4
+        if completion_tokens is None:
+            completion_tokens = sum(
+                len(generation.text) for generations in response.generations for generation in generations
+            ) // 4
+        for listener in self.listeners:
+            listener(prompt_tokens, completion_tokens, llm_output.get('model_name') or getattr(self._local, 'model', None))
+
+
+class StageMetrics:
+    """Collects one sample per pipeline task and aggregates them per stage
+
+    A stage measurement covers one or more sequential tasks (a crew). Crew
+    task callbacks close each task as it finishes; tasks that never ran
+    because the whole stage came from the response cache are recorded as
+    cache hits. With a tracer, every sample is also emitted as a span.
+    """
+
+    def __init__(self, scheduler=None, cache_enabled=True, tracer=None):
+        self.scheduler = scheduler
+        self.cache_enabled = cache_enabled
+        self.tracer = tracer
+        self._samples = defaultdict(list)
+        self._totals = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def otel_tracer(cls):
+        """OpenTelemetry tracer when the SDK is installed, else None"""
+        return trace.get_tracer("feedback_analysis_system") if HAS_OTEL else None
+
+    def begin_item(self, source_id):
+        """Tag the calling thread's following samples with an item id"""
+        self._local.source_id = source_id
+
+    def add_tokens(self, prompt_tokens: int, completion_tokens: int, model: str = None):
+        """Credit tokens to the task currently running on this thread (token-usage listener)"""
+        self._local.prompt_tokens = getattr(self._local, 'prompt_tokens', 0) + prompt_tokens
+        self._local.completion_tokens = getattr(self._local, 'completion_tokens', 0) + completion_tokens
+
+    def mark_executed(self):
+        """Note that the current stage called the LLM rather than the cache"""
+        self._local.executed = True
+
+    def _retries(self) -> int:
+        return self.scheduler.item_stats()['retries'] if self.scheduler else 0
+
+    def _start_task(self):
+        """Snapshot counters at the start of the next task"""
+        self._local.task_start = time.time()
+        self._local.prompt_tokens = 0
+        self._local.completion_tokens = 0
+        self._local.retries_start = self._retries()
+
+    @contextmanager
+    def measure(self, stages: List[str]):
+        """Measure a stage made of the given sequential task names"""
+        self._local.pending = list(stages)
+        self._local.executed = False
+        self._start_task()
+        try:
+            yield
+        except Exception:
+            self._finish_remaining('error')
+            raise
+        if self._local.executed:
+            self._finish_remaining('miss' if self.cache_enabled else 'off')
+        else:
+            self._finish_remaining('hit')
+
+    def task_done(self, _task_output=None):
+        """Crew task_callback: close the task that just finished"""
+        pending = getattr(self._local, 'pending', None)
+        if pending:
+            self._record(pending.pop(0), 'miss' if self.cache_enabled else 'off')
+            self._start_task()
+
+    def _finish_remaining(self, cache_status: str):
+        """Record tasks not closed by a callback (cache hits, errors, single-call stages)"""
+        pending = self._local.pending
+        if not pending:
+            return
+        # Split the remaining time and tokens evenly across the unfinished tasks
+        share = len(pending)
+        for stage in pending:
+            self._record(stage, cache_status, share)
+        self._local.pending = []
+
+    def _record(self, stage: str, cache_status: str, share=1):
+        """Store one task sample (and emit its span)"""
+        end = time.time()
+        start = self._local.task_start
+        wall_ms = (end - start) * 1000 / share
+        prompt_tokens = self._local.prompt_tokens // share
+        completion_tokens = self._local.completion_tokens // share
+        retries = (self._retries() - self._local.retries_start) // share
+
+        with self._lock:
+            self._samples[stage].append(wall_ms)
+            totals = self._totals[stage]
+            totals['prompt_tokens'] += prompt_tokens
+            totals['completion_tokens'] += completion_tokens
+            totals['retries'] += retries
+            totals[f"cache_{cache_status}"] += 1
+
+        if self.tracer:
+            span = self.tracer.start_span(f"feedback.{stage}", start_time=int(start * 1e9))
+            span.set_attribute('feedback.source_id', str(getattr(self._local, 'source_id', '')))
+            span.set_attribute('llm.prompt_tokens', prompt_tokens)
+            span.set_attribute('llm.completion_tokens', completion_tokens)
+            span.set_attribute('llm.retries', retries)
+            span.set_attribute('llm.cache', cache_status)
+            span.end(end_time=int(end * 1e9))
+
+    def _ordered_stages(self) -> List[str]:
+        return [stage for stage in STAGE_ORDER if stage in self._samples] + sorted(
+            stage for stage in self._samples if stage not in STAGE_ORDER
+        )
+
+    def summary(self) -> List[Dict]:
+        """One row per stage: sample count, latency percentiles (ms), tokens, retries, cache use"""
+        rows = []
+        with self._lock:
+            for stage in self._ordered_stages():
+                samples = np.array(self._samples[stage])
+                totals = self._totals[stage]
+                p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                rows.append({
+                    'stage': stage,
+                    'count': len(samples),
+                    'p50_ms': round(float(p50), 2),
+                    'p95_ms': round(float(p95), 2),
+                    'p99_ms': round(float(p99), 2),
+                    'mean_ms': round(float(samples.mean()), 2),
+                    'total_ms': round(float(samples.sum()), 2),
+                    'prompt_tokens': totals['prompt_tokens'],
+                    'completion_tokens': totals['completion_tokens'],
+                    'retries': totals['retries'],
+                    'cache_hits': totals['cache_hit'],
+                    'errors': totals['cache_error']
+                })
+        return rows
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition of the per-stage summary"""
+        lines = [
+            "# HELP feedback_stage_latency_seconds Wall time of each pipeline task",
+            "# TYPE feedback_stage_latency_seconds summary"
+        ]
+        rows = self.summary()
+        for row in rows:
+            label = f'stage="{row["stage"]}"'
+            for quantile, column in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f'feedback_stage_latency_seconds{{{label},quantile="{quantile}"}} {row[column] / 1000:.6f}')
+            lines.append(f"feedback_stage_latency_seconds_sum{{{label}}} {row['total_ms'] / 1000:.6f}")
+            lines.append(f"feedback_stage_latency_seconds_count{{{label}}} {row['count']}")
+
+        counters = [
+            ('feedback_stage_tokens_total', 'Tokens used by each pipeline task', 'prompt_tokens', 'kind="prompt"'),
+            ('feedback_stage_tokens_total', None, 'completion_tokens', 'kind="completion"'),
+            ('feedback_stage_retries_total', 'LLM request retries per pipeline task', 'retries', None),
+            ('feedback_stage_cache_hits_total', 'Tasks served from the response cache', 'cache_hits', None),
+            ('feedback_stage_errors_total', 'Tasks that raised an error', 'errors', None)
+        ]
+        for name, help_text, column, extra_label in counters:
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+            for row in rows:
+                labels = f'stage="{row["stage"]}"' + (f",{extra_label}" if extra_label else "")
+                lines.append(f"{name}{{{labels}}} {row[column]}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,134 @@
+"""
+Persistent LLM Response Cache
+Content-addressed SQLite cache with TTL and size-based LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class LLMResponseCache:
+    """On-disk cache of LLM responses keyed by a hash of the request
+
+    The total response size is kept as a running count, so a put only
+    evicts when it pushes the cache over max_bytes (and then down to
+    EVICT_TO of the limit, so the next puts do not evict again). Expired
+    entries are swept every SWEEP_EVERY puts, which also resyncs the count
+    with the database.
+    """
+
+    SWEEP_EVERY = 100
+    EVICT_TO = 0.9
+
+    def __init__(self, path="output/llm_cache.sqlite", ttl_seconds=7 * 24 * 3600, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses(created_at)")
+        self._conn.commit()
+        self._total_bytes = self._stored_bytes()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, role: str, prompt: str) -> str:
+        """Build the content address for one request"""
+        payload = json.dumps([model, temperature, role, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._delete(key)
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting least-recently-used entries if it takes the cache over max_bytes"""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO responses (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self._total_bytes += size
+
+            self._puts += 1
+            if self._puts % self.SWEEP_EVERY == 0:
+                self._sweep()
+            if self.max_bytes and self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _delete(self, key: str):
+        """Delete one entry (if present) and take its size off the running total"""
+        row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _sweep(self):
+        """Drop expired entries and resync the running total (other processes may share the file)"""
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._total_bytes = self._stored_bytes()
+
+    def _evict(self):
+        """Drop the oldest-accessed entries until the cache is under EVICT_TO of max_bytes"""
+        target = self.max_bytes * self.EVICT_TO
+        cursor = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access")
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        cursor.close()
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
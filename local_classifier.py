@@ -0,0 +1,202 @@
+"""
+Local Rule-Based Pre-Classifier
+Classifies obvious feedback (spam, short praise, clear crash reports) without an LLM call
+"""
+
+import os
+import re
+from typing import Dict, List
+
+import pandas as pd
+
+
+# Defaults shared with the dashboard's "Priority Rules" settings
+DEFAULT_CRITICAL_KEYWORDS = "crash, data loss, can't login, critical, urgent"
+DEFAULT_HIGH_KEYWORDS = "bug, error, broken, not working, fails"
+
+
+class LocalClassifier:
+    """Keyword rules that short-circuit high-confidence feedback before the LLM"""
+    
+    # Categories whose ticket can be written locally with no agent analysis
+    TERMINAL_CATEGORIES = ('Spam', 'Praise')
+    
+    # Links count as one spam hit however many of these match (https://www. hits two)
+    URL_PATTERNS = [r'https?://', r'\bwww\.', r'\bbit\.ly/']
+    SPAM_PATTERNS = [
+        r'click here', r'get rich', r'\bcrypto', r'investment opportunity', r'buy now',
+        r'promo code', r'free followers', r'limited offer', r'make money'
+    ]
+    PRAISE_WORDS = [
+        'love', 'best', 'great', 'amazing', 'awesome', 'excellent', 'perfect',
+        'fantastic', 'wonderful', '5 stars', 'keep up', 'thank you'
+    ]
+    # Any of these means the item is not simple praise
+    NEGATIVE_WORDS = [
+        'but', 'however', 'crash', 'bug', 'error', 'broken', 'not working',
+        'fix', 'please add', 'wish', 'would', 'could you', 'issue', 'problem',
+        'slow', 'missing', 'lost', 'hate', 'worst', 'refund'
+    ]
+    BUG_WORDS = ['crash', 'freez', 'deletes', 'disappear', 'lost', 'fix', 'steps', 'reproduc']
+    
+    def __init__(self, critical_keywords=DEFAULT_CRITICAL_KEYWORDS, high_keywords=DEFAULT_HIGH_KEYWORDS, threshold=90):
+        self.critical_keywords = self._split_keywords(critical_keywords)
+        self.high_keywords = self._split_keywords(high_keywords)
+        self.threshold = threshold
+    
+    @staticmethod
+    def _split_keywords(keywords) -> List[str]:
+        """Accept a comma-separated string (as entered in the dashboard) or a list"""
+        if isinstance(keywords, str):
+            keywords = keywords.split(',')
+        return [keyword.strip().lower() for keyword in keywords if keyword.strip()]
+    
+    @staticmethod
+    def _count_hits(text: str, words: List[str]) -> int:
+        """Count words that appear in text as a word prefix (so 'crash' matches 'crashes')"""
+        return sum(1 for word in words if re.search(r'\b' + re.escape(word), text))
+    
+    def classify(self, feedback_item: Dict) -> Dict:
+        """Return {'category', 'priority', 'confidence', 'reason'} for a feedback item
+        
+        Bug keywords are checked first: a crash report that links to a log or
+        screenshot must reach the analysis agents, never be closed as spam.
+        """
+        text = str(feedback_item['content']).lower()
+        rating = feedback_item.get('metadata', {}).get('rating')
+        
+        critical_hits = self._count_hits(text, self.critical_keywords)
+        high_hits = self._count_hits(text, self.high_keywords)
+        bug_hits = critical_hits + high_hits + self._count_hits(text, self.BUG_WORDS)
+        if bug_hits:
+            return {
+                'category': 'Bug',
+                'priority': 'Critical' if critical_hits else 'High',
+                'confidence': min(95, 55 + 15 * bug_hits),
+                'reason': f"{bug_hits} bug keyword(s)"
+            }
+        
+        spam_hits = sum(1 for pattern in self.SPAM_PATTERNS if re.search(pattern, text))
+        spam_hits += any(re.search(pattern, text) for pattern in self.URL_PATTERNS)
+        if spam_hits:
+            return {
+                'category': 'Spam',
+                'priority': 'Low',
+                'confidence': min(100, 60 + 20 * spam_hits),
+                'reason': f"{spam_hits} spam pattern(s)"
+            }
+        
+        praise_hits = self._count_hits(text, self.PRAISE_WORDS)
+        if praise_hits and not self._count_hits(text, self.NEGATIVE_WORDS):
+            confidence = 50 + 15 * praise_hits
+            if rating is not None and str(rating).isdigit() and int(rating) >= 4:
+                confidence += 15
+            if len(text) > 300:
+                confidence -= 20
+            return {
+                'category': 'Praise',
+                'priority': 'Low',
+                'confidence': max(0, min(95, confidence)),
+                'reason': f"{praise_hits} praise word(s)"
+            }
+        
+        return {'category': 'Unknown', 'priority': 'Unknown', 'confidence': 0, 'reason': 'no rule matched'}
+    
+    def is_confident(self, prediction: Dict) -> bool:
+        """True if the prediction clears the configured threshold"""
+        return prediction['category'] != 'Unknown' and prediction['confidence'] >= self.threshold
+    
+    def handles_locally(self, prediction: Dict) -> bool:
+        """True if the item is ticketed from the prediction alone, with no LLM call"""
+        return self.is_confident(prediction) and prediction['category'] in self.TERMINAL_CATEGORIES
+    
+    def build_ticket(self, feedback_item: Dict, prediction: Dict) -> Dict:
+        """Ticket JSON (same keys as the ticket creator) for a terminal category"""
+        content = str(feedback_item['content'])
+        summary = content[:80] + '...' if len(content) > 80 else content
+        
+        if prediction['category'] == 'Spam':
+            title = f"[SPAM] {summary}"
+            action = "No action required; consider filtering or reporting the source"
+        else:
+            title = f"[PRAISE] {summary}"
+            action = "Share with the team; no engineering action required"
+        
+        return {
+            'ticket_title': title,
+            'category': prediction['category'],
+            'priority': prediction['priority'],
+            'description': content,
+            'technical_details': 'N/A',
+            'recommended_action': action,
+            'confidence': prediction['confidence'],
+            'classified_by': f"local rules ({prediction['reason']})"
+        }
+
+
+# Feedback that must never be ticketed locally, whatever the threshold
+NOT_LOCAL_CASES = [
+    "App crashes on export every time. Log: https://www.dropbox.com/s/abc123/crash.log",
+    "Great app but it freezes when I open a note, screenshot at www.imgur.com/xyz",
+    "Sync fails with error 500 since the update, details: bit.ly/3xyz"
+]
+
+
+def check_rules(classifier: LocalClassifier) -> List[str]:
+    """NOT_LOCAL_CASES the rules would wrongly settle without the LLM"""
+    strict = LocalClassifier(classifier.critical_keywords, classifier.high_keywords, threshold=0)
+    return [
+        content for content in NOT_LOCAL_CASES
+        if strict.handles_locally(strict.classify({'content': content, 'metadata': {}}))
+    ]
+
+
+def evaluate(threshold=90, expected_path='data/expected_classifications.csv'):
+    """Report skip rate and accuracy of the pre-classifier against expected labels
+    
+    Only predictions the pipeline acts on without the LLM (confident Spam or
+    Praise) count as handled locally.
+    """
+    from feedback_analysis_system import iter_feedback_records
+    
+    classifier = LocalClassifier(threshold=threshold)
+    expected_df = pd.read_csv(expected_path).set_index('source_id')
+    
+    failures = check_rules(classifier)
+    for content in failures:
+        print(f"❌ Would be ticketed locally: {content}")
+    
+    total = confident = correct = labelled = 0
+    for feedback in iter_feedback_records("data/app_store_reviews.csv", "data/support_emails.csv"):
+        total += 1
+        prediction = classifier.classify(feedback)
+        if not classifier.handles_locally(prediction):
+            continue
+        
+        confident += 1
+        if feedback['source_id'] in expected_df.index:
+            labelled += 1
+            expected = expected_df.loc[feedback['source_id'], 'category']
+            match = expected == prediction['category']
+            correct += match
+            print(f"{'✅' if match else '❌'} {feedback['source_id']}: {prediction['category']} "
+                  f"({prediction['confidence']}) expected {expected}")
+    
+    skip_rate = (confident / total * 100) if total else 0
+    accuracy = (correct / labelled * 100) if labelled else 0
+    
+    print("="*60)
+    print(f"Items: {total}")
+    print(f"Handled locally (Spam/Praise, confidence >= {threshold}): {confident} ({skip_rate:.1f}%)")
+    print(f"Accuracy on labelled local decisions: {accuracy:.1f}% ({correct}/{labelled})")
+    print(f"Rule checks: {len(NOT_LOCAL_CASES) - len(failures)}/{len(NOT_LOCAL_CASES)} passed")
+    print("="*60)
+    
+    return {
+        'total': total, 'confident': confident, 'skip_rate': skip_rate, 'accuracy': accuracy,
+        'rule_failures': failures
+    }
+
+
+if __name__ == "__main__":
+    evaluate(threshold=int(os.getenv("FEEDBACK_PREFILTER_THRESHOLD", "90")))
@@ -0,0 +1,297 @@
+"""
+Adaptive Rate Limiter and Retry Scheduler
+Client-side request/token budgets, backoff on 429/5xx and priority lanes for LLM calls
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+
+# Priority lanes: lower runs first
+LANE_CRITICAL = 0
+LANE_HIGH = 1
+LANE_NORMAL = 2
+# Deferred work such as asynchronous quality reviews
+LANE_BACKGROUND = 3
+
+RETRYABLE_STATUS = (408, 409, 429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """Classic token bucket; capacity per minute, refilled continuously"""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.available = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount can be taken (0 if available now)"""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def take(self, amount: float):
+        """Consume amount (call only after wait_time returned 0)"""
+        if self.per_minute:
+            self.available -= min(amount, self.capacity)
+
+    def set_rate(self, per_minute: float):
+        """Change the refill rate, keeping the configured capacity"""
+        self.rate = per_minute / 60.0
+
+
+class RateLimitScheduler:
+    """Shared budget for all LLM calls made by the system
+
+    Requests wait for both a request token and their estimated prompt
+    tokens. Waiters are served strictly by lane, then arrival order, so
+    Critical items are dispatched first whenever the budget is the
+    bottleneck. A 429 pauses every lane for the server's Retry-After (or
+    the backoff delay) and halves the request rate; each success restores
+    a little of it until the configured rate is reached again.
+    """
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, max_retries=5,
+                 base_delay=1.0, max_delay=60.0, min_rate_fraction=0.1):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_rate_fraction = min_rate_fraction
+        self.rate_fraction = 1.0
+        self.pause_until = 0.0
+
+        self.stats = {'requests': 0, 'throttled': 0, 'throttle_seconds': 0.0, 'retries': 0, 'rate_limited': 0, 'failed': 0}
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    def begin_item(self, priority: int = LANE_NORMAL):
+        """Put the calling thread's next calls in a lane and reset its item counters"""
+        self._local.priority = priority
+        self._local.item_stats = {'throttled': 0, 'retries': 0}
+
+    def item_stats(self) -> Dict:
+        """Throttle/retry counts for the calling thread since begin_item"""
+        return dict(getattr(self._local, 'item_stats', {'throttled': 0, 'retries': 0}))
+
+    def _count(self, key: str, amount=1):
+        """Bump a run-wide counter and the calling thread's item counter"""
+        with self._condition:
+            self.stats[key] += amount
+        item_stats = getattr(self._local, 'item_stats', None)
+        if item_stats is not None and key in item_stats:
+            item_stats[key] += amount
+
+    def acquire(self, estimated_tokens: int):
+        """Block until the request fits the budget; return seconds spent waiting"""
+        priority = getattr(self._local, 'priority', LANE_NORMAL)
+        start = time.monotonic()
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = max(
+                        self.pause_until - now,
+                        self.requests.wait_time(1, now),
+                        self.tokens.wait_time(estimated_tokens, now)
+                    )
+                    if self._waiters[0] == entry and wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(estimated_tokens)
+                        self.stats['requests'] += 1
+                        break
+                    # Only the head waiter needs a timed wake-up; others wait for it to leave
+                    self._condition.wait(timeout=wait if self._waiters[0] == entry else None)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            self._count('throttled')
+            with self._condition:
+                self.stats['throttle_seconds'] += waited
+        return waited
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def record_retry(self, status_code: Optional[int], delay: float):
+        """Note a retry; a 429 also pauses all lanes and cuts the request rate"""
+        self._count('retries')
+        if status_code != 429:
+            return
+        self._count('rate_limited')
+        with self._condition:
+            self.pause_until = max(self.pause_until, time.monotonic() + delay)
+            self.rate_fraction = max(self.min_rate_fraction, self.rate_fraction / 2)
+            self.requests.set_rate(self.requests.per_minute * self.rate_fraction)
+            self._condition.notify_all()
+
+    def record_success(self):
+        """Additively restore the request rate after a 429 cut it"""
+        if self.rate_fraction >= 1.0:
+            return
+        with self._condition:
+            self.rate_fraction = min(1.0, self.rate_fraction + 0.05)
+            self.requests.set_rate(self.requests.per_minute * self.rate_fraction)
+
+    def record_failure(self):
+        """Note a call that exhausted its retries"""
+        self._count('failed')
+
+    def summary(self) -> str:
+        """One-line run summary for the processing log"""
+        with self._condition:
+            return (
+                f"requests={self.stats['requests']}, throttled={self.stats['throttled']} "
+                f"({self.stats['throttle_seconds']:.1f}s), retries={self.stats['retries']}, "
+                f"rate_limited={self.stats['rate_limited']}, failed={self.stats['failed']}"
+            )
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """httpx transport that applies a RateLimitScheduler to every request
+
+    Installed on the client handed to ChatOpenAI, so crew, fast-path and
+    batch calls all share one budget. Prompt tokens are estimated from the
+    request body (about four characters per token) plus max_tokens.
+    """
+
+    def __init__(self, scheduler: RateLimitScheduler, transport: Optional[httpx.BaseTransport] = None):
+        self.scheduler = scheduler
+        self.transport = transport or httpx.HTTPTransport()
+
+    @staticmethod
+    def estimate_tokens(request: httpx.Request) -> int:
+        """Rough token cost of a chat completion request"""
+        body = request.content or b''
+        tokens = len(body) // 4 + 1
+        try:
+            tokens += int(json.loads(body).get('max_tokens') or 0)
+        except (ValueError, AttributeError, TypeError):
+            pass
+        return tokens
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        estimated_tokens = self.estimate_tokens(request)
+
+        attempt = 0
+        while True:
+            self.scheduler.acquire(estimated_tokens)
+            try:
+                response = self.transport.handle_request(request)
+            except (httpx.TimeoutException, httpx.NetworkError):
+                if attempt >= self.scheduler.max_retries:
+                    self.scheduler.record_failure()
+                    raise
+                delay = self.scheduler.backoff_delay(attempt)
+                self.scheduler.record_retry(None, delay)
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.scheduler.record_success()
+                    return response
+                if attempt >= self.scheduler.max_retries:
+                    self.scheduler.record_failure()
+                    return response
+
+                retry_after = self._retry_after(response)
+                response.read()
+                response.close()
+                delay = self.scheduler.backoff_delay(attempt, retry_after)
+                self.scheduler.record_retry(response.status_code, delay)
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Seconds from a Retry-After (or retry-after-ms) header, if present"""
+        for header, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+            value = response.headers.get(header)
+            if value:
+                try:
+                    return float(value) * scale
+                except ValueError:
+                    return None
+        return None
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RateLimitedTransport sharing the same scheduler
+
+    The scheduler's blocking wait runs in a worker thread so the event loop
+    is never stalled by throttling.
+    """
+
+    def __init__(self, scheduler: RateLimitScheduler, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.scheduler = scheduler
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        estimated_tokens = RateLimitedTransport.estimate_tokens(request)
+
+        attempt = 0
+        while True:
+            await asyncio.to_thread(self.scheduler.acquire, estimated_tokens)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except (httpx.TimeoutException, httpx.NetworkError):
+                if attempt >= self.scheduler.max_retries:
+                    self.scheduler.record_failure()
+                    raise
+                delay = self.scheduler.backoff_delay(attempt)
+                self.scheduler.record_retry(None, delay)
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.scheduler.record_success()
+                    return response
+                if attempt >= self.scheduler.max_retries:
+                    self.scheduler.record_failure()
+                    return response
+
+                retry_after = RateLimitedTransport._retry_after(response)
+                await response.aread()
+                await response.aclose()
+                delay = self.scheduler.backoff_delay(attempt, retry_after)
+                self.scheduler.record_retry(response.status_code, delay)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,376 @@
+"""
+Embedded Ticket Store
+SQLite database of feedback, tickets, reviews, logs and run metrics with indexed lookups and transactional upserts
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+
+# Ticket columns in table order; quality_score and report_count are integers
+TICKET_FIELDS = [
+    'source_id', 'source_type', 'created_at', 'category', 'priority', 'quality_score',
+    'approval_status', 'original_content', 'processing_result', 'duplicate_source_ids', 'report_count'
+]
+EDITABLE_FIELDS = [field for field in TICKET_FIELDS if field != 'source_id']
+# Ticket list columns (without the large text columns)
+LIST_FIELDS = [field for field in TICKET_FIELDS if field not in ('original_content', 'processing_result')]
+FILTER_FIELDS = ('source_type', 'category', 'priority', 'approval_status')
+
+METRIC_FIELDS = [
+    'timestamp', 'total_feedback', 'tickets_generated', 'success_rate', 'reviews_processed',
+    'emails_processed', 'skipped_unchanged', 'cache_hits', 'cache_misses'
+]
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS feedback (
+        source_id TEXT PRIMARY KEY,
+        source_type TEXT NOT NULL,
+        content TEXT,
+        metadata TEXT,
+        content_hash TEXT,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS tickets (
+        source_id TEXT PRIMARY KEY,
+        source_type TEXT,
+        created_at TEXT,
+        category TEXT,
+        priority TEXT,
+        quality_score INTEGER,
+        approval_status TEXT,
+        original_content TEXT,
+        processing_result TEXT,
+        duplicate_source_ids TEXT,
+        report_count INTEGER,
+        updated_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets(category);
+    CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority);
+    CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets(created_at);
+    CREATE TABLE IF NOT EXISTS reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_id TEXT NOT NULL,
+        reviewed_at TEXT NOT NULL,
+        reviewer TEXT NOT NULL,
+        action TEXT NOT NULL,
+        quality_score INTEGER,
+        approval_status TEXT,
+        changes TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_reviews_source_id ON reviews(source_id);
+    CREATE TABLE IF NOT EXISTS logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        source_id TEXT,
+        action TEXT,
+        status TEXT,
+        details TEXT,
+        data TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_logs_source_id ON logs(source_id);
+    CREATE INDEX IF NOT EXISTS idx_logs_action ON logs(action);
+    CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp);
+    CREATE TABLE IF NOT EXISTS run_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        total_feedback INTEGER,
+        tickets_generated INTEGER,
+        success_rate TEXT,
+        reviews_processed INTEGER,
+        emails_processed INTEGER,
+        skipped_unchanged INTEGER,
+        cache_hits INTEGER,
+        cache_misses INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_run_metrics_timestamp ON run_metrics(timestamp);
+"""
+
+
+def _value(value):
+    """SQLite-friendly value: NaN/NA become NULL, numpy scalars become Python ones"""
+    if value is None:
+        return None
+    if not isinstance(value, (str, list, dict)) and pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+class TicketStore:
+    """Tickets and run history in one SQLite file
+
+    Every write runs in a single transaction and tickets and feedback are
+    upserted on source_id, so re-running or resuming a run replaces rows
+    instead of duplicating them. Ticket lists are filtered and paged in SQL
+    on the indexed columns, and a ticket is fetched by its primary key.
+    """
+
+    def __init__(self, path="output/feedback.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # Writes
+
+    def record_item(self, feedback_item: Dict, content_hash: str, ticket: Optional[Dict] = None):
+        """Upsert a processed feedback item and its ticket in one transaction"""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO feedback (source_id, source_type, content, metadata, content_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source_id) DO UPDATE SET
+                    source_type = excluded.source_type, content = excluded.content,
+                    metadata = excluded.metadata, content_hash = excluded.content_hash,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    str(feedback_item['source_id']), feedback_item['source_type'], feedback_item['content'],
+                    json.dumps(feedback_item.get('metadata', {}), default=str), content_hash, now
+                )
+            )
+            if ticket:
+                self._upsert_tickets([ticket], now)
+
+    def upsert_tickets(self, tickets: List[Dict]):
+        """Insert or replace tickets by source_id in one transaction"""
+        with self._lock, self._conn:
+            self._upsert_tickets(tickets, datetime.now().isoformat())
+
+    def _upsert_tickets(self, tickets: List[Dict], now: str):
+        columns = TICKET_FIELDS + ['updated_at']
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        self._conn.executemany(
+            f"INSERT INTO tickets ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(source_id) DO UPDATE SET {updates}",
+            [
+                [str(ticket['source_id'])] + [_value(ticket.get(field)) for field in TICKET_FIELDS[1:]] + [now]
+                for ticket in tickets
+            ]
+        )
+
+    def update_ticket(self, source_id: str, changes: Dict, reviewer='manual', action='edit') -> bool:
+        """Apply field changes to a ticket and record the review; False if it does not exist"""
+        changes = {field: _value(value) for field, value in changes.items() if field in EDITABLE_FIELDS}
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            assignments = ", ".join(f"{field} = ?" for field in changes)
+            cursor = self._conn.execute(
+                f"UPDATE tickets SET {assignments + ', ' if assignments else ''}updated_at = ? WHERE source_id = ?",
+                list(changes.values()) + [now, str(source_id)]
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._add_review(source_id, reviewer, action, changes, now)
+        return True
+
+    def approve_ticket(self, source_id: str, reviewer='manual') -> bool:
+        return self.update_ticket(source_id, {'approval_status': 'Approved'}, reviewer=reviewer, action='approve')
+
+    def delete_ticket(self, source_id: str, reviewer='manual') -> bool:
+        """Delete a ticket (its review history is kept); False if it does not exist"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM tickets WHERE source_id = ?", (str(source_id),))
+            if cursor.rowcount == 0:
+                return False
+            self._add_review(source_id, reviewer, 'delete', {}, datetime.now().isoformat())
+        return True
+
+    def add_review(self, source_id: str, reviewer: str, action: str, changes: Dict):
+        with self._lock, self._conn:
+            self._add_review(source_id, reviewer, action, changes, datetime.now().isoformat())
+
+    def _add_review(self, source_id: str, reviewer: str, action: str, changes: Dict, now: str):
+        self._conn.execute(
+            "INSERT INTO reviews (source_id, reviewed_at, reviewer, action, quality_score, approval_status, changes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                str(source_id), now, reviewer, action, _value(changes.get('quality_score')),
+                changes.get('approval_status'), json.dumps(changes, default=str)
+            )
+        )
+
+    def append_logs(self, log_entries: List[Dict]):
+        """Store processing log entries; the full entry is kept as JSON"""
+        with self._lock, self._conn:
+            self._append_logs(log_entries)
+
+    def _append_logs(self, log_entries: List[Dict]):
+        self._conn.executemany(
+            "INSERT INTO logs (timestamp, source_id, action, status, details, data) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    entry.get('timestamp'), _value(entry.get('source_id')), entry.get('action'),
+                    entry.get('status'), entry.get('details') or entry.get('error'),
+                    json.dumps(entry, default=str)
+                )
+                for entry in log_entries
+            ]
+        )
+
+    def add_run_metrics(self, metrics: Dict):
+        with self._lock, self._conn:
+            self._add_run_metrics(metrics)
+
+    def _add_run_metrics(self, metrics: Dict):
+        self._conn.execute(
+            f"INSERT INTO run_metrics ({', '.join(METRIC_FIELDS)}) VALUES ({', '.join('?' * len(METRIC_FIELDS))})",
+            [_value(metrics.get(field)) for field in METRIC_FIELDS]
+        )
+
+    def record_run(self, log_entries: List[Dict], metrics: Dict):
+        """Store a finished run's logs and metrics and its quality reviews in one transaction
+
+        Successful qa_review log entries become review rows; asynchronous
+        ones also set the reviewed ticket's score and approval status, which
+        was still 'Review Pending' when the ticket was stored.
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._append_logs(log_entries)
+            self._add_run_metrics(metrics)
+            for entry in log_entries:
+                if entry.get('action') != 'qa_review' or entry.get('status') != 'success':
+                    continue
+                changes = {
+                    'quality_score': _value(entry.get('quality_score')),
+                    'approval_status': entry.get('approval_status')
+                }
+                if entry.get('mode') == 'async':
+                    self._conn.execute(
+                        "UPDATE tickets SET quality_score = ?, approval_status = ?, updated_at = ? WHERE source_id = ?",
+                        (changes['quality_score'], changes['approval_status'], now, str(entry['source_id']))
+                    )
+                self._add_review(entry['source_id'], 'quality_critic', 'qa', changes, entry.get('timestamp') or now)
+
+    # Reads
+
+    def _query(self, sql: str, params=()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    @staticmethod
+    def _where(selections: Dict[str, Optional[List[str]]]):
+        """WHERE clause for filter selections (None = no filter, '' matches NULL)"""
+        clauses = []
+        params = []
+        for field, values in (selections or {}).items():
+            if values is None or field not in FILTER_FIELDS:
+                continue
+            clauses.append(f"COALESCE({field}, '') IN ({', '.join('?' * len(values))})" if values else "0")
+            params.extend(values)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def count(self, selections: Dict = None) -> int:
+        where, params = self._where(selections)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM tickets{where}", params).fetchone()[0]
+
+    def options(self, field: str) -> List[str]:
+        """Distinct values of a filter column ('' for missing)"""
+        if field not in FILTER_FIELDS:
+            return []
+        with self._lock:
+            rows = self._conn.execute(f"SELECT DISTINCT COALESCE({field}, '') FROM tickets ORDER BY 1").fetchall()
+        return [row[0] for row in rows]
+
+    def page(self, selections: Dict, page: int, page_size: int, columns: List[str] = None) -> pd.DataFrame:
+        """One page (1-based) of matching tickets, newest first (list columns by default)"""
+        where, params = self._where(selections)
+        fields = ", ".join(columns or LIST_FIELDS)
+        return self._query(
+            f"SELECT {fields} FROM tickets{where} ORDER BY created_at DESC, source_id LIMIT ? OFFSET ?",
+            params + [page_size, (page - 1) * page_size]
+        )
+
+    def get(self, source_id: str) -> Optional[pd.Series]:
+        """The ticket for source_id, or None"""
+        df = self._query(f"SELECT {', '.join(TICKET_FIELDS)} FROM tickets WHERE source_id = ?", (str(source_id),))
+        return df.iloc[0] if len(df) else None
+
+    def iter_tickets(self, columns: List[str] = None, selections: Dict = None, chunksize=10000,
+                     current_only=False) -> Iterator[pd.DataFrame]:
+        """Matching tickets in chunks of at most chunksize rows
+
+        With current_only, tickets older than their item's latest processing
+        (the item failed when it was last processed) are left out.
+        """
+        where, params = self._where(selections)
+        if current_only:
+            where += (" AND" if where else " WHERE") + (
+                " NOT EXISTS (SELECT 1 FROM feedback WHERE feedback.source_id = tickets.source_id"
+                " AND feedback.updated_at > tickets.updated_at)"
+            )
+        columns = columns or TICKET_FIELDS
+        fields = ", ".join(columns if 'source_id' in columns else columns + ['source_id'])
+        last_id = None
+        while True:
+            # Keyset pagination on the primary key keeps every chunk an index seek
+            clause = (where + (" AND" if where else " WHERE") + " source_id > ?") if last_id is not None else where
+            chunk = self._query(
+                f"SELECT {fields} FROM tickets{clause} ORDER BY source_id LIMIT ?",
+                params + ([last_id] if last_id is not None else []) + [chunksize]
+            )
+            if chunk.empty:
+                return
+            last_id = chunk['source_id'].iloc[-1]
+            yield chunk[columns]
+            if len(chunk) < chunksize:
+                return
+
+    def read_tickets(self, columns: List[str] = None, selections: Dict = None, current_only=False) -> pd.DataFrame:
+        chunks = list(self.iter_tickets(columns, selections, current_only=current_only))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns or TICKET_FIELDS)
+
+    def export_csv(self, selections: Dict = None) -> bytes:
+        """Matching tickets as CSV, built chunk by chunk"""
+        parts = []
+        for idx, chunk in enumerate(self.iter_tickets(selections=selections)):
+            parts.append(chunk.to_csv(index=False, header=idx == 0))
+        return "".join(parts or [",".join(TICKET_FIELDS) + "\n"]).encode('utf-8')
+
+    def reviews(self, source_id: str) -> pd.DataFrame:
+        return self._query(
+            "SELECT reviewed_at, reviewer, action, quality_score, approval_status, changes "
+            "FROM reviews WHERE source_id = ? ORDER BY id", (str(source_id),)
+        )
+
+    def log_actions(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT action FROM logs ORDER BY 1").fetchall()]
+
+    def logs(self, actions: List[str] = None, limit=1000) -> pd.DataFrame:
+        """Most recent log entries (optionally only these actions), oldest first"""
+        where = f" WHERE action IN ({', '.join('?' * len(actions))})" if actions else ""
+        return self._query(
+            f"SELECT * FROM (SELECT id, timestamp, source_id, action, status, details FROM logs{where} "
+            f"ORDER BY id DESC LIMIT ?) ORDER BY id",
+            list(actions or []) + [limit]
+        ).drop(columns='id')
+
+    def run_metrics(self) -> pd.DataFrame:
+        return self._query(f"SELECT {', '.join(METRIC_FIELDS)} FROM run_metrics ORDER BY id")
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
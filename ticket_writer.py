@@ -0,0 +1,188 @@
+"""
+Streaming Ticket Writer
+Appends ticket rows to the output file as they are produced instead of holding them in memory
+"""
+
+import csv
+import io
+import os
+from typing import Dict, List
+
+from columnar_io import arrow_schema, detect_format, iter_table_chunks, require_pyarrow
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+class StreamingTicketWriter:
+    """Buffered, append-only CSV sink for generated tickets
+
+    Rows are buffered and written to disk every flush_every rows in a
+    single call, so readers tailing the file only ever see complete rows.
+    With merge, the existing file is set aside on open and its rows for
+    source_ids not rewritten by this run are appended on close, again in
+    chunks, so memory stays bounded by the buffer plus the written ids.
+    """
+
+    def __init__(self, path, fieldnames: List[str], merge=False, flush_every=50, chunksize=1000, dtypes: Dict = None):
+        self.path = path
+        root, extension = os.path.splitext(path)
+        self.previous_path = root + ".prev" + extension
+        self.fieldnames = list(fieldnames)
+        self.dtypes = dict(dtypes or {})
+        self.merge = merge
+        self.flush_every = max(1, flush_every)
+        self.chunksize = chunksize
+        self.rows_written = 0
+        self._written_ids = set()
+        self._rows = []
+        self._file = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def is_open(self) -> bool:
+        """True while rows can be written"""
+        return self._file is not None
+
+    def open(self):
+        """Start a fresh output file, setting aside the existing one when merging
+
+        An earlier .prev file (e.g. generated_tickets.prev.csv) means a merge
+        run was interrupted; it still holds the original rows, so it is kept
+        and the partial output is discarded.
+        """
+        if self.merge:
+            if os.path.exists(self.path) and not os.path.exists(self.previous_path):
+                os.replace(self.path, self.previous_path)
+            if os.path.exists(self.previous_path):
+                self._add_previous_columns()
+        elif os.path.exists(self.previous_path):
+            os.remove(self.previous_path)
+
+        self._open_file()
+
+    def _add_previous_columns(self):
+        """Keep columns that only exist in the previous file"""
+        for chunk in self._iter_previous(chunksize=1):
+            self.fieldnames += [column for column in chunk.columns if column not in self.fieldnames]
+            break
+
+    def _iter_previous(self, chunksize):
+        """Chunks of the previous output file"""
+        return iter_table_chunks(self.previous_path, chunksize, dtype=str)
+
+    def _open_file(self):
+        """Create the output file and write the header"""
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        csv.DictWriter(self._file, fieldnames=self.fieldnames).writeheader()
+        self._file.flush()
+
+    def _write_rows(self, rows: List[Dict]):
+        """Serialize rows and write them in one call"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.fieldnames, restval='', extrasaction='ignore')
+        writer.writerows(rows)
+        self._file.write(buffer.getvalue())
+        self._file.flush()
+
+    def _close_file(self):
+        """Close the output file"""
+        self._file.close()
+
+    def write(self, ticket: Dict):
+        """Buffer one ticket row, flushing to disk every flush_every rows"""
+        self._rows.append(ticket)
+        self._written_ids.add(str(ticket['source_id']))
+        self.rows_written += 1
+        if len(self._rows) >= self.flush_every:
+            self._flush()
+
+    def _flush(self):
+        """Write buffered rows to the file"""
+        if self._rows:
+            self._write_rows(self._rows)
+            self._rows = []
+
+    def close(self):
+        """Flush remaining rows, append kept rows from the previous file, and close"""
+        if self._file is None:
+            return
+
+        self._flush()
+        if self.merge and os.path.exists(self.previous_path):
+            for chunk in self._iter_previous(self.chunksize):
+                chunk = chunk[~chunk['source_id'].astype(str).isin(self._written_ids)]
+                self._write_rows(chunk.to_dict('records'))
+
+        self._close_file()
+        self._file = None
+        if os.path.exists(self.previous_path):
+            os.remove(self.previous_path)
+
+
+class ArrowTicketWriter(StreamingTicketWriter):
+    """Streaming ticket sink for Parquet or Arrow IPC (Feather) files
+
+    Each flush becomes one row group (Parquet) or record batch (Feather)
+    with typed columns from dtypes. Both formats write their footer on
+    close, so the file can only be read once the run has finished.
+    """
+
+    def _add_previous_columns(self):
+        """Keep columns (and their types) that only exist in the previous file"""
+        schema = pq.read_schema(self.previous_path) if detect_format(self.previous_path) == 'parquet' \
+            else pa.ipc.open_file(pa.memory_map(self.previous_path)).schema
+        for field in schema:
+            if field.name not in self.fieldnames:
+                self.fieldnames.append(field.name)
+                if pa.types.is_integer(field.type):
+                    self.dtypes[field.name] = 'int'
+                elif pa.types.is_floating(field.type):
+                    self.dtypes[field.name] = 'float'
+
+    def _iter_previous(self, chunksize):
+        """Chunks of the previous output file (typed, not re-read as strings)"""
+        return iter_table_chunks(self.previous_path, chunksize)
+
+    def _open_file(self):
+        """Create the Parquet or IPC writer with the ticket schema"""
+        fmt = detect_format(self.path)
+        require_pyarrow(fmt)
+        self._schema = arrow_schema(self.fieldnames, self.dtypes)
+        if fmt == 'parquet':
+            self._file = pq.ParquetWriter(self.path, self._schema)
+        else:
+            self._file = pa.ipc.new_file(self.path, self._schema)
+
+    def _write_rows(self, rows: List[Dict]):
+        """Write rows as one row group / record batch"""
+        if not rows:
+            return
+        columns = {
+            column: [self._coerce(row.get(column), self.dtypes.get(column, 'str')) for row in rows]
+            for column in self.fieldnames
+        }
+        self._file.write_table(pa.Table.from_pydict(columns, schema=self._schema))
+
+    @staticmethod
+    def _coerce(value, dtype):
+        """Convert a row value to the column type, with blanks and NaN as nulls"""
+        if value is None or value == '' or value != value:
+            return None
+        if dtype == 'int':
+            return int(value)
+        if dtype == 'float':
+            return float(value)
+        if dtype == 'bool':
+            return value if isinstance(value, bool) else str(value).lower() == 'true'
+        return str(value)
+
+    def _close_file(self):
+        """Write the footer and close"""
+        self._file.close()
@@ -3,15 +3,25 @@ Testing and Validation Script
 Compares generated tickets against expected classifications
 """
 
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
 
+from columnar_io import read_table, with_format
+from ticket_store import TicketStore
+
 
 class SystemValidator:
-    """Validates system output against expected results"""
+    """Validates system output against expected results
+    
+    Every input and report path is resolved from base_dir (default:
+    FEEDBACK_BASE_DIR, else this script's directory), so validation does
+    not depend on the directory it is run from.
+    """
     
-    def __init__(self):
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir or os.getenv("FEEDBACK_BASE_DIR", os.path.dirname(os.path.abspath(__file__)))
         self.expected_df = None
         self.generated_df = None
         self.results = {
@@ -20,22 +30,40 @@ class SystemValidator:
             'correct_priorities': 0,
             'category_accuracy': 0.0,
             'priority_accuracy': 0.0,
-            'details': []
+            'details': pd.DataFrame(),
+            'category_confusion': pd.DataFrame(),
+            'priority_confusion': pd.DataFrame()
         }
     
+    def _path(self, path: str) -> str:
+        """path under base_dir (absolute paths are kept)"""
+        return os.path.join(self.base_dir, path)
+    
     def load_data(self):
         """Load expected and generated data"""
         try:
-            self.expected_df = pd.read_csv('expected_classifications.csv')
+            self.expected_df = pd.read_csv(self._path('data/expected_classifications.csv'))
             print(f"✅ Loaded {len(self.expected_df)} expected classifications")
             
-            if not os.path.exists('generated_tickets.csv'):
-                print("❌ generated_tickets.csv not found")
+            # Only the columns validation needs are read; the ticket store
+            # (which includes manual review edits) is preferred over the files,
+            # skipping tickets left over from before an item's latest (failed) run
+            columns = ['source_id', 'category', 'priority', 'processing_result', 'duplicate_source_ids']
+            db_path = self._path(os.getenv("FEEDBACK_DB_PATH", "output/feedback.sqlite"))
+            tickets_path = self._path(with_format('output/generated_tickets.csv', os.getenv("FEEDBACK_OUTPUT_FORMAT", "csv").lower()))
+            if os.getenv("FEEDBACK_DB_ENABLED", "1") != "0" and os.path.exists(db_path):
+                store = TicketStore(db_path)
+                self.generated_df = store.read_tickets(columns=columns, current_only=True)
+                store.close()
+                tickets_path = db_path
+            elif os.path.exists(tickets_path):
+                self.generated_df = read_table(tickets_path, columns=columns)
+            else:
+                print(f"❌ {tickets_path} not found")
                 print("Run the system first: python feedback_analysis_system.py")
                 return False
-            
-            self.generated_df = pd.read_csv('generated_tickets.csv')
-            print(f"✅ Loaded {len(self.generated_df)} generated tickets")
+            print(f"✅ Loaded {len(self.generated_df)} generated tickets from {tickets_path}")
+            self.generated_df = self._expand_duplicates(self.generated_df)
             
             return True
             
@@ -43,40 +71,87 @@ class SystemValidator:
             print(f"❌ Error loading data: {e}")
             return False
     
+    @staticmethod
+    def _expand_duplicates(generated: pd.DataFrame) -> pd.DataFrame:
+        """Add a row per deduplicated item, carrying its representative's ticket
+        
+        With dedup enabled one ticket covers every near-duplicate report, and
+        the folded source_ids are listed in its duplicate_source_ids column.
+        The added rows come after the tickets themselves, so an item that has
+        a ticket of its own is still scored on that one.
+        """
+        if 'duplicate_source_ids' not in generated.columns:
+            return generated
+        
+        generated = generated.reset_index(drop=True)
+        duplicates = generated['duplicate_source_ids'].fillna('').astype(str).str.split(';').explode()
+        duplicates = duplicates[duplicates != '']
+        if duplicates.empty:
+            return generated
+        folded = generated.loc[duplicates.index].assign(source_id=duplicates.values)
+        return pd.concat([generated, folded], ignore_index=True)
+    
+    # Fallback keywords checked in order against the raw processing result;
+    # the first one found decides the label
+    CATEGORY_KEYWORDS = [
+        ('Bug', 'bug'),
+        ('Feature Request', 'feature'),
+        ('Praise', 'praise'),
+        ('Complaint', 'complaint'),
+        ('Spam', 'spam')
+    ]
+    PRIORITY_KEYWORDS = [
+        ('Critical', 'critical'),
+        ('High', 'high'),
+        ('Medium', 'medium'),
+        ('Low', 'low')
+    ]
+    
+    # Per-item results are printed for evaluation sets up to this size
+    PRINT_LIMIT = 50
+    
+    @staticmethod
+    def _match_keyword(result_text, keywords):
+        result_lower = str(result_text).lower()
+        for label, keyword in keywords:
+            if keyword in result_lower:
+                return label
+        return 'Unknown'
+    
+    @staticmethod
+    def _match_keywords(results: pd.Series, keywords) -> np.ndarray:
+        """Vectorized _match_keyword over a column of processing results"""
+        results_lower = results.fillna('').astype(str).str.lower()
+        conditions = [results_lower.str.contains(keyword, regex=False).values for _, keyword in keywords]
+        return np.select(conditions, [label for label, _ in keywords], default='Unknown')
+    
     def extract_category_from_result(self, result_text):
         """Extract category from processing result"""
-        result_lower = result_text.lower()
-        
-        if 'bug' in result_lower:
-            return 'Bug'
-        elif 'feature request' in result_lower or 'feature' in result_lower:
-            return 'Feature Request'
-        elif 'praise' in result_lower:
-            return 'Praise'
-        elif 'complaint' in result_lower:
-            return 'Complaint'
-        elif 'spam' in result_lower:
-            return 'Spam'
-        else:
-            return 'Unknown'
+        return self._match_keyword(result_text, self.CATEGORY_KEYWORDS)
     
     def extract_priority_from_result(self, result_text):
         """Extract priority from processing result"""
-        result_lower = result_text.lower()
+        return self._match_keyword(result_text, self.PRIORITY_KEYWORDS)
+    
+    def _resolve_labels(self, merged: pd.DataFrame, column: str, keywords) -> pd.Series:
+        """Parsed ticket column, falling back to keyword extraction where it is empty
         
-        if 'critical' in result_lower:
-            return 'Critical'
-        elif 'high' in result_lower:
-            return 'High'
-        elif 'medium' in result_lower:
-            return 'Medium'
-        elif 'low' in result_lower:
-            return 'Low'
-        else:
-            return 'Unknown'
+        Older ticket files only have the raw result, so only those rows have
+        their (multi-KB) processing_result scanned.
+        """
+        labels = merged[column].astype(object) if column in merged.columns else pd.Series(np.nan, index=merged.index, dtype=object)
+        missing = labels.isna() | (labels == '')
+        if missing.any():
+            labels = labels.copy()
+            labels[missing] = self._match_keywords(merged.loc[missing, 'processing_result'], keywords)
+        return labels
     
     def validate(self):
-        """Validate generated tickets against expected results"""
+        """Validate generated tickets against expected results
+        
+        Expected rows are joined to their ticket once on source_id (the
+        first ticket wins if a source_id repeats) and compared column-wise.
+        """
         
         if not self.load_data():
             return
@@ -85,60 +160,74 @@ class SystemValidator:
         print("VALIDATION REPORT")
         print("="*60 + "\n")
         
-        matched_items = 0
+        expected = self.expected_df[['source_id', 'category', 'priority']].rename(
+            columns={'category': 'expected_category', 'priority': 'expected_priority'}
+        )
+        generated = self.generated_df.drop_duplicates(subset='source_id', keep='first')
+        if 'processing_result' not in generated.columns:
+            generated = generated.assign(processing_result='')
+        merged = expected.assign(source_id=expected['source_id'].astype(str)).merge(
+            generated.assign(source_id=generated['source_id'].astype(str)),
+            on='source_id', how='left', indicator=True
+        )
+        processed = (merged['_merge'] == 'both').values
         
-        for _, expected_row in self.expected_df.iterrows():
-            source_id = expected_row['source_id']
-            expected_category = expected_row['category']
-            expected_priority = expected_row['priority']
-            
-            # Find corresponding generated ticket
-            generated_row = self.generated_df[self.generated_df['source_id'] == source_id]
-            
-            if generated_row.empty:
-                print(f"⚠️  {source_id}: Not processed")
-                self.results['details'].append({
-                    'source_id': source_id,
-                    'status': 'Not processed',
-                    'category_match': False,
-                    'priority_match': False
-                })
-                continue
-            
-            matched_items += 1
-            result_text = generated_row.iloc[0]['processing_result']
-            
-            # Extract category and priority from result
-            generated_category = self.extract_category_from_result(result_text)
-            generated_priority = self.extract_priority_from_result(result_text)
-            
-            # Compare
-            category_match = generated_category == expected_category
-            priority_match = generated_priority == expected_priority
-            
-            if category_match:
-                self.results['correct_categories'] += 1
-            
-            if priority_match:
-                self.results['correct_priorities'] += 1
-            
-            # Print result
-            status_icon = "✅" if (category_match and priority_match) else "⚠️"
-            print(f"{status_icon} {source_id}:")
-            print(f"   Category: {generated_category} (expected: {expected_category}) {'✓' if category_match else '✗'}")
-            print(f"   Priority: {generated_priority} (expected: {expected_priority}) {'✓' if priority_match else '✗'}")
-            print()
+        details_df = pd.DataFrame({
+            'source_id': merged['source_id'],
+            'expected_category': merged['expected_category'],
+            'generated_category': np.nan,
+            'category_match': False,
+            'expected_priority': merged['expected_priority'],
+            'generated_priority': np.nan,
+            'priority_match': False,
+            'status': 'Not processed'
+        })
+        
+        matched = merged[processed]
+        if len(matched):
+            generated_category = self._resolve_labels(matched, 'category', self.CATEGORY_KEYWORDS)
+            generated_priority = self._resolve_labels(matched, 'priority', self.PRIORITY_KEYWORDS)
+            category_match = generated_category.values == matched['expected_category'].values
+            priority_match = generated_priority.values == matched['expected_priority'].values
             
-            self.results['details'].append({
-                'source_id': source_id,
-                'expected_category': expected_category,
-                'generated_category': generated_category,
-                'category_match': category_match,
-                'expected_priority': expected_priority,
-                'generated_priority': generated_priority,
-                'priority_match': priority_match,
-                'status': 'Match' if (category_match and priority_match) else 'Mismatch'
-            })
+            details_df['generated_category'] = details_df['generated_category'].astype(object)
+            details_df['generated_priority'] = details_df['generated_priority'].astype(object)
+            details_df.loc[processed, 'generated_category'] = generated_category.values
+            details_df.loc[processed, 'generated_priority'] = generated_priority.values
+            details_df.loc[processed, 'category_match'] = category_match
+            details_df.loc[processed, 'priority_match'] = priority_match
+            details_df.loc[processed, 'status'] = np.where(category_match & priority_match, 'Match', 'Mismatch')
+        
+        matched_items = int(processed.sum())
+        self.results['details'] = details_df
+        self.results['correct_categories'] = int(details_df['category_match'].sum())
+        self.results['correct_priorities'] = int(details_df['priority_match'].sum())
+        
+        # Per-class confusion matrices (rows: expected, columns: generated)
+        matched_details = details_df[processed]
+        self.results['category_confusion'] = pd.crosstab(
+            matched_details['expected_category'], matched_details['generated_category'],
+            rownames=['expected'], colnames=['generated']
+        )
+        self.results['priority_confusion'] = pd.crosstab(
+            matched_details['expected_priority'], matched_details['generated_priority'],
+            rownames=['expected'], colnames=['generated']
+        )
+        
+        # Print per-item results for small evaluation sets
+        if len(details_df) <= self.PRINT_LIMIT:
+            for row in details_df.itertuples(index=False):
+                if row.status == 'Not processed':
+                    print(f"⚠️  {row.source_id}: Not processed")
+                    continue
+                status_icon = "✅" if row.status == 'Match' else "⚠️"
+                print(f"{status_icon} {row.source_id}:")
+                print(f"   Category: {row.generated_category} (expected: {row.expected_category}) {'✓' if row.category_match else '✗'}")
+                print(f"   Priority: {row.generated_priority} (expected: {row.expected_priority}) {'✓' if row.priority_match else '✗'}")
+                print()
+        else:
+            print(f"{len(details_df) - matched_items} not processed, "
+                  f"{int((details_df['status'] == 'Mismatch').sum())} mismatches (see the saved report)\n")
         
         # Calculate accuracy
         self.results['total_items'] = matched_items
@@ -154,6 +243,11 @@ class SystemValidator:
         print(f"Category Accuracy: {self.results['category_accuracy']:.1f}%")
         print(f"Priority Accuracy: {self.results['priority_accuracy']:.1f}%")
         print(f"Overall Success: {self.results['correct_categories']} correct categories, {self.results['correct_priorities']} correct priorities")
+        if matched_items > 0:
+            print("\nCategory confusion matrix (rows: expected, columns: generated):")
+            print(self.results['category_confusion'].to_string())
+            print("\nPriority confusion matrix (rows: expected, columns: generated):")
+            print(self.results['priority_confusion'].to_string())
         print("="*60 + "\n")
         
         # Save validation report
@@ -162,8 +256,9 @@ class SystemValidator:
     def save_report(self):
         """Save validation report to CSV"""
         try:
+            os.makedirs(self._path('output'), exist_ok=True)
             details_df = pd.DataFrame(self.results['details'])
-            report_filename = f"validation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            report_filename = self._path(f"output/validation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
             details_df.to_csv(report_filename, index=False)
             print(f"📊 Validation report saved to: {report_filename}")
             
@@ -177,10 +272,19 @@ class SystemValidator:
                 'priority_accuracy': [f"{self.results['priority_accuracy']:.2f}%"]
             }
             summary_df = pd.DataFrame(summary)
-            summary_filename = f"validation_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            summary_filename = self._path(f"output/validation_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
             summary_df.to_csv(summary_filename, index=False)
             print(f"📊 Summary saved to: {summary_filename}")
             
+            # Save both confusion matrices, stacked under a 'field' column
+            confusion_df = pd.concat([
+                self.results['category_confusion'].stack().rename('count').reset_index().assign(field='category'),
+                self.results['priority_confusion'].stack().rename('count').reset_index().assign(field='priority')
+            ], ignore_index=True)
+            confusion_filename = self._path(f"output/validation_confusion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            confusion_df[['field', 'expected', 'generated', 'count']].to_csv(confusion_filename, index=False)
+            print(f"📊 Confusion matrices saved to: {confusion_filename}")
+            
         except Exception as e:
             print(f"❌ Error saving report: {e}")
 